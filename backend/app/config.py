@@ -32,7 +32,9 @@ class Settings(BaseSettings):
     
     # ==================== OpenAI ====================
     OPENAI_API_KEY: str
-    OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_MODEL: str = "gpt-4o-mini"  # 요약/분석 등 비실시간 작업
+    OPENAI_REALTIME_MODEL: str = "gpt-4o"  # 통화 중 실시간 응답 (주 모델)
+    OPENAI_FALLBACK_MODEL: str = "gpt-4o-mini"  # 주 모델 첫 토큰 지연/실패 시 예비 모델
     OPENAI_WHISPER_MODEL: str = "whisper-1"
     OPENAI_TTS_MODEL: str = "tts-1"
     OPENAI_TTS_VOICE: str = "nova"
@@ -53,6 +55,7 @@ class Settings(BaseSettings):
     RTZR_API_HOST: str = "openapi.vito.ai"
     RTZR_SAMPLE_RATE: int = 8000
     RTZR_ENCODING: str = "LINEAR16"
+    STT_AUDIO_BATCH_MS: int = 100  # 수신 20ms 프레임을 모아 PCM 변환/전송하는 단위
     
     # ==================== Twilio ====================
     TWILIO_ACCOUNT_SID: str
@@ -60,6 +63,12 @@ class Settings(BaseSettings):
     TWILIO_PHONE_NUMBER: str
     API_BASE_URL: str | None = None  # WebSocket용 공개 도메인 (예: your-domain.com)
     TEST_PHONE_NUMBER: str | None = None  # 테스트용 전화번호 (예: +821012345678)
+    TWILIO_CALLS_PER_SECOND: float = 1.0  # 계정 발신 CPS 한도 (토큰 버킷 발신 속도)
+    DIAL_MAX_CONCURRENCY: int = 8  # 동시에 진행하는 발신 API 요청 수
+    DIAL_BATCH_SIZE: int = 25  # 발신 지연시간을 모아 보고하는 단위 (CallLog는 발신 즉시 저장)
+    MEDIA_STREAM_MAX_CALLS_PER_WORKER: int = 50  # 워커당 동시 통화 상한 (초과분은 다음으로 미룸)
+    DIAL_DEFER_SECONDS: int = 60  # 통화 수용량이 부족할 때 남은 발신을 미루는 시간
+    DIAL_MAX_DEFERS: int = 10  # 같은 대상을 최대 몇 번까지 미룰지
     
     # ==================== AWS S3 ====================
     AWS_ACCESS_KEY_ID: str
@@ -67,6 +76,11 @@ class Settings(BaseSettings):
     AWS_REGION: str = "ap-northeast-2"
     S3_BUCKET_NAME: str
     
+    # ==================== Call Recording ====================
+    ENABLE_CALL_RECORDING: bool = False  # 통화 음성(어르신+AI 믹싱)을 S3에 저장하고 CallLog.audio_file_url 기록
+    CALL_RECORDING_S3_PREFIX: str = "call-recordings"
+    CALL_RECORDING_MAX_PENDING_SECONDS: int = 60  # 업로드 대기 허용 구간 (초과 시 해당 구간 무음 처리, 통화당 메모리 상한)
+    
     # ==================== CORS ====================
     CORS_ORIGINS: str = "http://localhost:19000,http://localhost:19006"
     
@@ -97,13 +111,36 @@ class Settings(BaseSettings):
     # ==================== AI Call Settings ====================
     DEFAULT_CALL_TIME: str = "20:00"
     MAX_CALL_DURATION: int = 10  # minutes
+    CALL_SCHEDULE_CACHE_TTL_SECONDS: int = 3600  # 통화 예약 캐시(Redis 정렬 집합) 전체 재구성 주기
+    CALL_SMOOTHING_ENABLED: bool = False  # call_time을 목표로 보고 허용 범위 안에서 발신 분을 분산 배정
+    CALL_WINDOW_BEFORE_MINUTES: int = 0  # 목표보다 이만큼 먼저 발신 허용
+    CALL_WINDOW_AFTER_MINUTES: int = 20  # 목표보다 이만큼 늦게 발신 허용
+    CALL_CONCURRENCY_CEILING: int = 100  # 분산 계획의 동시 통화 상한
+    CALL_PLANNER_CALL_MINUTES: int = 5  # 동시 통화 계산용 통화 1건 점유 시간 (분)
     MAX_PROMPT_TOKENS: int = 4000
+    CALL_SESSION_BACKEND: str = "memory"  # memory | redis (redis: 워커 간 후처리 락/완료 플래그 공유)
+    ECHO_GATE_TAIL_MS: int = 500  # AI 발화 종료 후 수신 오디오 차단 유지 시간 (Twilio media timestamp 기준)
+    ECHO_GATE_PREROLL_MS: int = 300  # 게이트 재개 시 함께 STT로 보내는 직전 오디오 (첫 음절 보존)
+    CALL_SILENCE_TIMEOUT_SECONDS: int = 0  # 사용자 무응답 시 종료 안내 후 통화 종료 (0: 사용 안 함)
+    OUTBOUND_QUEUE_MAX_FRAMES: int = 50  # 통화별 Twilio 송신 대기열 상한 (초과 시 생산자 대기)
+    OUTBOUND_COALESCE_MAX_BYTES: int = 8000  # 대기 중인 media 프레임을 합칠 최대 크기 (μ-law 1초)
     
     # ==================== Feature Flags ====================
     ENABLE_AUTO_DIARY: bool = True
     ENABLE_TODO_EXTRACTION: bool = True
     ENABLE_EMOTION_ANALYSIS: bool = True
+    ENABLE_TURN_ANALYSIS: bool = True  # 통화 중 감정/맥락 분석을 응답과 동시에 실행해 다음 턴 프롬프트에 반영
     ENABLE_NOTIFICATIONS: bool = True
+    POST_CALL_AUTO_DIARY: bool = False  # 통화 후처리에서 일기 자동 생성 (기본: 어르신이 요약을 보고 직접 작성)
+    ELDER_PROFILE_ENABLED: bool = True  # 통화 전 계산된 어르신 개인화 프로필을 통화 시작 시 로드
+    ELDER_PROFILE_TTL_SECONDS: int = 7 * 24 * 3600  # Redis 프로필 보관 기간 (야간 배치가 매일 갱신)
+    
+    # ==================== Performance Monitoring ====================
+    LATENCY_SKETCH_RELATIVE_ACCURACY: float = 0.01  # 분위수 상대 오차 (1%)
+    LATENCY_SKETCH_FLUSH_SECONDS: int = 10  # 워커 스케치 → Redis 병합 주기
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.05  # 이벤트 루프 하트비트 주기
+    LOOP_SLOW_CALLBACK_SECONDS: float = 0.1  # 이 시간 이상 루프 차단 시 스택 캡처
+    LOOP_SLOW_CALLBACK_HISTORY: int = 50  # 보관할 느린 콜백 이벤트 수
     
     # ==================== Image Upload Settings ====================
     UPLOAD_DIR: str = "uploads/profiles"
@@ -119,6 +156,42 @@ class Settings(BaseSettings):
     NAVER_CLOVA_TTS_ALPHA: int = -1  # 0 ~ 2
     NAVER_CLOVA_TTS_VOLUME: int = 0  # -5 ~ 5
     NAVER_CLOVA_TTS_EMOTION: int = 2  # 0 ~ 2 (감정 강도)
+    NAVER_CLOVA_TTS_STREAMING: bool = True  # 응답을 받는 대로 디코딩하여 첫 블록부터 Twilio로 전송
+    
+    # ==================== TTS Engine (다중 제공자) ====================
+    TTS_ENGINE_ENABLED: bool = True  # False면 Naver Clova 단독 사용
+    TTS_PROVIDERS: str = "clova"  # 우선순위 순 (키가 없는 제공자는 제외) - 예비 제공자는 목소리가 달라 명시적으로 추가
+    TTS_HEDGE_ENABLED: bool = True  # 주 제공자가 p90 안에 응답하지 않으면 예비 제공자 동시 요청
+    TTS_HEDGE_QUANTILE: float = 0.9
+    TTS_HEDGE_MIN_SAMPLES: int = 20  # 이보다 표본이 적으면 기본 대기 시간 사용
+    TTS_HEDGE_DEFAULT_DELAY_SECONDS: float = 0.8
+    TTS_CIRCUIT_FAILURE_THRESHOLD: int = 3  # 연속 실패 횟수
+    TTS_CIRCUIT_OPEN_SECONDS: float = 30.0  # 서킷 열림 후 시험 요청까지 대기
+    
+    # ==================== LLM Router (실시간 응답) ====================
+    LLM_HEDGE_ENABLED: bool = True  # 주 모델이 p95 TTFT 안에 첫 토큰을 못 주면 예비 모델 동시 요청
+    LLM_HEDGE_QUANTILE: float = 0.95
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # 이보다 표본이 적으면 기본 대기 시간 사용
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 1.5
+    FAST_PATH_ENABLED: bool = True  # 인사/짧은 맞장구/작별 인사는 미리 합성한 템플릿으로 즉시 응답
+    FILLER_AUDIO_ENABLED: bool = True  # 응답 첫 오디오가 늦으면 미리 합성한 맞장구("음~")로 침묵 가리기
+    FILLER_AUDIO_BUDGET_MS: int = 700  # 최종 인식 후 이 시간 안에 응답 오디오가 없으면 필러 재생
+    FILLER_AUDIO_MAX_MS: int = 1000  # 이보다 긴 필러 음성은 사용 안 함 (응답이 밀리는 시간 상한)
+    
+    # ==================== Connection Prewarm (외부 API 연결 유지) ====================
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 90.0  # 공용 HTTP 클라이언트 유휴 연결 유지 시간
+    PREWARM_ENABLED: bool = True  # 워커 시작 시 + 통화 피크 직전에 OpenAI/Clova/RTZR 연결 미리 맺기
+    PREWARM_LEAD_SECONDS: int = 60  # 피크 시각보다 이만큼 먼저 예열 시작
+    PREWARM_HOLD_SECONDS: int = 300  # 피크 시각 이후 연결 유지 구간
+    PREWARM_KEEPALIVE_SECONDS: int = 20  # 예열 구간 동안 재요청 주기 (keep-alive 만료보다 짧게)
+    PREWARM_PEAK_MIN_CALLS: int = 3  # 같은 분에 예약된 통화가 이 이상이면 피크로 간주
+    
+    # ==================== Graceful Drain (배포 중 통화 보호) ====================
+    WORKER_PUBLIC_HOST: str | None = None  # 이 워커로 바로 연결되는 공개 도메인 (없으면 API_BASE_URL 사용)
+    WORKER_HEARTBEAT_SECONDS: int = 10  # 워커 등록부(Redis) 상태 기록 주기
+    WORKER_REGISTRY_TTL_SECONDS: int = 30  # 이 시간 동안 하트비트가 없으면 워커 목록에서 제외
+    DRAIN_EXIT_ON_COMPLETE: bool = True  # drain 완료 후 프로세스 종료 (SIGTERM)
+    DRAIN_POST_CALL_FLUSH_SECONDS: float = 30.0  # drain 완료 전 통화 후처리 등록 대기 상한
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -4,15 +4,25 @@
 from typing import Dict
 from fastapi import WebSocket
 from app.utils.performance_metrics import PerformanceMetricsCollector
+from app.utils.ring_buffer import RingBuffer
 from app.services.ai_call.session_store import get_session_store
 
 # WebSocket 연결 및 대화 세션 관리
 # 주의: llm_service와 naver_clova_tts_service는 각 통화마다 독립적인 인스턴스를 생성하여 사용
 # (동시 통화 시 충돌 방지를 위해 전역 인스턴스 사용하지 않음)
 active_connections: Dict[str, WebSocket] = {}
-conversation_sessions: Dict[str, list] = {}
+conversation_sessions: Dict[str, RingBuffer] = {}
 saved_calls: set = set()  # 중복 저장 방지용 플래그
 
+# 통화별 대화 히스토리 최대 메시지 수 (초과 시 오래된 메시지부터 밀려남)
+CONVERSATION_HISTORY_MAXLEN = 20
+
+
+def new_conversation() -> RingBuffer:
+    """conversation_sessions 값 생성 (고정 길이 링 버퍼)"""
+    return RingBuffer(maxlen=CONVERSATION_HISTORY_MAXLEN)
+
+
 # 세션 스토어
 session_store = get_session_store()
 
@@ -22,3 +32,9 @@ active_tts_completions: Dict[str, tuple[float, float]] = {}
 # 성능 메트릭 수집기 관리 (call_sid -> PerformanceMetricsCollector)
 performance_collectors: Dict[str, PerformanceMetricsCollector] = {}
 
+
+# 통화 녹음기 (stream_sid -> CallRecorder, ENABLE_CALL_RECORDING일 때만 등록)
+active_recorders: Dict[str, object] = {}
+
+# 통화별 WebSocket 송신기 (stream_sid -> OutboundSender, 모든 Twilio 송신은 이 단일 writer를 거침)
+active_senders: Dict[str, object] = {}
@@ -9,6 +9,7 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 from pathlib import Path
@@ -23,10 +24,20 @@ from app.routers import (
     dashboard,
     root,
     legal,
-    twilio
+    twilio,
+    admin
 )
 from app.config import settings, is_development
 from app.database import test_db_connection
+from app.utils.fleet_latency import fleet_latency
+from app.utils.loop_monitor import event_loop_monitor
+from app.utils.timer_scheduler import call_timers
+from app.utils.conversation_helpers import flush_pending_post_call_jobs
+from app.services.ai_call.fast_responder import phrase_audio_cache
+from app.services.ai_call.filler_audio import filler_audio_cache
+from app.services.ai_call.connection_warmer import connection_warmer
+from app.utils.http_pool import close_http_client
+from app.utils.drain import drain_controller
 
 # 로거 설정 (시간 포함)
 logging.basicConfig(
@@ -62,10 +73,52 @@ async def lifespan(app: FastAPI):
         )
         logger.info("✅ Sentry initialized")
     
+    # 지연시간 스케치 Redis 병합 루프
+    latency_flush_task = asyncio.create_task(
+        fleet_latency.run_flush_loop(settings.LATENCY_SKETCH_FLUSH_SECONDS)
+    )
+    
+    # 이벤트 루프 지연/느린 콜백 모니터
+    await event_loop_monitor.start()
+    
+    # 빠른 응답 템플릿 음성 미리 합성 (백그라운드)
+    if settings.FAST_PATH_ENABLED:
+        phrase_audio_cache.start_warmup()
+    
+    # 응답 대기 필러 음성 미리 합성 (백그라운드)
+    if settings.FILLER_AUDIO_ENABLED:
+        filler_audio_cache.start_warmup()
+    
+    # 외부 API 연결 미리 맺기 (워커 시작 + 통화 피크 직전)
+    if settings.PREWARM_ENABLED:
+        connection_warmer.start()
+    
+    # 워커 등록부 하트비트 + drain 신호(SIGUSR1) 처리
+    await drain_controller.start()
+    
     yield
     
     # Shutdown
     logger.info("👋 Shutting down Grandby API Server...")
+    
+    # 등록 중인 통화 후처리 요청 마무리
+    unfinished = await flush_pending_post_call_jobs()
+    if unfinished:
+        logger.warning(f"⚠️ 등록되지 않은 통화 후처리 요청: {unfinished}건")
+    
+    await phrase_audio_cache.stop_warmup()
+    await filler_audio_cache.stop_warmup()
+    await event_loop_monitor.stop()
+    await call_timers.stop()
+    await connection_warmer.stop()
+    await drain_controller.stop()
+    await close_http_client()
+    
+    latency_flush_task.cancel()
+    try:
+        await latency_flush_task
+    except asyncio.CancelledError:
+        pass
 
 
 # FastAPI 앱 생성
@@ -276,6 +329,13 @@ app.include_router(
 # Twilio 관련 엔드포인트
 app.include_router(twilio.router)
 
+# 관리자 (운영 지표)
+app.include_router(
+    admin.router,
+    prefix="/api/admin",
+    tags=["Admin"]
+)
+
 
 # ==================== Startup Message ====================
 if __name__ == "__main__":
@@ -3,10 +3,11 @@ AI 통화 관련 데이터베이스 모델
 CallLog, CallSettings, CallTranscript, EmotionLog
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum as SQLEnum, Text, Float, Time, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum as SQLEnum, Text, Float, Time, Boolean, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import enum
+import json
 import uuid
 
 from app.database import Base
@@ -61,6 +62,9 @@ class CallLog(Base):
     # 대화 요약 (LLM 생성)
     conversation_summary = Column(Text, nullable=True)
     
+    # 통화 통합 분석 결과 (JSON: 일기/제목/기분/일정/감정/개인화 정보)
+    call_analysis = Column(Text, nullable=True)
+    
     # Twilio 관련
     twilio_call_sid = Column(String(100), nullable=True, unique=True)
     
@@ -69,16 +73,30 @@ class CallLog(Base):
     
     # Relationships
     elderly = relationship("User", back_populates="call_logs")
-    transcripts = relationship("CallTranscript", back_populates="call")
+    transcripts = relationship("CallTranscript", back_populates="call", order_by="CallTranscript.sequence")
     emotions = relationship("EmotionLog", back_populates="call")
     
     def __repr__(self):
         return f"<CallLog {self.call_id} ({self.call_status})>"
+    
+    @property
+    def analysis(self) -> dict | None:
+        """통화 통합 분석 결과 (없거나 파싱 실패 시 None)"""
+        if not self.call_analysis:
+            return None
+        try:
+            return json.loads(self.call_analysis)
+        except (TypeError, ValueError):
+            return None
 
 
 class CallSettings(Base):
     """통화 설정 모델"""
     __tablename__ = "call_settings"
+    __table_args__ = (
+        # 스케줄러가 매분 해당 분의 활성 설정만 조회
+        Index("ix_call_settings_active_minute", "is_active", "call_minute_of_day"),
+    )
     
     # Primary Key
     setting_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -89,6 +107,7 @@ class CallSettings(Base):
     # 통화 빈도 및 시간
     frequency = Column(SQLEnum(CallFrequency), default=CallFrequency.DAILY)
     call_time = Column(Time, nullable=False)  # HH:MM:SS
+    call_minute_of_day = Column(Integer, nullable=False)  # call_time의 하루 중 분 (0~1439, call_time 설정 시 자동 계산)
     
     # 활성화 여부
     is_active = Column(Boolean, default=True)
@@ -97,6 +116,12 @@ class CallSettings(Base):
     created_at = Column(DateTime, default=kst_now)
     updated_at = Column(DateTime, default=kst_now, onupdate=kst_now)
     
+    @validates("call_time")
+    def _sync_call_minute_of_day(self, key, value):
+        """call_time이 바뀌면 분 단위 인덱스 컬럼도 함께 갱신"""
+        self.call_minute_of_day = value.hour * 60 + value.minute if value is not None else None
+        return value
+    
     def __repr__(self):
         return f"<CallSettings for {self.elderly_id}>"
 
@@ -104,6 +129,10 @@ class CallSettings(Base):
 class CallTranscript(Base):
     """통화 텍스트 변환 모델 (STT 결과)"""
     __tablename__ = "call_transcripts"
+    __table_args__ = (
+        # 같은 통화를 여러 번 저장해도 메시지가 중복되지 않도록
+        UniqueConstraint("call_id", "sequence", name="uq_call_transcripts_call_id_sequence"),
+    )
     
     # Primary Key
     transcript_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -111,12 +140,15 @@ class CallTranscript(Base):
     # Foreign Key
     call_id = Column(String(36), ForeignKey("call_logs.call_id"), nullable=False)
     
+    # 통화 내 메시지 순번 (0부터)
+    sequence = Column(Integer, nullable=True)
+    
     # 전사 내용
     speaker = Column(String(20), nullable=False)  # 'AI' or 'ELDERLY'
     text = Column(Text, nullable=False)
     
     # 타임스탬프 (통화 내 시간)
-    timestamp = Column(Float, nullable=True)  # 초 단위
+    timestamp = Column(Float, nullable=True)  # 초 단위 (통화 시작 기준 발화 시각)
     
     # 생성 시간 (한국 시간 KST)
     created_at = Column(DateTime, default=kst_now)
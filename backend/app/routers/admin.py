@@ -0,0 +1,192 @@
+"""
+관리자 API 라우터
+운영 지표 조회 (관리자 권한 필요)
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+import asyncio
+
+from app.models.user import User, UserRole
+from app.routers.auth import get_current_user
+from app.utils.fleet_latency import fleet_latency, WINDOWS, STAGES
+from app.utils.loop_monitor import event_loop_monitor
+from app.utils.timer_scheduler import call_timers
+from app.core.state import active_senders
+from app.services.ai_call.outbound_sender import WS_SEND_STAGE
+from app.services.ai_call.tts_engine import tts_provider_snapshot
+from app.services.ai_call.llm_router import llm_model_snapshot
+from app.services.ai_call.fast_responder import fast_path_stats
+from app.services.ai_call.filler_audio import filler_stats
+from app.services.ai_call.connection_warmer import connection_warmer
+from app.utils.drain import drain_controller
+from app.utils.worker_registry import list_workers
+
+router = APIRouter()
+
+
+def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """관리자 권한 확인"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자만 접근할 수 있습니다."
+        )
+    return current_user
+
+
+@router.get("/latency")
+async def get_latency_percentiles(
+    scope: str = Query("fleet", pattern="^(worker|fleet)$"),
+    current_user: User = Depends(require_admin)
+):
+    """
+    단계별 지연시간 분위수 (p50/p95/p99) - 최근 5분 / 1시간 / 1일
+
+    - scope=worker: 이 워커 프로세스의 로컬 스케치
+    - scope=fleet: Redis로 병합된 전체 워커 스케치 (워커별 내역 포함)
+    """
+    response = {
+        "worker_id": fleet_latency.worker_id,
+        "windows": list(WINDOWS),
+        "stages": list(STAGES),
+        "worker": fleet_latency.local_snapshot(),
+    }
+
+    if scope == "fleet":
+        # 최신 로컬 구간까지 반영한 뒤 병합 결과 조회
+        await asyncio.to_thread(fleet_latency.flush_to_redis)
+        fleet = await asyncio.to_thread(fleet_latency.fleet_snapshot)
+        if fleet is None:
+            response["fleet"] = None
+            response["workers"] = {}
+            response["message"] = "Redis를 사용할 수 없어 이 워커의 통계만 제공합니다."
+        else:
+            response.update(fleet)
+
+    return response
+
+
+@router.get("/event-loop")
+async def get_event_loop_health(current_user: User = Depends(require_admin)):
+    """
+    이벤트 루프 상태 (이 워커 기준)
+
+    - lag: 하트비트 지연 분위수 (5분 / 1시간 / 1일)
+    - recent_slow_callbacks: 임계값 이상 루프를 막은 코드의 스택 (최신순)
+    """
+    return event_loop_monitor.snapshot()
+
+
+@router.get("/tts-providers")
+async def get_tts_provider_health(current_user: User = Depends(require_admin)):
+    """
+    TTS 제공자별 상태 (이 워커 기준)
+
+    - circuit: closed / open / half_open
+    - first_audio_latency: 최근 구간 첫 오디오 지연시간 분위수 (헤징 기준)
+    - backup_wins: 주 제공자 대신 사용된 횟수
+    """
+    return tts_provider_snapshot()
+
+
+@router.get("/llm-models")
+async def get_llm_model_stats(current_user: User = Depends(require_admin)):
+    """
+    실시간 응답 LLM 모델별 통계 (이 워커 기준)
+
+    - ttft: 최근 구간 첫 토큰 지연시간 분위수 (헤징 기준)
+    - hedges_started: 이 모델이 느려 예비 스트림을 시작한 횟수
+    - wins: 첫 토큰 경쟁에서 이긴 횟수
+    """
+    return llm_model_snapshot()
+
+
+@router.get("/fast-path")
+async def get_fast_path_stats(current_user: User = Depends(require_admin)):
+    """
+    빠른 경로(템플릿 응답) 통계 (이 워커 기준)
+
+    - hit_rate: 최종 인식 발화 중 LLM 없이 응답한 비율
+    - audio_cache_hit_rate: 빠른 응답 중 미리 합성된 음성을 사용한 비율
+    - estimated_saved_seconds_*: LLM 경로 대비 첫 오디오 시점 차이 (p50 기준 추정)
+    """
+    return fast_path_stats.snapshot()
+
+
+@router.get("/filler")
+async def get_filler_stats(current_user: User = Depends(require_admin)):
+    """
+    응답 대기 필러 음성 통계 (이 워커 기준)
+
+    - fire_rate: LLM 경로 턴 중 예산 안에 응답 오디오가 없어 필러를 재생한 비율
+    - hidden_silence: 필러 재생 → 응답 첫 오디오 (필러가 가린 침묵) 분위수
+    - added_delay: 필러 재생이 끝나기를 기다리느라 응답이 늦어진 시간 분위수
+    """
+    return filler_stats.snapshot()
+
+
+@router.get("/connections")
+async def get_connection_stats(current_user: User = Depends(require_admin)):
+    """
+    외부 API 연결 예열 상태 (이 워커 기준)
+
+    - peaks / next_peak: 통화 예약이 몰리는 시각 (피크 직전부터 연결 유지)
+    - connections: 제공자별 실제 요청의 warm(기존 연결 재사용) / cold(새 연결) 횟수, warm_rate
+    - last_results: 마지막 예열 요청 결과
+    """
+    return connection_warmer.snapshot()
+
+
+@router.get("/timers")
+async def get_timer_stats(current_user: User = Depends(require_admin)):
+    """
+    통화 마감 타이머 상태 (이 워커 기준)
+
+    - pending: 등록된 마감 시각 수 (최대 통화 시간 경고/종료, 무응답)
+    - drift: 예정 시각 대비 실제 실행 지연 분위수
+    """
+    return call_timers.snapshot()
+
+
+@router.get("/outbound")
+async def get_outbound_sender_stats(current_user: User = Depends(require_admin)):
+    """
+    통화별 Twilio 송신기 상태 (이 워커 기준)
+
+    - queue_depth / max_queue_depth: 송신 대기 프레임 수
+    - producer_waits: 대기열이 가득 차 생산자가 기다린 횟수
+    - send_latency: 큐 투입 → 전송 완료 지연 분위수
+    """
+    return {
+        "calls": [sender.snapshot() for sender in list(active_senders.values())],
+        "send_latency": {
+            window: stages.get(WS_SEND_STAGE)
+            for window, stages in fleet_latency.local_snapshot().items()
+        },
+    }
+
+
+@router.get("/drain")
+async def get_drain_status(current_user: User = Depends(require_admin)):
+    """
+    배포 drain 진행 상황
+
+    - drain: 이 워커 상태 (active / draining / drained), 남은 통화 수, progress(0~1)
+    - workers: 워커 등록부 (Redis, 워커별 상태 / 진행 중 통화 수)
+    """
+    return {
+        "drain": drain_controller.snapshot(),
+        "workers": await asyncio.to_thread(list_workers),
+    }
+
+
+@router.post("/drain")
+async def start_drain(
+    exit_on_complete: bool | None = Query(None, description="drain 완료 후 프로세스 종료 (기본: DRAIN_EXIT_ON_COMPLETE)"),
+    current_user: User = Depends(require_admin)
+):
+    """
+    이 워커 drain 시작 (새 통화 거절, /health 503, 진행 중 통화 종료 후 후처리 등록 마무리)
+    """
+    started = drain_controller.begin(reason=f"admin:{current_user.user_id}", exit_on_complete=exit_on_complete)
+    return {"started": started, "drain": drain_controller.snapshot()}
@@ -18,6 +18,7 @@ from app.schemas.call import (
     CallTranscriptResponse
 )
 from app.models.call import CallSettings, CallLog, CallTranscript, CallFrequency, CallStatus
+from app.services.ai_call.call_schedule_cache import sync_call_schedule
 from app.models.user import User
 from app.models.diary import Diary, DiaryStatus
 from app.routers.auth import get_current_user
@@ -119,7 +120,7 @@ async def get_call_transcript(call_id: str, db: Session = Depends(get_db)):
     """
     transcripts = db.query(CallTranscript).filter(
         CallTranscript.call_id == call_id
-    ).order_by(CallTranscript.timestamp).all()
+    ).order_by(CallTranscript.sequence, CallTranscript.timestamp).all()
     
     if not transcripts:
         raise HTTPException(status_code=404, detail="No transcripts found for this call")
@@ -176,6 +177,7 @@ async def create_or_update_call_settings(
             
             db.commit()
             db.refresh(existing_setting)
+            sync_call_schedule(existing_setting)
             
             logger.info(f"✅ 전화 시간 업데이트: {elderly_id} - {settings_data.call_time}")
             return existing_setting
@@ -190,6 +192,7 @@ async def create_or_update_call_settings(
             db.add(new_setting)
             db.commit()
             db.refresh(new_setting)
+            sync_call_schedule(new_setting)
             
             logger.info(f"✅ 전화 시간 생성: {elderly_id} - {settings_data.call_time}")
             return new_setting
@@ -245,7 +248,9 @@ async def delete_call_settings(
     setting.is_active = False
     setting.updated_at = kst_now()
     db.commit()
-    
+    db.refresh(setting)
+    sync_call_schedule(setting)
+
     logger.info(f"🔕 전화 설정 비활성화: {elderly_id}")
     
     return {
@@ -281,10 +286,18 @@ async def get_extracted_todos(call_id: str, db: Session = Depends(get_db)):
     
     logger.info(f"📋 TODO 추출 시작: {call_id}")
     
+    # 0. 통화 후처리에서 저장된 통합 분석 결과가 있으면 그대로 사용 (LLM 재호출 없음)
+    call_log = db.query(CallLog).filter(CallLog.call_id == call_id).first()
+    analysis = call_log.analysis if call_log else None
+    if analysis is not None:
+        todos = analysis.get("schedules", [])
+        logger.info(f"✅ 저장된 분석 결과에서 TODO {len(todos)}개 조회")
+        return {"todos": todos}
+    
     # 1. call_transcripts에서 대화 전문 조회
     transcripts = db.query(CallTranscript).filter(
         CallTranscript.call_id == call_id
-    ).order_by(CallTranscript.timestamp).all()
+    ).order_by(CallTranscript.sequence, CallTranscript.timestamp).all()
     
     if not transcripts:
         logger.warning(f"⚠️ 대화 내용 없음: {call_id}")
@@ -2,8 +2,10 @@
 기본 엔드포인트 라우터
 """
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from app.config import settings, is_development
 from app.database import test_db_connection
+from app.utils.drain import drain_controller
 
 router = APIRouter()
 
@@ -20,13 +22,21 @@ async def root():
 
 @router.get("/health", tags=["Health"])
 async def health_check():
-    """헬스 체크 엔드포인트 (Docker, Kubernetes용)"""
+    """헬스 체크 엔드포인트 (Docker, Kubernetes용, drain 중에는 503)"""
     db_status = "healthy" if test_db_connection() else "unhealthy"
     
-    return {
+    body = {
         "status": "healthy" if db_status == "healthy" else "degraded",
         "version": settings.APP_VERSION,
         "environment": settings.ENVIRONMENT,
         "database": db_status,
     }
+    
+    # drain 중: 로드밸런서가 이 워커로 새 연결을 보내지 않도록 503
+    if drain_controller.draining:
+        body["status"] = "draining"
+        body["drain"] = drain_controller.snapshot()
+        return JSONResponse(status_code=503, content=body)
+    
+    return body
 
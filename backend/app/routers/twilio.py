@@ -19,15 +19,29 @@ from app.database import get_db
 from app.services.ai_call.twilio_service import TwilioService
 from app.services.ai_call.rtzr_stt_realtime import RTZRRealtimeSTT, LLMPartialCollector
 from app.services.ai_call.naver_clova_tts_service import NaverClovaTTSService
-from app.services.ai_call.streaming_pipeline import process_streaming_response, send_clova_audio_to_twilio
+from app.services.ai_call.tts_engine import TTSEngine
+from app.services.ai_call.fast_responder import classify_utterance, respond_fast, fast_path_stats
+from app.services.ai_call.filler_audio import FillerMasker
+from app.services.ai_call.turn_analyzer import TurnAnalyzer
+from app.services.ai_call.elder_profile import load_elder_profile, profile_to_contextual_info
+from app.services.ai_call.schedule_prefetch import prefetch_today_schedule, load_today_schedule
+from app.services.ai_call.call_recorder import CallRecorder
+from app.services.ai_call.outbound_sender import OutboundSender
+from app.services.ai_call.media_decoder import parse_media_message
+from app.services.ai_call.streaming_pipeline import process_streaming_response, synthesize_and_send_sentence
 from app.utils.conversation_helpers import get_time_based_welcome_message, save_conversation_to_db
 from app.utils.performance_metrics import PerformanceMetricsCollector
+from app.utils.drain import drain_controller
+from app.utils.worker_registry import pick_call_host
 from app.core.state import (
     active_connections,
     conversation_sessions,
     saved_calls,
     active_tts_completions,
-    performance_collectors
+    active_recorders,
+    active_senders,
+    performance_collectors,
+    new_conversation,
 )
 
 logger = logging.getLogger(__name__)
@@ -113,6 +127,9 @@ async def initiate_realtime_call(
             logger.warning(f"⚠️ 통화 기록 저장 실패 (계속 진행): {str(e)}")
             db.rollback()
         
+        # 오늘 일정 미리 조회 (통화 중 DB 조회 없이 프롬프트에 반영)
+        prefetch_today_schedule(db, call_sid, request.user_id)
+        
         logger.info(f"✅ 실시간 AI 대화 통화 발신 성공: {call_sid}")
         
         return RealtimeCallResponse(
@@ -148,7 +165,11 @@ async def voice_handler(request: Request):
         logger.error("⚠️ API_BASE_URL이 설정되지 않았습니다!")
         api_base_url = "your-domain.com"  # fallback (작동하지 않음)
     else:
-        api_base_url = settings.API_BASE_URL
+        api_base_url = settings.WORKER_PUBLIC_HOST or settings.API_BASE_URL
+    
+    # drain 중이면 다른 active 워커로 스트림 연결 (후보가 없으면 로드밸런서 도메인)
+    if drain_controller.draining:
+        api_base_url = await asyncio.to_thread(pick_call_host, True) or settings.API_BASE_URL or api_base_url
     
     websocket_url = f"wss://{api_base_url}/api/twilio/media-stream"
     
@@ -183,6 +204,13 @@ async def media_stream_handler(
     
     RTZR 실시간 STT → LLM (백그라운드) → 최종 문장 → 즉시 응답
     """
+    # drain 중인 워커는 새 통화를 받지 않음 (1013: 잠시 후 다시 시도)
+    if drain_controller.draining:
+        drain_controller.record_rejected()
+        logger.warning("🚧 [Drain] 새 미디어 스트림 연결 거절")
+        await websocket.close(code=1013)
+        return
+    
     await websocket.accept()
     logger.info("📞 Twilio WebSocket 연결됨")
     
@@ -192,9 +220,25 @@ async def media_stream_handler(
     llm_collector = None  # LLM 부분 결과 수집기
     elderly_id = None  # 통화 대상 어르신 ID
     tts_service = None  # 각 통화마다 독립적인 TTS 서비스 인스턴스 (동시 통화 충돌 방지)
+    turn_analyzer = None  # 감정/맥락 분석 사이드 파이프라인 (응답과 동시에 실행, 다음 턴에 반영)
+    profile_context = None  # 통화 전 계산된 어르신 개인화 프로필 (맥락 정보 형식)
+    today_schedule = None  # 발신 시 미리 조회한 오늘 일정 (통화 동안 메모리에서 사용)
+    recorder = None  # 통화 녹음기 (ENABLE_CALL_RECORDING)
+    outbound = None  # 통화별 Twilio 송신기 (단일 writer)
     
     try:
         async for message in websocket.iter_text():
+            # ========== 0. 오디오 데이터 (빠른 경로: 전체 JSON 파싱 없이 payload/timestamp만 추출) ==========
+            media = parse_media_message(message)
+            if media is not None:
+                audio_payload, media_timestamp = media
+                if recorder:
+                    recorder.add_inbound(audio_payload, media_timestamp)
+                if rtzr_stt and rtzr_stt.is_active:
+                    # 에코 게이트 통과 프레임만 RTZR로 전송 (AI 발화 중/직후 차단, 재개 시 프리롤 포함)
+                    await rtzr_stt.add_inbound_audio(audio_payload, media_timestamp)
+                continue
+            
             data = json.loads(message)
             event_type = data.get('event')
             
@@ -209,16 +253,46 @@ async def media_stream_handler(
                 
                 active_connections[call_sid] = websocket
                 
+                # Twilio 송신 단일 writer (환영 멘트/응답/종료 안내 모두 이 대기열을 거쳐 순서대로 전송)
+                outbound = OutboundSender(websocket, stream_sid, call_sid)
+                active_senders[stream_sid] = outbound
+                
+                # 통화 녹음 (수신/송신 프레임을 버퍼에 기록, 믹싱/S3 업로드는 별도 스레드)
+                if settings.ENABLE_CALL_RECORDING:
+                    try:
+                        recorder = CallRecorder(call_sid)
+                        active_recorders[stream_sid] = recorder
+                    except Exception as e:
+                        logger.warning(f"⚠️ 통화 녹음 시작 실패 (녹음 없이 진행): {e}")
+                
                 # 대화 세션 초기화 (LLM 대화 히스토리 관리)
                 if call_sid not in conversation_sessions:
-                    conversation_sessions[call_sid] = []
+                    conversation_sessions[call_sid] = new_conversation()
                 
                 # RTZR 실시간 STT 초기화
                 rtzr_stt = RTZRRealtimeSTT()
                 
                 # ✅ 각 통화마다 독립적인 TTS 서비스 인스턴스 생성 (동시 통화 충돌 방지)
                 tts_service = NaverClovaTTSService()
+                if settings.TTS_ENGINE_ENABLED:
+                    # 다중 제공자 엔진 (제공자 지연시간/서킷 상태는 워커 전역 공유)
+                    tts_service = TTSEngine(clova_service=tts_service)
                 logger.info(f"🔊 독립적인 TTS 서비스 인스턴스 생성 완료: {call_sid}")
+                
+                # 어르신 개인화 프로필 + 오늘 일정 (미리 계산된 Redis 키 조회, 턴마다 DB/LLM 조회 없음)
+                profile, today_schedule = await asyncio.gather(
+                    asyncio.to_thread(load_elder_profile, elderly_id)
+                    if settings.ELDER_PROFILE_ENABLED else asyncio.sleep(0),
+                    asyncio.to_thread(load_today_schedule, call_sid),
+                )
+                profile_context = profile_to_contextual_info(profile)
+                if profile_context:
+                    logger.info(f"🧓 어르신 프로필 로드: {elderly_id}")
+                if today_schedule:
+                    logger.info(f"📅 오늘 일정 {len(today_schedule)}개 로드: {call_sid}")
+                
+                if settings.ENABLE_TURN_ANALYSIS:
+                    turn_analyzer = TurnAnalyzer(call_sid, profile_context=profile_context)
 
                 # LLM 부분 결과 수집기 초기화 (백그라운드 전송)
                 async def llm_partial_callback(partial_text: str):
@@ -276,19 +350,17 @@ async def media_stream_handler(
                         rtzr_stt.start_bot_speaking()
 
                     # ✅ 독립적인 TTS 서비스 인스턴스 사용
-                    audio_data, tts_time = await tts_service.text_to_speech_bytes(welcome_text)
+                    playback_duration = await synthesize_and_send_sentence(
+                        tts_service,
+                        websocket,
+                        stream_sid,
+                        welcome_text,
+                        0,
+                        time.time()
+                    )
 
-                    if audio_data:
-                        playback_duration = await send_clova_audio_to_twilio(
-                            websocket=websocket,
-                            stream_sid=stream_sid,
-                            audio_data=audio_data,
-                            sentence_index=0,
-                            pipeline_start=time.time()
-                        )
-
-                        if playback_duration > 0:
-                            await asyncio.sleep(playback_duration * 0.9)
+                    if playback_duration > 0:
+                        await asyncio.sleep(playback_duration * 0.9)
                     else:
                         logger.warning(f" 환영 멘트 TTS 합성 실패, 건너뜀")
                 except Exception as e:
@@ -324,12 +396,18 @@ async def media_stream_handler(
                             logger.debug(f"🔍 [결과 수신] event={event_name}, keys={list(result.keys())}")
                             
                             
-                            if event_name == 'max_time_warning':
-                                logger.info("⚠️ [MAX TIME WARNING] 최대 통화 시간 임박 감지")
+                            if event_name in ('max_time_warning', 'silence_timeout'):
+                                # 무응답 종료와 최대 통화 시간 종료를 로그에서 구분
+                                if event_name == 'silence_timeout':
+                                    event_tag = "[SILENCE TIMEOUT]"
+                                    logger.info(f"🔕 {event_tag} 사용자 무응답 시간 초과 감지")
+                                else:
+                                    event_tag = "[MAX TIME WARNING]"
+                                    logger.info(f"⚠️ {event_tag} 최대 통화 시간 임박 감지")
                                 
                                 # 1. AI TTS 출력 중인지 체크
                                 if rtzr_stt.is_bot_speaking:
-                                    logger.info("⏳ [MAX TIME WARNING] AI 응답 중 - 완료까지 대기")
+                                    logger.info(f"⏳ {event_tag} AI 응답 중 - 완료까지 대기")
                                     while rtzr_stt.is_bot_speaking:
                                         await asyncio.sleep(0.1)
                                     # AI 응답 완료 후 추가 대기 (사용자가 응답할 시간)
@@ -337,14 +415,17 @@ async def media_stream_handler(
                                 
                                 # 2. 사용자 발화 중인지 체크
                                 if rtzr_stt.is_user_speaking():
-                                    logger.info("⏳ [MAX TIME WARNING] 사용자 발화 중 - 완료까지 대기")
+                                    logger.info(f"⏳ {event_tag} 사용자 발화 중 - 완료까지 대기")
                                     while rtzr_stt.is_user_speaking():
                                         await asyncio.sleep(0.1)
                                     # 사용자 발화 완료 후 추가 대기
                                     await asyncio.sleep(0.5)
                                 
                                 # 종료 안내 멘트
-                                warning_message = "오늘 대화 시간이 다 되었어요. 잠시 후 통화가 마무리됩니다."
+                                if event_name == 'silence_timeout':
+                                    warning_message = "어르신, 말씀이 없으셔서 오늘은 여기까지 할게요. 다음에 또 전화드릴게요."
+                                else:
+                                    warning_message = "오늘 대화 시간이 다 되었어요. 잠시 후 통화가 마무리됩니다."
                                 
                                 # 대화 세션에 추가
                                 if call_sid in conversation_sessions:
@@ -356,16 +437,15 @@ async def media_stream_handler(
                                 logger.info(f"🔊 [TTS] 종료 안내 메시지 전송: {warning_message}")
                                 
                                 # ✅ 독립적인 TTS 서비스 인스턴스 사용
-                                audio_data, tts_time = await tts_service.text_to_speech_bytes(warning_message)
-                                if audio_data:
-                                    playback_duration = await send_clova_audio_to_twilio(
-                                        websocket,
-                                        stream_sid,
-                                        audio_data,
-                                        0,
-                                        time.time()
-                                    )
-                                    
+                                playback_duration = await synthesize_and_send_sentence(
+                                    tts_service,
+                                    websocket,
+                                    stream_sid,
+                                    warning_message,
+                                    0,
+                                    time.time()
+                                )
+                                if playback_duration > 0:
                                     # TTS 완료 시간 기록
                                     completion_time = time.time()
                                     active_tts_completions[call_sid] = (completion_time, playback_duration)
@@ -373,21 +453,22 @@ async def media_stream_handler(
                                     
                                     # 재생 완료까지 대기 (20% 여유)
                                     await asyncio.sleep(playback_duration * 1.2)
-                                    logger.info("✅ [MAX TIME WARNING] 종료 안내 재생 완료")
+                                    logger.info(f"✅ {event_tag} 종료 안내 재생 완료")
                                     
                                     # 종료 안내 후 1초 추가 대기 (사용자가 인지할 시간)
                                     await asyncio.sleep(1.0)
-                                    logger.info("⏳ [MAX TIME WARNING] 종료 안내 후 대기 완료, 통화 종료 진행")
+                                    logger.info(f"⏳ {event_tag} 종료 안내 후 대기 완료, 통화 종료 진행")
                                 else:
-                                    logger.error("❌ [MAX TIME WARNING] TTS 변환 실패")
+                                    logger.error(f"❌ {event_tag} TTS 변환 실패")
                                     await asyncio.sleep(1.0)
                                 
-                                # 종료 안내 후 즉시 통화 종료
+                                # 종료 안내 후 즉시 통화 종료 (대기 중인 오디오 전송 후)
                                 try:
+                                    await outbound.close()
                                     await websocket.close()
-                                    logger.info("✅ [MAX TIME WARNING] 통화 종료 완료")
+                                    logger.info(f"✅ {event_tag} 통화 종료 완료")
                                 except Exception as e:
-                                    logger.error(f"❌ [MAX TIME WARNING] 통화 종료 오류: {e}")
+                                    logger.error(f"❌ {event_tag} 통화 종료 오류: {e}")
                                 break
 
                             # ====== 일반 STT 처리 ======
@@ -409,9 +490,8 @@ async def media_stream_handler(
                                 # 현재 턴이 있으면 기록하고, 없으면 다음 턴에서 기록됨
                                 if call_sid in performance_collectors and rtzr_stt:
                                     metrics_collector = performance_collectors[call_sid]
-                                    if metrics_collector.metrics["turns"]:
-                                        turn_index = len(metrics_collector.metrics["turns"]) - 1
-                                        turn = metrics_collector.metrics["turns"][turn_index]
+                                    if metrics_collector.turns:
+                                        turn_index = len(metrics_collector.turns) - 1
                                         
                                         # 사용자 발화 시작 시간 가져오기 (RTZR에서)
                                         speech_start_time = None
@@ -450,7 +530,7 @@ async def media_stream_handler(
                                     
                                     # 대화 세션에 사용자 메시지 추가
                                     if call_sid not in conversation_sessions:
-                                        conversation_sessions[call_sid] = []
+                                        conversation_sessions[call_sid] = new_conversation()
                                     conversation_sessions[call_sid].append({"role": "user", "content": text})
                                     
                                     goodbye_text = "그랜비 통화를 종료합니다. 감사합니다. 좋은 하루 보내세요!"
@@ -486,7 +566,7 @@ async def media_stream_handler(
                                 
                                 # 대화 세션에 사용자 메시지 추가
                                 if call_sid not in conversation_sessions:
-                                    conversation_sessions[call_sid] = []
+                                    conversation_sessions[call_sid] = new_conversation()
                                 conversation_sessions[call_sid].append({"role": "user", "content": text})
                                 
                                 conversation_history = conversation_sessions[call_sid]
@@ -497,27 +577,74 @@ async def media_stream_handler(
                                     stt_to_llm_delay = llm_delivery_start - stt_complete_time
                                     logger.info(f"⏱️ [지연시간] 최종 인식 → LLM 전달: {stt_to_llm_delay:.2f}초")
                                 
+                                # 이전 턴까지의 감정/맥락 분석 결과 (대기 없음) → 이번 발화 분석은 응답과 동시에 시작
+                                emotion_context, contextual_info = None, profile_context
+                                if turn_analyzer:
+                                    emotion_context, contextual_info = turn_analyzer.context()
+                                    turn_analyzer.submit(text, conversation_history)
+                                
                                 # ✅ AI 응답 시작 (사용자 입력 차단)
                                 rtzr_stt.start_bot_speaking()
                                 
-                                # LLM 응답 생성 (메트릭 수집을 위해 수정된 함수 사용)
-                                logger.info("🤖 [LLM] 응답 생성 시작")
+                                # 인사/짧은 맞장구/작별 인사는 템플릿으로 즉시 응답 (LLM 생략)
+                                fast_category = None
+                                if settings.FAST_PATH_ENABLED:
+                                    fast_category = classify_utterance(text, conversation_history)
+                                    fast_path_stats.record_utterance()
+                                
                                 llm_start_time = time.time()
-                                ai_response = await process_streaming_response(
-                                    websocket,
-                                    stream_sid,
-                                    text,
-                                    conversation_history,
-                                    rtzr_stt=rtzr_stt,
-                                    call_sid=call_sid,
-                                    metrics_collector=performance_collectors.get(call_sid),
-                                    turn_index=turn_index,
-                                    tts_service=tts_service  # 독립적인 TTS 서비스 인스턴스 전달
-                                )
+                                if fast_category:
+                                    metrics_collector = performance_collectors.get(call_sid)
+                                    
+                                    def record_fast_audio(sentence_index: int):
+                                        if metrics_collector is not None and turn_index is not None:
+                                            metrics_collector.record_tts_completion(turn_index, time.time(), is_first_sentence=True)
+                                    
+                                    ai_response, playback_duration = await respond_fast(
+                                        websocket,
+                                        stream_sid,
+                                        fast_category,
+                                        conversation_history,
+                                        tts_service,
+                                        stt_complete_time,
+                                        on_audio_ready=record_fast_audio
+                                    )
+                                    active_tts_completions[call_sid] = (time.time(), playback_duration)
+                                    if playback_duration > 0:
+                                        await asyncio.sleep(playback_duration * 1.1)
+                                else:
+                                    # 응답 첫 오디오가 예산 안에 준비되지 않으면 맞장구 필러 재생 (침묵 가리기)
+                                    filler = None
+                                    if settings.FILLER_AUDIO_ENABLED and stt_complete_time:
+                                        filler = FillerMasker(websocket, stream_sid, stt_complete_time)
+                                        filler.start()
+                                    
+                                    # LLM 응답 생성 (메트릭 수집을 위해 수정된 함수 사용)
+                                    logger.info("🤖 [LLM] 응답 생성 시작")
+                                    ai_response = await process_streaming_response(
+                                        websocket,
+                                        stream_sid,
+                                        text,
+                                        conversation_history,
+                                        rtzr_stt=rtzr_stt,
+                                        call_sid=call_sid,
+                                        metrics_collector=performance_collectors.get(call_sid),
+                                        turn_index=turn_index,
+                                        tts_service=tts_service,  # 독립적인 TTS 서비스 인스턴스 전달
+                                        today_schedule=today_schedule,
+                                        emotion_context=emotion_context,
+                                        contextual_info=contextual_info,
+                                        on_first_audio=filler.mark_audio_ready if filler else None
+                                    )
+                                    if filler:
+                                        # 필러 뒤로 밀린 만큼 재생 완료 대기 연장
+                                        filler_delay = await filler.finish()
+                                        if filler_delay > 0:
+                                            await asyncio.sleep(filler_delay)
                                 llm_end_time = time.time()
                                 llm_duration = llm_end_time - llm_start_time
                                 
-                                # ✅ AI 응답 종료 (1초 후 사용자 입력 재개)
+                                # ✅ AI 응답 종료 (ECHO_GATE_TAIL_MS 후 사용자 입력 재개)
                                 rtzr_stt.stop_bot_speaking()
                                 
                                 logger.info("✅ [LLM] 응답 생성 완료")
@@ -525,6 +652,13 @@ async def media_stream_handler(
                                 # 메트릭 수집: LLM 완료 및 턴 종료
                                 if call_sid in performance_collectors and turn_index is not None:
                                     metrics_collector = performance_collectors[call_sid]
+                                    if fast_category:
+                                        metrics_collector.record_fast_path(turn_index, fast_category)
+                                    else:
+                                        # 빠른 경로 절감 시간 비교용 (최종 인식 → 첫 오디오)
+                                        first_audio_time = metrics_collector.turns[turn_index].tts_first_completion_time
+                                        if first_audio_time:
+                                            fast_path_stats.record_llm_turn(first_audio_time - stt_complete_time)
                                     metrics_collector.record_llm_completion(turn_index, llm_end_time, ai_response)
                                     metrics_collector.record_turn_end(turn_index, llm_end_time)
                                 
@@ -539,10 +673,6 @@ async def media_stream_handler(
                                         # conversation_sessions에 여전히 존재하는지 확인
                                         if call_sid in conversation_sessions:
                                             conversation_sessions[call_sid].append({"role": "assistant", "content": ai_response})
-                                        
-                                        # 대화 히스토리 관리
-                                        if call_sid in conversation_sessions and len(conversation_sessions[call_sid]) > 20:
-                                            conversation_sessions[call_sid] = conversation_sessions[call_sid][-20:]
                                     
                                     total_cycle_time = time.time() - turn_start_time
                                     logger.info(f"⏱️  전체 응답 사이클: {total_cycle_time:.2f}초")
@@ -567,23 +697,17 @@ async def media_stream_handler(
                 # RTZR 스트리밍 태스크 시작 (백그라운드)
                 rtzr_task = asyncio.create_task(process_rtzr_results())
                 
-            # ========== 2. 오디오 데이터 수신 및 RTZR로 전송 ==========
+            # ========== 2. 오디오 데이터 수신 및 RTZR로 전송 (빠른 경로로 해석되지 않은 형식) ==========
             elif event_type == 'media':
+                # Base64 디코딩 (Twilio는 mulaw 8kHz로 전송)
+                audio_payload = base64.b64decode(data['media']['payload'])
+                media_timestamp = data['media'].get('timestamp')
+                
+                if recorder:
+                    recorder.add_inbound(audio_payload, media_timestamp)
+                
                 if rtzr_stt and rtzr_stt.is_active:
-                    # ✅ AI 응답 중이면 오디오 무시 (에코 방지)
-                    if rtzr_stt.is_bot_speaking:
-                        continue
-                    
-                    # ✅ AI 응답 종료 후 1초 대기 중이면 무시
-                    if rtzr_stt.bot_silence_delay > 0:
-                        rtzr_stt.bot_silence_delay -= 1
-                        continue
-                    
-                    # Base64 디코딩 (Twilio는 mulaw 8kHz로 전송)
-                    audio_payload = base64.b64decode(data['media']['payload'])
-                    
-                    # RTZR로 오디오 청크 전송
-                    await rtzr_stt.add_audio_chunk(audio_payload)
+                    await rtzr_stt.add_inbound_audio(audio_payload, media_timestamp)
                         
             # ========== 3. 스트림 종료 ==========
             elif event_type == 'stop':
@@ -605,14 +729,7 @@ async def media_stream_handler(
                     await rtzr_stt.end_streaming()
                     logger.info("🛑 RTZR 스트리밍 종료")
                 
-                # ✅ 성능 메트릭 최종 저장
-                if call_sid in performance_collectors:
-                    metrics_collector = performance_collectors[call_sid]
-                    metrics_file = metrics_collector.finalize()
-                    logger.info(f"📊 성능 메트릭 최종 저장 완료: {metrics_file}")
-                    del performance_collectors[call_sid]
-                
-                # ✅ 대화 세션을 DB에 저장 (함수 호출)
+                # ✅ 대화 세션 후처리 등록 (요약/DB 저장은 Celery 워커에서 수행)
                 if call_sid in conversation_sessions:
                     conversation = conversation_sessions[call_sid]
                     
@@ -627,6 +744,13 @@ async def media_stream_handler(
                     
                     await save_conversation_to_db(call_sid, conversation)
                 
+                # ✅ 성능 메트릭 최종 저장 (발화 시각 계산에 쓰이므로 후처리 등록 이후 정리)
+                if call_sid in performance_collectors:
+                    metrics_collector = performance_collectors[call_sid]
+                    metrics_file = metrics_collector.finalize()
+                    logger.info(f"📊 성능 메트릭 최종 저장 완료: {metrics_file}")
+                    del performance_collectors[call_sid]
+                
                 logger.info(f"┌{'─'*58}┐")
                 logger.info(f"│ ✅ Twilio 통화 정리 완료                               │")
                 logger.info(f"└{'─'*58}┘\n")
@@ -643,10 +767,24 @@ async def media_stream_handler(
             try:
                 conversation = conversation_sessions[call_sid]
                 await save_conversation_to_db(call_sid, conversation)
-                logger.info(f"🔄 Finally 블록에서 DB 저장 완료: {call_sid}")
+                logger.info(f"🔄 Finally 블록에서 후처리 등록 완료: {call_sid}")
             except Exception as e:
                 logger.error(f"❌ Finally 블록 DB 저장 실패: {e}")
         
+        # ✅ 송신기 종료 (녹음기에 마지막 송신 오디오가 기록되도록 녹음 종료 전에)
+        if outbound:
+            await outbound.close()
+            active_senders.pop(stream_sid, None)
+        
+        # ✅ 녹음 종료 (업로드는 백그라운드 스레드에서 마무리, 기다리지 않음)
+        if recorder:
+            recorder.finish()
+            active_recorders.pop(stream_sid, None)
+        
+        # ✅ 진행 중인 턴 분석 취소
+        if turn_analyzer:
+            await turn_analyzer.close()
+        
         # ✅ TTS 서비스 리소스 정리
         if tts_service:
             try:
@@ -732,7 +870,7 @@ async def call_status_handler(
                 try:
                     conversation = conversation_sessions[CallSid]
                     await save_conversation_to_db(CallSid, conversation)
-                    logger.info(f"💾 콜백에서 통화 기록 저장 완료: {CallSid}")
+                    logger.info(f"💾 콜백에서 통화 기록 후처리 등록 완료: {CallSid}")
                 except Exception as e:
                     logger.error(f"❌ 콜백 DB 저장 실패: {e}")
             
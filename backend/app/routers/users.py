@@ -23,6 +23,7 @@ from app.schemas.user import (
 )
 from app.models.user import User, UserSettings, UserConnection, UserRole, ConnectionStatus, Gender
 from app.models.call import CallSettings
+from app.services.ai_call.call_schedule_cache import sync_call_schedule
 from app.models.notification import Notification, NotificationType
 from app.routers.auth import get_current_user, pwd_context
 from app.utils.image import save_profile_image, delete_profile_image
@@ -769,6 +770,7 @@ async def update_call_schedule(
         
         db.commit()
         db.refresh(settings)
+        sync_call_schedule(settings)
         
         logger.info(f"✅ 자동 통화 스케줄 업데이트 완료: {current_user.user_id} - {settings.call_time} (활성화: {settings.is_active})")
         
@@ -1013,6 +1015,7 @@ async def update_elderly_call_schedule(
         
         db.commit()
         db.refresh(settings)
+        sync_call_schedule(settings)
         
         logger.info(f"✅ 어르신 자동 통화 스케줄 업데이트 완료: {elderly_id} - {settings.call_time} (활성화: {settings.is_active})")
         
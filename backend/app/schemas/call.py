@@ -55,6 +55,7 @@ class CallSettingsResponse(BaseModel):
 class CallTranscriptResponse(BaseModel):
     """통화 텍스트 응답"""
     transcript_id: str
+    sequence: Optional[int] = None
     speaker: str
     text: str
     timestamp: Optional[float]
@@ -0,0 +1,122 @@
+"""
+점진적 오디오 디코딩 (TTS 스트리밍 응답용)
+- StreamingWavDecoder: 도착하는 바이트에서 WAV 헤더를 파싱하고 PCM 블록을 순서대로 반환
+- MulawStreamEncoder: PCM 블록을 8kHz mono μ-law로 변환 (ratecv 상태를 블록 사이에 유지)
+"""
+
+import audioop
+import struct
+from typing import Optional
+
+TWILIO_SAMPLE_RATE = 8000
+
+
+class StreamingWavDecoder:
+    """청크 단위로 들어오는 WAV(RIFF) 스트림 파서"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._state = "riff"  # riff → chunk → data
+        self._data_remaining: Optional[int] = None
+
+        self.channels: Optional[int] = None
+        self.sample_width: Optional[int] = None
+        self.framerate: Optional[int] = None
+        self.block_align: Optional[int] = None
+
+    @property
+    def header_ready(self) -> bool:
+        """fmt 청크 파싱 완료 및 data 청크 진입 여부"""
+        return self._state == "data"
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        수신한 바이트 추가 후 지금까지 디코딩 가능한 PCM 반환 (프레임 경계 정렬)
+
+        Raises:
+            ValueError: WAV 형식이 아닌 경우
+        """
+        self._buffer += data
+        out = bytearray()
+
+        while True:
+            if self._state == "riff":
+                if len(self._buffer) < 12:
+                    break
+                if self._buffer[0:4] != b"RIFF" or self._buffer[8:12] != b"WAVE":
+                    raise ValueError("WAV(RIFF) 형식이 아닙니다")
+                del self._buffer[:12]
+                self._state = "chunk"
+
+            elif self._state == "chunk":
+                if len(self._buffer) < 8:
+                    break
+                chunk_id = bytes(self._buffer[0:4])
+                chunk_size = struct.unpack("<I", self._buffer[4:8])[0]
+
+                if chunk_id == b"data":
+                    if self.block_align is None:
+                        raise ValueError("fmt 청크보다 data 청크가 먼저 나왔습니다")
+                    del self._buffer[:8]
+                    # 스트리밍 WAV는 크기를 0 또는 0xFFFFFFFF로 보내기도 함 → 끝까지 읽음
+                    self._data_remaining = None if chunk_size in (0, 0xFFFFFFFF) else chunk_size
+                    self._state = "data"
+                    continue
+
+                padded = chunk_size + (chunk_size & 1)
+                if len(self._buffer) < 8 + padded:
+                    break
+                if chunk_id == b"fmt ":
+                    _, channels, framerate, _, block_align, bits = struct.unpack(
+                        "<HHIIHH", self._buffer[8:24]
+                    )
+                    self.channels = channels
+                    self.framerate = framerate
+                    self.sample_width = bits // 8
+                    self.block_align = block_align or channels * (bits // 8)
+                # fmt 외 청크(LIST 등)는 건너뜀
+                del self._buffer[:8 + padded]
+
+            else:  # data
+                available = len(self._buffer)
+                if self._data_remaining is not None:
+                    available = min(available, self._data_remaining)
+                available -= available % self.block_align
+                if available > 0:
+                    out += self._buffer[:available]
+                    del self._buffer[:available]
+                    if self._data_remaining is not None:
+                        self._data_remaining -= available
+                break
+
+        return bytes(out)
+
+
+class MulawStreamEncoder:
+    """PCM 블록 → 8kHz mono μ-law (Twilio Media Streams 형식)"""
+
+    def __init__(self, framerate: int, sample_width: int, channels: int):
+        self.framerate = framerate
+        self.sample_width = sample_width
+        self.channels = channels
+        self._ratecv_state = None
+
+    def encode(self, pcm: bytes) -> bytes:
+        if not pcm:
+            return b""
+
+        # Stereo → Mono 변환
+        if self.channels == 2:
+            pcm = audioop.tomono(pcm, self.sample_width, 1, 1)
+
+        # 16bit로 통일 (μ-law 변환 입력)
+        if self.sample_width != 2:
+            pcm = audioop.lin2lin(pcm, self.sample_width, 2)
+
+        # 샘플레이트 변환: 8kHz (블록 간 필터 상태 유지로 경계 잡음 방지)
+        if self.framerate != TWILIO_SAMPLE_RATE:
+            pcm, self._ratecv_state = audioop.ratecv(
+                pcm, 2, 1, self.framerate, TWILIO_SAMPLE_RATE, self._ratecv_state
+            )
+
+        return audioop.lin2ulaw(pcm, 2)
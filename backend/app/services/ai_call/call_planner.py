@@ -0,0 +1,270 @@
+"""
+예약 통화 분산 계획 (CALL_SMOOTHING_ENABLED)
+- call_time을 "목표 시각"으로 보고 [목표 - CALL_WINDOW_BEFORE_MINUTES, 목표 + CALL_WINDOW_AFTER_MINUTES]
+  안에서 실제 발신 분(slot)을 배정 → 동시 통화 수(통화 1건 = CALL_PLANNER_CALL_MINUTES분 점유)가
+  CALL_CONCURRENCY_CEILING을 넘지 않도록 평탄화 (넘을 수밖에 없으면 봉우리가 가장 낮은 분)
+- 배정은 목표 시각 순서대로 목표에 가장 가까운 분부터 시도 (같은 입력이면 항상 같은 계획)
+- 하루 계획은 첫 스케줄러 실행 때 1번 만들어 Redis 정렬 집합 `call_plan:{YYYY-MM-DD}`에 고정
+  (member: elderly_id, score: 발신 분) → 하루 중 다시 계산되어 이미 지난 배정이 바뀌는 일이 없음
+- 하루 중 설정 변경은 해당 어르신만 남은 시간대(지금 이후)에 다시 배정
+- Redis를 쓸 수 없으면 같은 설정으로 프로세스에서 계획을 다시 계산해 조회 (목표 분으로 되돌아가지 않음
+  → 한꺼번에 발신하거나, Redis 복구 후 같은 어르신에게 다시 발신하는 일 방지)
+- 오프라인 보고서: python -m scripts.call_planner_report (계획 전후 최대 동시 통화 수)
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.call import CallSettings
+from app.utils.datetime_utils import kst_now
+from app.utils.redis_client import get_redis, reset_redis
+
+logger = logging.getLogger(__name__)
+
+DAY_MINUTES = 24 * 60
+
+PLAN_KEY = "call_plan:{day}"
+PLAN_BUILT_KEY = "call_plan:{day}:built"
+DIALED_KEY = "call_plan:{day}:dialed"  # 오늘 발신 대상으로 꺼낸 어르신 (계획을 하루 중간에 다시 만들 때 제외)
+
+# 어제 계획은 자정 직후 분산된 통화 확인용으로만 남김
+PLAN_TTL_SECONDS = 2 * 24 * 3600
+
+
+# ---------- 계획 계산 (DB / Redis 없음) ----------
+
+def concurrency_profile(slots: Iterable[int], call_minutes: int) -> List[int]:
+    """분별 동시 통화 수 (발신 분부터 call_minutes분 동안 점유, 자정 넘는 부분은 버림)"""
+    profile = [0] * DAY_MINUTES
+    for slot in slots:
+        for minute in range(slot, min(slot + call_minutes, DAY_MINUTES)):
+            profile[minute] += 1
+    return profile
+
+
+def _window_candidates(target: int, before: int, after: int, earliest: int) -> List[int]:
+    """목표에 가까운 순서 (0, +1, -1, +2, -2, ...) - 목표 이후를 먼저"""
+    low = max(target - before, earliest, 0)
+    high = min(target + after, DAY_MINUTES - 1)
+    candidates = []
+    for offset in range(max(before, after) + 1):
+        for slot in ((target,) if offset == 0 else (target + offset, target - offset)):
+            if low <= slot <= high:
+                candidates.append(slot)
+    return candidates
+
+
+def plan_dial_slots(
+    targets: Dict[str, int],
+    ceiling: int,
+    call_minutes: int,
+    window_before: int,
+    window_after: int,
+    occupancy: Optional[List[int]] = None,
+    earliest: int = 0,
+) -> Dict[str, int]:
+    """
+    목표 분 → 발신 분 배정
+
+    Args:
+        targets: {elderly_id: 목표 분 (0~1439)}
+        ceiling: 동시 통화 상한
+        call_minutes: 통화 1건이 점유하는 분
+        window_before / window_after: 목표 기준 허용 범위 (분)
+        occupancy: 이미 배정된 통화의 분별 동시 통화 수 (하루 중 재배정 시)
+        earliest: 이 분보다 이른 발신 분은 배정하지 않음 (이미 지난 시각)
+
+    Returns:
+        {elderly_id: 발신 분} (허용 범위가 모두 지났으면 빠짐)
+    """
+    occupancy = list(occupancy) if occupancy is not None else [0] * DAY_MINUTES
+    plan: Dict[str, int] = {}
+
+    for elderly_id, target in sorted(targets.items(), key=lambda item: (item[1], item[0])):
+        best = best_peak = None
+        for slot in _window_candidates(target, window_before, window_after, earliest):
+            peak = max(occupancy[slot:min(slot + call_minutes, DAY_MINUTES)])
+            if peak < ceiling:
+                best = slot
+                break
+            if best_peak is None or peak < best_peak:
+                best, best_peak = slot, peak
+        if best is None:
+            continue
+
+        for minute in range(best, min(best + call_minutes, DAY_MINUTES)):
+            occupancy[minute] += 1
+        plan[elderly_id] = best
+
+    return plan
+
+
+def plan_report(targets: Dict[str, int], plan: Dict[str, int], call_minutes: int) -> Dict:
+    """계획 전후 최대 동시 통화 수 / 발신 분 이동 요약"""
+    before = concurrency_profile(targets.values(), call_minutes)
+    after = concurrency_profile(plan.values(), call_minutes)
+    shifts = [plan[elderly_id] - targets[elderly_id] for elderly_id in plan]
+
+    def peak(profile: List[int]) -> Dict:
+        value = max(profile) if profile else 0
+        minute = profile.index(value)
+        return {"concurrency": value, "at": f"{minute // 60:02d}:{minute % 60:02d}"}
+
+    return {
+        "calls": len(targets),
+        "planned": len(plan),
+        "peak_before": peak(before),
+        "peak_after": peak(after),
+        "shifted_calls": sum(1 for shift in shifts if shift),
+        "max_shift_minutes": max((abs(shift) for shift in shifts), default=0),
+        "avg_shift_minutes": (sum(abs(shift) for shift in shifts) / len(shifts)) if shifts else 0.0,
+    }
+
+
+def plan_with_settings(targets: Dict[str, int], **overrides) -> Dict[str, int]:
+    """설정값(CALL_CONCURRENCY_CEILING 등)으로 계획 (인자로 개별 덮어쓰기)"""
+    options = {
+        "ceiling": settings.CALL_CONCURRENCY_CEILING,
+        "call_minutes": settings.CALL_PLANNER_CALL_MINUTES,
+        "window_before": settings.CALL_WINDOW_BEFORE_MINUTES,
+        "window_after": settings.CALL_WINDOW_AFTER_MINUTES,
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return plan_dial_slots(targets, **options)
+
+
+# ---------- 하루 계획 (Redis) ----------
+
+def load_targets(db: Session) -> Dict[str, int]:
+    """활성 통화 설정 → {elderly_id: 목표 분}"""
+    rows = db.query(CallSettings.elderly_id, CallSettings.call_minute_of_day).filter(
+        CallSettings.is_active.is_(True)
+    ).all()
+    return {elderly_id: minute for elderly_id, minute in rows}
+
+
+def _day_keys(day: str):
+    return PLAN_KEY.format(day=day), PLAN_BUILT_KEY.format(day=day)
+
+
+def _build_daily_plan(db: Session, client, day: str, current_minute: int) -> None:
+    """
+    오늘 계획 생성 (같은 설정이면 같은 계획 → 여러 워커가 동시에 만들어도 결과 동일)
+
+    하루 중간에 만들어지면(기능을 켠 직후 / Redis 재시작·축출로 계획 유실) 허용 범위가 아직
+    지나지 않은 어르신을 모두 지금 이후로 다시 배정
+    이미 오늘 발신 대상으로 꺼낸 어르신(DIALED_KEY)은 제외 → Redis 전체가 초기화된 경우에만
+    범위가 남은 어르신이 다시 발신될 수 있음
+    """
+    plan_key, built_key = _day_keys(day)
+    dialed = client.smembers(DIALED_KEY.format(day=day))
+    targets = {
+        elderly_id: target
+        for elderly_id, target in load_targets(db).items()
+        if target + settings.CALL_WINDOW_AFTER_MINUTES >= current_minute and elderly_id not in dialed
+    }
+    plan = plan_with_settings(targets, earliest=current_minute)
+    report = plan_report(targets, plan, settings.CALL_PLANNER_CALL_MINUTES)
+
+    tmp_key = f"{plan_key}:building"
+    pipe = client.pipeline(transaction=True)
+    pipe.delete(tmp_key)
+    if plan:
+        pipe.zadd(tmp_key, plan)
+        pipe.rename(tmp_key, plan_key)
+        pipe.expire(plan_key, PLAN_TTL_SECONDS)
+    pipe.set(built_key, "1", ex=PLAN_TTL_SECONDS)
+    pipe.execute()
+    logger.info(
+        f"🗓️ 통화 분산 계획 생성 ({day}): {report['planned']}건, "
+        f"최대 동시 통화 {report['peak_before']['concurrency']} → {report['peak_after']['concurrency']} "
+        f"(이동 {report['shifted_calls']}건, 최대 {report['max_shift_minutes']}분)"
+    )
+
+
+def mark_dialed(elderly_ids: List[str]) -> None:
+    """오늘 발신 대상으로 꺼낸 어르신 기록 (분산 모드 여부와 관계없이 - 하루 중간에 켜는 경우 대비)"""
+    if not elderly_ids:
+        return
+    client = get_redis()
+    if client is None:
+        return
+
+    key = DIALED_KEY.format(day=kst_now().strftime("%Y-%m-%d"))
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.sadd(key, *elderly_ids)
+        pipe.expire(key, PLAN_TTL_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ 오늘 발신 기록 실패: {e}")
+        reset_redis(client)
+
+
+def _planned_ids_in_process(db: Session, minute: int) -> List[str]:
+    """Redis 없이 오늘 계획을 다시 계산해 이 분에 배정된 어르신 ID (하루 시작에 만든 계획과 같은 결과)"""
+    plan = plan_with_settings(load_targets(db))
+    return [elderly_id for elderly_id, slot in plan.items() if slot == minute]
+
+
+def planned_elderly_ids(db: Session, minute: int) -> List[str]:
+    """
+    오늘 계획에서 이 분에 발신할 어르신 ID (계획이 없으면 먼저 생성)
+
+    Redis를 쓸 수 없으면 프로세스에서 계획을 계산 (목표 분 그대로 발신하지 않음)
+    """
+    client = get_redis()
+    if client is not None:
+        now = kst_now()
+        day = now.strftime("%Y-%m-%d")
+        plan_key, built_key = _day_keys(day)
+        try:
+            if not client.exists(built_key):
+                _build_daily_plan(db, client, day, min(minute, now.hour * 60 + now.minute))
+            return client.zrangebyscore(plan_key, minute, minute)
+        except Exception as e:
+            logger.warning(f"⚠️ 통화 분산 계획 조회 실패 (프로세스에서 계획 계산): {e}")
+            reset_redis(client)
+
+    return _planned_ids_in_process(db, minute)
+
+
+def replan_elder(elderly_id: str, target_minute: Optional[int]) -> None:
+    """
+    하루 중 설정 변경 - 오늘 계획에서 이 어르신만 지금 이후로 다시 배정 (비활성화면 제거)
+
+    오늘 계획이 아직 없으면 아무것도 하지 않음 (생성할 때 반영)
+    이미 오늘 발신 분이 지났으면 그대로 둠 (하루 두 번 발신 방지, 다음 날 계획부터 반영)
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    now = kst_now()
+    current_minute = now.hour * 60 + now.minute
+    plan_key, built_key = _day_keys(now.strftime("%Y-%m-%d"))
+    try:
+        if not client.exists(built_key):
+            return
+        slot = client.zscore(plan_key, elderly_id)
+        if slot is not None and slot <= current_minute:
+            return
+        client.zrem(plan_key, elderly_id)
+        if target_minute is None:
+            return
+
+        others = client.zrange(plan_key, 0, -1, withscores=True)
+        occupancy = concurrency_profile((int(score) for _, score in others), settings.CALL_PLANNER_CALL_MINUTES)
+        plan = plan_with_settings(
+            {elderly_id: target_minute},
+            occupancy=occupancy,
+            earliest=current_minute + 1,
+        )
+        if plan:
+            client.zadd(plan_key, plan)
+    except Exception as e:
+        logger.warning(f"⚠️ 통화 분산 계획 갱신 실패 ({elderly_id}): {e}")
+        reset_redis(client)
@@ -0,0 +1,257 @@
+"""
+통화 녹음 (Twilio Media Stream → S3)
+- 수신(어르신) / 송신(AI) μ-law 프레임을 통화 시작 기준 샘플 위치에 맞춰 통화별 버퍼에 기록
+  - 수신: Twilio media.timestamp (ms) 기준
+  - 송신: 전송 시점과 이전 송신 오디오 재생 종료 시점 중 늦은 쪽 (Twilio는 받은 순서대로 이어서 재생)
+- 확정된 구간(지터 여유 이후)만 잘라 통화별 업로드 스레드로 넘김 → 스레드에서 믹싱 후 S3 멀티파트 업로드
+- 이벤트 루프에서는 바이트 복사만 수행 (믹싱/네트워크 I/O 없음), 통화 종료 후 업로드는 백그라운드에서 마무리
+- 메모리 상한: 업로드 대기 구간 CALL_RECORDING_MAX_PENDING_SECONDS + 파트 버퍼 2개 (첫 파트는 WAV 헤더 크기를
+  확정하기 위해 마지막에 업로드)
+"""
+
+import logging
+import queue
+import struct
+import threading
+import time
+from typing import List, Optional
+
+import audioop
+
+from app.config import settings
+from app.utils.datetime_utils import kst_now
+from app.utils.s3 import get_s3_client
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 8000
+SILENCE = b"\xff"  # μ-law 무음
+
+# 수신 프레임 지연 도착 여유 (이 시간이 지난 구간만 확정)
+JITTER_SAMPLES = SAMPLE_RATE
+# 업로드 스레드로 넘기는 단위
+CHUNK_SAMPLES = 5 * SAMPLE_RATE
+
+# S3 멀티파트 최소 파트 크기 (마지막 파트 제외)
+PART_SIZE = 5 * 1024 * 1024
+
+
+def mulaw_wav_header(data_size: int) -> bytes:
+    """8kHz mono μ-law WAV 헤더 (WAVE_FORMAT_MULAW + fact 청크)"""
+    fmt_chunk = struct.pack("<HHIIHHH", 7, 1, SAMPLE_RATE, SAMPLE_RATE, 1, 8, 0)
+    return b"".join([
+        b"RIFF",
+        struct.pack("<I", 4 + (8 + len(fmt_chunk)) + 12 + (8 + data_size) + (data_size & 1)),
+        b"WAVE",
+        b"fmt ", struct.pack("<I", len(fmt_chunk)), fmt_chunk,
+        b"fact", struct.pack("<II", 4, data_size),
+        b"data", struct.pack("<I", data_size),
+    ])
+
+
+def mix_mulaw(inbound: bytes, outbound: bytes) -> bytes:
+    """같은 길이의 μ-law 두 트랙을 16bit로 합산 (포화) 후 다시 μ-law로"""
+    mixed = audioop.add(audioop.ulaw2lin(inbound, 2), audioop.ulaw2lin(outbound, 2), 2)
+    return audioop.lin2ulaw(mixed, 2)
+
+
+class _S3RecordingWriter:
+    """
+    업로드 스레드 본체 (통화당 1개)
+
+    첫 파트(PART_SIZE 이상)는 메모리에 보관하고 2번 파트부터 먼저 업로드,
+    종료 시 전체 길이로 WAV 헤더를 만들어 1번 파트로 업로드 후 완료 처리
+    (5MB 미만 통화는 put_object 1회)
+    """
+
+    def __init__(self, call_sid: str, key: str):
+        self.call_sid = call_sid
+        self.bucket = settings.S3_BUCKET_NAME
+        self.key = key
+        self._first = bytearray()
+        self._current = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[dict] = []
+        self._uploaded_bytes = 0
+
+    def run(self, chunks: "queue.Queue"):
+        try:
+            while True:
+                gap, inbound, outbound, final = chunks.get()
+                if gap:
+                    self._append(SILENCE * gap)
+                if inbound:
+                    self._append(mix_mulaw(inbound, outbound))
+                if final:
+                    break
+            url = self._complete()
+            _save_audio_file_url(self.call_sid, url)
+            logger.info(f"🎙️ 통화 녹음 업로드 완료: {self.call_sid} → {self.key}")
+        except Exception as e:
+            logger.error(f"❌ 통화 녹음 업로드 실패: {self.call_sid} - {e}")
+            self._abort()
+
+    def _append(self, data: bytes):
+        if self._upload_id is None:
+            self._first += data
+            if len(self._first) >= PART_SIZE:
+                response = get_s3_client().create_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, ContentType="audio/wav"
+                )
+                self._upload_id = response["UploadId"]
+            return
+
+        self._current += data
+        if len(self._current) >= PART_SIZE:
+            self._upload_part(len(self._parts) + 2, bytes(self._current))
+            self._current.clear()
+
+    def _upload_part(self, part_number: int, body: bytes):
+        response = get_s3_client().upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+            PartNumber=part_number, Body=body,
+        )
+        self._parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+        self._uploaded_bytes += len(body)
+
+    def _complete(self) -> str:
+        client = get_s3_client()
+        data_size = len(self._first) + self._uploaded_bytes + len(self._current)
+        padding = b"\x00" if data_size & 1 else b""
+
+        if self._upload_id is None:
+            client.put_object(
+                Bucket=self.bucket, Key=self.key, ContentType="audio/wav",
+                Body=mulaw_wav_header(data_size) + bytes(self._first) + padding,
+            )
+        else:
+            if self._current or padding:
+                self._upload_part(len(self._parts) + 2, bytes(self._current) + padding)
+                self._current.clear()
+            header = mulaw_wav_header(data_size)
+            self._upload_part(1, header + bytes(self._first))
+            self._first.clear()
+            client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+                MultipartUpload={"Parts": sorted(self._parts, key=lambda p: p["PartNumber"])},
+            )
+
+        return f"https://{self.bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{self.key}"
+
+    def _abort(self):
+        if self._upload_id is None:
+            return
+        try:
+            get_s3_client().abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+        except Exception as e:
+            logger.warning(f"⚠️ 멀티파트 업로드 취소 실패: {self.key} - {e}")
+
+
+def _save_audio_file_url(call_sid: str, url: str):
+    from app.database import SessionLocal
+    from app.models.call import CallLog
+
+    db = SessionLocal()
+    try:
+        db.query(CallLog).filter(CallLog.call_id == call_sid).update(
+            {CallLog.audio_file_url: url}, synchronize_session=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class CallRecorder:
+    """
+    통화별 녹음기 (WebSocket 핸들러가 통화마다 생성, 이벤트 루프 스레드에서만 호출)
+
+    add_inbound / add_outbound는 버퍼 복사만 하고 즉시 반환, finish()는 업로드 완료를 기다리지 않음
+    """
+
+    def __init__(self, call_sid: str):
+        self.call_sid = call_sid
+        self.key = f"{settings.CALL_RECORDING_S3_PREFIX}/{kst_now():%Y/%m/%d}/{call_sid}.wav"
+
+        self._start = time.monotonic()
+        self._base = 0  # 버퍼 첫 바이트의 통화 기준 샘플 위치
+        self._inbound = bytearray()
+        self._outbound = bytearray()
+        self._inbound_cursor = 0
+        self._outbound_cursor = 0
+        self._gap = 0  # 업로드 지연으로 버린 샘플 수 (무음으로 채움)
+        self.dropped_seconds = 0.0
+        self._finished = False
+
+        # 마지막 구간용 1칸 예약 (finish는 항상 넣을 수 있음)
+        self._max_pending = max(1, settings.CALL_RECORDING_MAX_PENDING_SECONDS * SAMPLE_RATE // CHUNK_SAMPLES)
+        self._chunks: "queue.Queue" = queue.Queue(maxsize=self._max_pending + 1)
+        self._writer = _S3RecordingWriter(call_sid, self.key)
+        self._thread = threading.Thread(
+            target=self._writer.run, args=(self._chunks,), name=f"call-recorder-{call_sid}", daemon=True
+        )
+        self._thread.start()
+
+    def _now_samples(self) -> int:
+        return int((time.monotonic() - self._start) * SAMPLE_RATE)
+
+    def _write(self, buffer: bytearray, position: int, data: bytes):
+        offset = position - self._base
+        if offset < 0:
+            # 이미 확정되어 넘긴 구간 → 남은 부분만 기록
+            data = data[-offset:]
+            offset = 0
+        if not data:
+            return
+        if len(buffer) < offset:
+            buffer.extend(SILENCE * (offset - len(buffer)))
+        buffer[offset:offset + len(data)] = data
+
+    def add_inbound(self, data: bytes, timestamp_ms=None):
+        """Twilio media 이벤트 (디코딩된 μ-law, media.timestamp)"""
+        if self._finished:
+            return
+        position = int(timestamp_ms) * SAMPLE_RATE // 1000 if timestamp_ms is not None else self._inbound_cursor
+        self._inbound_cursor = position + len(data)
+        self._write(self._inbound, position, data)
+        self._flush_ready()
+
+    def add_outbound(self, data: bytes):
+        """Twilio로 전송한 μ-law 오디오 (재생 순서대로 이어 붙임)"""
+        if self._finished or not data:
+            return
+        position = max(self._outbound_cursor, self._now_samples())
+        self._outbound_cursor = position + len(data)
+        self._write(self._outbound, position, data)
+
+    def _flush_ready(self):
+        ready = self._now_samples() - JITTER_SAMPLES - self._base
+        if ready >= CHUNK_SAMPLES:
+            self._cut(ready, final=False)
+
+    def _cut(self, length: int, final: bool):
+        inbound = bytes(self._inbound[:length]).ljust(length, SILENCE)
+        outbound = bytes(self._outbound[:length]).ljust(length, SILENCE)
+        del self._inbound[:length]
+        del self._outbound[:length]
+        self._base += length
+
+        # 생산자는 이 스레드뿐이므로 qsize 확인 후 put은 막히지 않음
+        if not final and self._chunks.qsize() >= self._max_pending:
+            self._gap += length
+            self.dropped_seconds += length / SAMPLE_RATE
+            logger.warning(f"⚠️ 녹음 업로드 지연 → {length / SAMPLE_RATE:.0f}초 구간 무음 처리: {self.call_sid}")
+            return
+
+        self._chunks.put_nowait((self._gap, inbound, outbound, final))
+        self._gap = 0
+
+    def finish(self):
+        """통화 종료 - 남은 구간을 넘기고 즉시 반환 (업로드는 스레드에서 마무리)"""
+        if self._finished:
+            return
+        self._finished = True
+        self._cut(max(len(self._inbound), len(self._outbound)), final=True)
+        logger.info(f"🎙️ 통화 녹음 종료, 업로드 마무리 중: {self.call_sid}")
@@ -0,0 +1,124 @@
+"""
+자동 통화 예약 분 단위 조회 (check_and_make_calls)
+- Redis 정렬 집합 `call_schedule:minutes` (member: elderly_id, score: 하루 중 분 0~1439)에
+  활성 통화 설정만 보관 → 매분 ZRANGEBYSCORE로 해당 분의 대상만 꺼냄 (대상이 없으면 DB 조회 없음)
+- 통화 설정 변경(update_call_schedule 등) 시 해당 어르신 항목만 즉시 갱신
+- 전체 재구성은 CALL_SCHEDULE_CACHE_TTL_SECONDS마다 1번 (누락/경합 보정)
+- Redis를 쓸 수 없으면 (is_active, call_minute_of_day) 인덱스로 DB에서 직접 조회
+- 어르신 정보는 설정과 함께 조인 조회 1번
+- CALL_SMOOTHING_ENABLED면 목표 분 대신 call_planner의 오늘 계획(발신 분)으로 조회
+"""
+
+import logging
+from datetime import time as dt_time
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.call import CallSettings
+from app.models.user import User
+from app.services.ai_call.call_planner import mark_dialed, planned_elderly_ids, replan_elder
+from app.utils.redis_client import get_redis, reset_redis
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_ZSET_KEY = "call_schedule:minutes"
+SCHEDULE_BUILT_KEY = "call_schedule:built"  # 전체 재구성 완료 표시 (TTL 만료 시 다시 재구성)
+_SCHEDULE_TMP_KEY = "call_schedule:minutes:rebuild"
+
+
+def minute_of_day(value: dt_time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def sync_call_schedule(call_settings: CallSettings) -> None:
+    """
+    통화 설정 저장(commit) 직후 호출 - 정렬 집합의 해당 어르신 항목 갱신
+
+    실패하면 재구성 표시를 지워 다음 분에 전체 재구성
+    """
+    active = call_settings.is_active and call_settings.call_time is not None
+    if settings.CALL_SMOOTHING_ENABLED:
+        replan_elder(call_settings.elderly_id, minute_of_day(call_settings.call_time) if active else None)
+
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        if active:
+            client.zadd(SCHEDULE_ZSET_KEY, {call_settings.elderly_id: minute_of_day(call_settings.call_time)})
+        else:
+            client.zrem(SCHEDULE_ZSET_KEY, call_settings.elderly_id)
+    except Exception as e:
+        logger.warning(f"⚠️ 통화 예약 캐시 갱신 실패 (다음 분에 재구성): {e}")
+        reset_redis(client)
+        try:
+            client.delete(SCHEDULE_BUILT_KEY)
+        except Exception:
+            pass
+
+
+def _rebuild(db: Session, client) -> None:
+    """활성 설정 전체로 정렬 집합 재구성 (임시 키에 만든 뒤 교체)"""
+    rows = db.query(CallSettings.elderly_id, CallSettings.call_minute_of_day).filter(
+        CallSettings.is_active.is_(True)
+    ).all()
+
+    pipe = client.pipeline(transaction=True)
+    pipe.delete(_SCHEDULE_TMP_KEY)
+    if rows:
+        pipe.zadd(_SCHEDULE_TMP_KEY, {elderly_id: minute for elderly_id, minute in rows})
+        pipe.rename(_SCHEDULE_TMP_KEY, SCHEDULE_ZSET_KEY)
+    else:
+        pipe.delete(SCHEDULE_ZSET_KEY)
+    pipe.set(SCHEDULE_BUILT_KEY, "1", ex=settings.CALL_SCHEDULE_CACHE_TTL_SECONDS)
+    pipe.execute()
+    logger.info(f"🗂️ 통화 예약 캐시 재구성: 활성 설정 {len(rows)}개")
+
+
+def _due_elderly_ids(db: Session, minute: int) -> Optional[List[str]]:
+    """해당 분 예약 어르신 ID (Redis 사용 불가 시 None)"""
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        if not client.exists(SCHEDULE_BUILT_KEY):
+            _rebuild(db, client)
+        return client.zrangebyscore(SCHEDULE_ZSET_KEY, minute, minute)
+    except Exception as e:
+        logger.warning(f"⚠️ 통화 예약 캐시 조회 실패 (DB 직접 조회): {e}")
+        reset_redis(client)
+        return None
+
+
+def load_due_call_settings(db: Session, minute: int) -> List[Tuple[CallSettings, User]]:
+    """
+    지금(하루 중 minute분) 전화할 활성 통화 설정과 어르신
+
+    Returns:
+        [(CallSettings, User), ...]
+    """
+    query = db.query(CallSettings, User).join(User, User.user_id == CallSettings.elderly_id).filter(
+        CallSettings.is_active.is_(True),
+    )
+
+    # 분산 모드: 오늘 계획에서 이 분에 배정된 어르신 (목표 분과 다를 수 있음, Redis 장애 시에도 계획 기준)
+    if settings.CALL_SMOOTHING_ENABLED:
+        elderly_ids = planned_elderly_ids(db, minute)
+        rows = query.filter(CallSettings.elderly_id.in_(elderly_ids)).all() if elderly_ids else []
+    else:
+        query = query.filter(CallSettings.call_minute_of_day == minute)
+        elderly_ids = _due_elderly_ids(db, minute)
+        if elderly_ids is not None:
+            if not elderly_ids:
+                return []
+            # 캐시가 늦게 갱신된 경우를 대비해 분/활성 조건은 DB에서도 다시 확인
+            query = query.filter(CallSettings.elderly_id.in_(elderly_ids))
+        rows = query.all()
+
+    # 하루 중간에 계획을 다시 만들 때 이미 발신한 어르신 제외용
+    mark_dialed([call_settings.elderly_id for call_settings, _ in rows])
+    return rows
@@ -0,0 +1,200 @@
+"""
+외부 API 연결 미리 맺기 (워커 시작 시 + 통화 피크 직전)
+- 워커 시작 시 OpenAI / Clova / RTZR (+ Cartesia) 공용 HTTP 클라이언트 연결과 RTZR 인증 토큰을 준비
+  → 첫 통화가 DNS / TLS / HTTP2 설정 / RTZR 인증 왕복을 기다리지 않음
+- 통화 예약 시각(CallSettings.call_time)이 몰리는 분(PREWARM_PEAK_MIN_CALLS 이상 + DEFAULT_CALL_TIME)을
+  피크로 보고, 피크 PREWARM_LEAD_SECONDS 전부터 PREWARM_HOLD_SECONDS 동안
+  PREWARM_KEEPALIVE_SECONDS마다 다시 요청해 유휴 연결이 끊기지 않게 유지
+- 실제 요청의 warm / cold 연결 사용 횟수는 http_pool.connection_stats에서 집계
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.datetime_utils import kst_now
+from app.utils.http_pool import connection_stats, get_http_client, prewarming
+
+logger = logging.getLogger(__name__)
+
+OPENAI_MODELS_URL = "https://api.openai.com/v1/models"
+CLOVA_BASE_URL = "https://naveropenapi.apigw.ntruss.com/"
+CARTESIA_BASE_URL = "https://api.cartesia.ai/"
+
+# 피크 목록 재계산 주기 (통화 설정 변경 반영)
+PEAK_REFRESH_SECONDS = 3600
+
+
+def _parse_hhmm(value: str) -> Optional[Tuple[int, int]]:
+    try:
+        hour, minute = value.split(":")[:2]
+        return int(hour), int(minute)
+    except (AttributeError, ValueError):
+        return None
+
+
+def load_call_peaks() -> List[Tuple[int, int]]:
+    """
+    활성 통화 설정의 call_time을 분 단위로 모아 피크 (시, 분) 목록 계산 (DB 조회, 동기)
+    """
+    from sqlalchemy import func
+
+    from app.database import SessionLocal
+    from app.models.call import CallSettings
+
+    peaks = set()
+    default = _parse_hhmm(settings.DEFAULT_CALL_TIME)
+    if default:
+        peaks.add(default)
+
+    db = SessionLocal()
+    try:
+        rows = db.query(CallSettings.call_minute_of_day).filter(
+            CallSettings.is_active.is_(True)
+        ).group_by(CallSettings.call_minute_of_day).having(
+            func.count() >= settings.PREWARM_PEAK_MIN_CALLS
+        ).all()
+    finally:
+        db.close()
+
+    peaks.update(divmod(minute, 60) for (minute,) in rows)
+    return sorted(peaks)
+
+
+def next_peak_start(now: datetime, peaks: List[Tuple[int, int]]) -> Optional[datetime]:
+    """지금 진행 중(유지 구간 포함)이거나 다음에 올 피크 시각"""
+    hold = timedelta(seconds=settings.PREWARM_HOLD_SECONDS)
+    candidates = []
+    for hour, minute in peaks:
+        start = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if start + hold < now:
+            start += timedelta(days=1)
+        candidates.append(start)
+    return min(candidates) if candidates else None
+
+
+class ConnectionWarmer:
+    """워커당 1개 - lifespan에서 start() / stop()"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.peaks: List[Tuple[int, int]] = []
+        self.next_peak: Optional[datetime] = None
+        self.warm_runs = 0
+        self.last_results: Dict[str, Dict] = {}
+
+    async def _warm_openai(self):
+        await get_http_client().get(
+            OPENAI_MODELS_URL, headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
+        )
+
+    async def _warm_clova(self):
+        await get_http_client().get(CLOVA_BASE_URL)
+
+    async def _warm_rtzr(self):
+        from app.services.ai_call.rtzr_stt_service import RTZRSTTService
+
+        # 토큰이 캐시에 있으면 인증 요청이 없으므로 연결 유지용 요청을 따로 보냄
+        await RTZRSTTService().get_access_token()
+        await get_http_client().get(f"https://{settings.RTZR_API_HOST}/")
+
+    async def _warm_cartesia(self):
+        await get_http_client().get(CARTESIA_BASE_URL)
+
+    def _vendors(self) -> Dict[str, object]:
+        vendors = {}
+        if settings.OPENAI_API_KEY:
+            vendors["openai"] = self._warm_openai
+        if settings.NAVER_CLOVA_CLIENT_ID and settings.NAVER_CLOVA_CLIENT_SECRET:
+            vendors["clova"] = self._warm_clova
+        if settings.RTZR_CLIENT_ID and settings.RTZR_CLIENT_SECRET:
+            vendors["rtzr"] = self._warm_rtzr
+        if settings.CARTESIA_API_KEY:
+            vendors["cartesia"] = self._warm_cartesia
+        return vendors
+
+    async def warm_all(self, reason: str) -> Dict[str, Dict]:
+        """설정된 모든 제공자에 동시에 요청 (응답 상태 코드와 무관하게 연결만 확보)"""
+        vendors = self._vendors()
+
+        async def warm(name, fn):
+            start = time.time()
+            try:
+                await fn()
+                return name, {"ok": True, "seconds": time.time() - start, "at": start}
+            except Exception as e:
+                logger.warning(f"⚠️ [연결 예열] {name} 실패: {e}")
+                return name, {"ok": False, "error": str(e), "at": start}
+
+        with prewarming():
+            results = dict(await asyncio.gather(*(warm(name, fn) for name, fn in vendors.items())))
+        self.warm_runs += 1
+        self.last_results.update(results)
+        ok = [name for name, result in results.items() if result["ok"]]
+        logger.info(f"🔥 [연결 예열] {reason}: {', '.join(ok) or '없음'} ({len(ok)}/{len(results)})")
+        return results
+
+    async def _refresh_peaks(self):
+        try:
+            self.peaks = await asyncio.to_thread(load_call_peaks)
+        except Exception as e:
+            logger.warning(f"⚠️ [연결 예열] 통화 피크 계산 실패 (기본 통화 시각만 사용): {e}")
+            default = _parse_hhmm(settings.DEFAULT_CALL_TIME)
+            self.peaks = [default] if default else []
+
+    async def _run(self):
+        await self.warm_all("워커 시작")
+        await self._refresh_peaks()
+        peaks_loaded_at = time.time()
+
+        while True:
+            if time.time() - peaks_loaded_at >= PEAK_REFRESH_SECONDS:
+                await self._refresh_peaks()
+                peaks_loaded_at = time.time()
+
+            now = kst_now()
+            self.next_peak = next_peak_start(now, self.peaks)
+            if self.next_peak is None:
+                await asyncio.sleep(PEAK_REFRESH_SECONDS)
+                continue
+
+            warm_from = self.next_peak - timedelta(seconds=settings.PREWARM_LEAD_SECONDS)
+            warm_until = self.next_peak + timedelta(seconds=settings.PREWARM_HOLD_SECONDS)
+            if now < warm_from:
+                # 피크 목록 갱신 주기보다 길게 잠들지 않음
+                await asyncio.sleep(min((warm_from - now).total_seconds(), PEAK_REFRESH_SECONDS))
+                continue
+
+            await self.warm_all(f"통화 피크 {self.next_peak:%H:%M}")
+            remaining = (warm_until - kst_now()).total_seconds()
+            await asyncio.sleep(max(1.0, min(settings.PREWARM_KEEPALIVE_SECONDS, remaining)))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def snapshot(self) -> Dict:
+        """관리자 API용 상태"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "peaks": [f"{hour:02d}:{minute:02d}" for hour, minute in self.peaks],
+            "next_peak": self.next_peak.isoformat() if self.next_peak else None,
+            "warm_runs": self.warm_runs,
+            "last_results": self.last_results,
+            "connections": connection_stats.snapshot(),
+        }
+
+
+connection_warmer = ConnectionWarmer()
@@ -0,0 +1,299 @@
+"""
+예약 통화 병렬 발신 (check_and_make_calls)
+- Twilio 발신 API(동기 클라이언트)를 스레드 풀(DIAL_MAX_CONCURRENCY)에서 동시에 호출
+- 토큰 버킷으로 계정 CPS 한도(TWILIO_CALLS_PER_SECOND)에 맞춰 발신 시작 간격 조절
+  (Redis 공용 버킷 → 겹쳐 실행되는 check_and_make_calls / dial_deferred_calls 전체가 한도 하나를 나눠 씀,
+   Redis를 쓸 수 없으면 프로세스 공용 버킷)
+- 호출 측이 워커 등록부의 남은 통화 수용량만큼만 대상을 넘기고 나머지는 미룸
+- 발신이 성공하는 즉시 CallLog 저장 + 오늘 일정 미리 저장 (상태 콜백 / 미디어 스트림 시작보다 먼저)
+  (DB 세션은 호출 스레드에서만 사용, 저장하는 동안에도 다음 발신은 계속 진행)
+- 발신 지연시간 보고만 DIAL_BATCH_SIZE개씩 묶음
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.call import CallLog, CallStatus
+from app.services.ai_call.schedule_prefetch import prefetch_today_schedule
+from app.utils.fleet_latency import fleet_latency
+from app.utils.latency_sketch import DDSketch
+from app.utils.phone import normalize_phone_number
+from app.utils.redis_client import get_redis, reset_redis
+
+logger = logging.getLogger(__name__)
+
+DIAL_STAGE = "twilio_dial"
+
+_BUCKET_KEY = "twilio:dial_bucket"
+
+# 토큰 1개 예약 (잔량이 음수가 되면 그만큼 기다린 뒤 발신 → 대기 순서대로 한도 간격 유지)
+# KEYS[1]: 버킷 / ARGV: 초당 토큰, 최대 토큰, 현재 시각(epoch)
+# 키는 대기 중인 예약이 모두 끝난 뒤 1분까지 유지
+_RESERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated, 0) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(math.max(-tokens, 0) / rate) + 60)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (acquire는 토큰이 생길 때까지 대기)"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = max(rate, 0.01)
+        self.capacity = max(burst if burst is not None else rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        토큰 1개 사용
+
+        Returns:
+            기다린 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class SharedTokenBucket:
+    """
+    Redis 공용 토큰 버킷 (모든 Celery 워커 / 태스크 실행이 계정 CPS 한도 하나를 공유)
+
+    Redis 오류 시 프로세스 공용 TokenBucket으로 대체
+    """
+
+    def __init__(self, rate: float, key: str = _BUCKET_KEY):
+        self.rate = max(rate, 0.01)
+        self.capacity = max(rate, 1.0)
+        self.key = key
+
+    def acquire(self) -> float:
+        """
+        토큰 1개 사용
+
+        Returns:
+            기다린 시간 (초)
+        """
+        client = get_redis()
+        if client is None:
+            return _local_bucket(self.rate).acquire()
+
+        try:
+            wait = float(client.register_script(_RESERVE_SCRIPT)(
+                keys=[self.key],
+                args=[self.rate, self.capacity, time.time()],
+            ))
+        except Exception as e:
+            logger.warning(f"⚠️ 공용 발신 토큰 버킷 사용 실패 (프로세스 버킷 사용): {e}")
+            reset_redis(client)
+            return _local_bucket(self.rate).acquire()
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_local_buckets: Dict[float, TokenBucket] = {}
+_local_buckets_lock = threading.Lock()
+
+
+def _local_bucket(rate: float) -> TokenBucket:
+    """프로세스 공용 버킷 (같은 프로세스의 발신기 실행끼리는 한도 공유)"""
+    with _local_buckets_lock:
+        bucket = _local_buckets.get(rate)
+        if bucket is None:
+            bucket = _local_buckets[rate] = TokenBucket(rate)
+        return bucket
+
+
+@dataclass(slots=True)
+class DialTarget:
+    elderly_id: str
+    name: str
+    phone_number: Optional[str]
+    call_host: Optional[str] = None  # voice URL 도메인 (없으면 발신기 기본값)
+
+
+@dataclass(slots=True)
+class DialResult:
+    target: DialTarget
+    call_sid: Optional[str] = None
+    error: Optional[str] = None
+    latency: Optional[float] = None  # 발신 API 왕복 시간
+    throttled: float = 0.0  # 토큰 버킷 대기 시간
+    dialed_at: Optional[float] = None
+
+
+class OutboundDialer:
+    """예약 분 1회 발신 (check_and_make_calls 1번 실행당 1개)"""
+
+    def __init__(self, twilio_service, call_host: str, scheduled_at: Optional[float] = None):
+        """
+        Args:
+            twilio_service: TwilioService (make_call)
+            call_host: 대상별 도메인이 없을 때 쓰는 voice URL 도메인 (API_BASE_URL)
+            scheduled_at: 예약 시각 (epoch, 발신 지연 계산 기준 / 기본: 지금)
+        """
+        self.twilio_service = twilio_service
+        self.call_host = call_host
+        self.scheduled_at = scheduled_at or time.time()
+        self.bucket = SharedTokenBucket(settings.TWILIO_CALLS_PER_SECOND)
+
+    def _dial(self, target: DialTarget) -> DialResult:
+        """스레드 풀에서 실행 (DB 사용 안 함)"""
+        result = DialResult(target=target)
+        if not target.phone_number:
+            result.error = "전화번호 없음"
+            return result
+
+        result.throttled = self.bucket.acquire()
+        start = time.time()
+        try:
+            result.call_sid = self.twilio_service.make_call(
+                to_number=normalize_phone_number(target.phone_number),
+                voice_url=f"https://{target.call_host or self.call_host}/api/twilio/voice?elderly_id={target.elderly_id}",
+                status_callback_url=f"https://{settings.API_BASE_URL}/api/twilio/call-status",
+            )
+        except Exception as e:
+            result.error = str(e)
+        result.dialed_at = time.time()
+        result.latency = result.dialed_at - start
+        return result
+
+    def _save_call(self, db: Session, result: DialResult) -> bool:
+        """
+        성공한 발신의 CallLog 저장 + 오늘 일정 미리 저장 (발신 직후 호출 스레드에서)
+
+        미디어 스트림 시작 처리가 먼저 CallLog를 만들었으면 그대로 사용
+        """
+        try:
+            db.add(CallLog(
+                call_id=result.call_sid,
+                elderly_id=result.target.elderly_id,
+                call_status=CallStatus.INITIATED,
+                twilio_call_sid=result.call_sid,
+                created_at=datetime.utcnow(),
+            ))
+            db.commit()
+            saved = True
+        except IntegrityError:
+            db.rollback()
+            logger.info(f"⏭️  이미 존재하는 통화 기록: {result.call_sid}")
+            saved = True
+        except Exception as e:
+            logger.error(f"❌ CallLog 저장 실패 ({result.call_sid}): {e}")
+            db.rollback()
+            saved = False
+
+        prefetch_today_schedule(db, result.call_sid, result.target.elderly_id)
+        return saved
+
+    def _report_batch(self, index: int, batch: List[DialResult], saved: int) -> Dict:
+        """배치별 발신 지연시간 / 예약 대비 지연 보고"""
+        sketch = DDSketch(settings.LATENCY_SKETCH_RELATIVE_ACCURACY)
+        for result in batch:
+            if result.call_sid and result.latency is not None:
+                sketch.add(result.latency)
+                fleet_latency.record(DIAL_STAGE, result.latency)
+
+        dialed = [result.dialed_at for result in batch if result.dialed_at]
+        report = {
+            "batch": index,
+            "size": len(batch),
+            "dialed": sum(1 for result in batch if result.call_sid),
+            "failed": sum(1 for result in batch if not result.call_sid),
+            "saved": saved,
+            "dial_latency": sketch.summary(),
+            "throttled_seconds": sum(result.throttled for result in batch),
+            # 예약 시각 대비 이 배치 마지막 발신까지 늦어진 시간
+            "schedule_lag_seconds": (max(dialed) - self.scheduled_at) if dialed else None,
+        }
+        latency = report["dial_latency"]
+        p50 = f"{latency['p50']:.2f}초" if latency["p50"] is not None else "-"
+        p95 = f"{latency['p95']:.2f}초" if latency["p95"] is not None else "-"
+        lag = f"{report['schedule_lag_seconds']:.1f}초" if report["schedule_lag_seconds"] is not None else "-"
+        logger.info(
+            f"📦 [발신 배치 {index}] 성공 {report['dialed']} / 실패 {report['failed']} | "
+            f"발신 지연 p50 {p50} p95 {p95} | 예약 대비 {lag}"
+        )
+        return report
+
+    def dial_all(self, db: Session, targets: List[DialTarget]) -> Dict:
+        """
+        대상 전체 발신 (스레드 풀에서 발신, 호출 스레드에서 결과가 나오는 대로 DB 저장)
+
+        Returns:
+            {"calls_made", "failed_calls", "failed", "batches", "seconds"}
+        """
+        start = time.time()
+        batches: List[Dict] = []
+        failed: List[DialResult] = []
+        calls_made = 0
+        pending: List[DialResult] = []
+        pending_saved = 0
+
+        def flush():
+            nonlocal pending_saved
+            batches.append(self._report_batch(len(batches) + 1, pending, pending_saved))
+            pending.clear()
+            pending_saved = 0
+
+        with ThreadPoolExecutor(max_workers=settings.DIAL_MAX_CONCURRENCY, thread_name_prefix="dialer") as pool:
+            futures = [pool.submit(self._dial, target) for target in targets]
+            for future in as_completed(futures):
+                result = future.result()
+                if result.error:
+                    logger.error(f"❌ 통화 발신 실패 (사용자: {result.target.elderly_id}): {result.error}")
+                    failed.append(result)
+                else:
+                    logger.info(f"✅ 통화 발신 성공: {result.target.name} (Call SID: {result.call_sid})")
+                    calls_made += 1
+                    if self._save_call(db, result):
+                        pending_saved += 1
+                pending.append(result)
+                if len(pending) >= settings.DIAL_BATCH_SIZE:
+                    flush()
+        if pending:
+            flush()
+
+        # Celery 워커는 API 서버의 주기적 병합 루프가 없으므로 직접 기록
+        fleet_latency.flush_to_redis()
+
+        return {
+            "calls_made": calls_made,
+            "failed_calls": len(failed),
+            "failed": [result.target.elderly_id for result in failed],
+            "batches": batches,
+            "seconds": time.time() - start,
+        }
@@ -0,0 +1,85 @@
+"""
+에코 게이트 (AI 발화 중 / 직후 수신 오디오 차단)
+- Twilio media.timestamp (통화 시작 기준 ms) 기준으로 게이트 개폐
+- AI 발화 시작 시 닫고, 발화 종료 시점 + ECHO_GATE_TAIL_MS 이후 프레임부터 다시 STT로 전달
+- 닫혀 있는 동안 최근 수신 프레임을 링 버퍼에 보관 → 다시 열릴 때 직전 ECHO_GATE_PREROLL_MS 분량을
+  먼저 전달해 어르신의 첫 음절이 잘리지 않도록 함
+"""
+
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from app.config import settings
+
+# Twilio Media Stream 프레임 길이 (8kHz μ-law 160바이트)
+FRAME_MS = 20
+
+
+class EchoGate:
+    """통화별 에코 게이트 (RTZRRealtimeSTT가 보유)"""
+
+    def __init__(self, tail_ms: Optional[int] = None, preroll_ms: Optional[int] = None):
+        self.tail_ms = settings.ECHO_GATE_TAIL_MS if tail_ms is None else tail_ms
+        self.preroll_ms = settings.ECHO_GATE_PREROLL_MS if preroll_ms is None else preroll_ms
+
+        self._closed = False
+        self._reopen_at_ms: Optional[float] = None  # 이 timestamp 이후 프레임부터 통과
+        self._preroll: Deque[Tuple[float, bytes]] = deque(maxlen=max(1, self.preroll_ms // FRAME_MS))
+
+        # 벽시계 → media timestamp 환산용 (마지막 프레임 기준)
+        self._last_timestamp_ms: Optional[float] = None
+        self._last_frame_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return not self._closed and self._reopen_at_ms is None
+
+    def _current_timestamp_ms(self) -> float:
+        """지금 도착할 프레임의 media timestamp 추정"""
+        if self._last_timestamp_ms is None:
+            return 0.0
+        return self._last_timestamp_ms + (time.time() - self._last_frame_at) * 1000
+
+    def close(self):
+        """AI 발화 시작 - 수신 오디오 차단"""
+        self._closed = True
+        self._reopen_at_ms = None
+
+    def reopen(self):
+        """AI 발화 종료 - tail_ms 이후 프레임부터 통과"""
+        self._closed = False
+        self._reopen_at_ms = self._current_timestamp_ms() + self.tail_ms
+
+    def feed(self, audio: bytes, timestamp_ms=None) -> List[bytes]:
+        """
+        수신 프레임 1개 처리
+
+        Args:
+            audio: μ-law 프레임
+            timestamp_ms: Twilio media.timestamp (없으면 이전 프레임 + 20ms)
+
+        Returns:
+            STT로 보낼 프레임 목록 (닫혀 있으면 빈 목록, 다시 열리는 순간 프리롤 포함)
+        """
+        if timestamp_ms is None:
+            timestamp_ms = (self._last_timestamp_ms + FRAME_MS) if self._last_timestamp_ms is not None else 0.0
+        else:
+            timestamp_ms = float(timestamp_ms)
+        self._last_timestamp_ms = timestamp_ms
+        self._last_frame_at = time.time()
+
+        if self.is_open:
+            return [audio]
+
+        if self._closed or timestamp_ms < self._reopen_at_ms:
+            self._preroll.append((timestamp_ms, audio))
+            return []
+
+        # 게이트 열림: 프리롤 구간(재개 시점 직전 preroll_ms) + 현재 프레임
+        preroll_from = self._reopen_at_ms - self.preroll_ms
+        frames = [frame for ts, frame in self._preroll if ts >= preroll_from]
+        frames.append(audio)
+        self._preroll.clear()
+        self._reopen_at_ms = None
+        return frames
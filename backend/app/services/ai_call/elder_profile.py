@@ -0,0 +1,198 @@
+"""
+어르신 개인화 프로필 (통화 전 미리 계산)
+- 지난 통화 분석(CallLog.call_analysis) / 대화 기록(CallTranscript) / 일기(Diary) / 할 일(Todo)에서
+  가족, 취미, 자주 하는 이야기, 최근 건강 언급을 모아 압축 프로필 생성
+- Redis `elder:profile:{elderly_id}` 키에 JSON으로 저장 (야간 배치 + 통화 후처리에서 갱신)
+- 통화 시작 시 키 1회 조회 → 턴마다 DB/LLM 호출 없이 개인화 프롬프트에 반영
+"""
+
+import json
+import logging
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from app.config import settings
+from app.models.call import CallLog, CallStatus, CallTranscript
+from app.models.diary import Diary
+from app.models.todo import Todo
+from app.services.ai_call.text_matcher import classify_utterance
+from app.utils.datetime_utils import kst_now
+from app.utils.redis_client import get_redis, reset_redis
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY = "elder:profile:{elderly_id}"
+
+# 프로필 구성 대상 (최근 통화 수 / 건강 언급 유효 기간)
+PROFILE_RECENT_CALLS = 20
+PROFILE_HEALTH_DAYS = 14
+
+# 필드별 최대 항목 수 (프롬프트 길이 제한)
+PROFILE_MAX_ITEMS = 5
+
+# 대화 기록 키워드 라벨 → 자주 하는 이야기 (통화 분석이 없는 통화도 반영)
+_TRANSCRIPT_TOPIC_LABELS = {
+    "family": "가족 이야기",
+    "meal": "식사",
+    "pain": "몸 불편함",
+    "lonely": "외로움",
+    "sad": "걱정거리",
+    "joy": "즐거운 일",
+}
+
+# 전체 통화 중 이 비율 이상에서 나온 라벨만 반복 주제로 인정
+_TRANSCRIPT_TOPIC_MIN_RATIO = 0.3
+
+
+def _profile_key(elderly_id: str) -> str:
+    return PROFILE_KEY.format(elderly_id=elderly_id)
+
+
+def _top(counter: Counter, limit: int = PROFILE_MAX_ITEMS) -> List[str]:
+    return [value for value, _ in counter.most_common(limit)]
+
+
+def _clean(values: Iterable) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    return [str(v).strip() for v in values if v and str(v).strip()]
+
+
+def build_elder_profile(db, elderly_id: str) -> Dict:
+    """
+    어르신 1명의 개인화 프로필 계산 (DB 조회만, LLM 호출 없음)
+
+    Returns:
+        {"family", "hobbies", "daily_patterns", "location", "health", "topics": [str],
+         "recent_diaries": [str], "calls_analyzed": int, "updated_at": ISO 문자열}
+    """
+    now = kst_now()
+    health_since = now - timedelta(days=PROFILE_HEALTH_DAYS)
+
+    calls = (
+        db.query(CallLog.call_id, CallLog.call_analysis, CallLog.created_at)
+        .filter(CallLog.elderly_id == elderly_id, CallLog.call_status == CallStatus.COMPLETED)
+        .order_by(CallLog.created_at.desc())
+        .limit(PROFILE_RECENT_CALLS)
+        .all()
+    )
+
+    counters = {field: Counter() for field in ("family", "hobbies", "daily_patterns", "location", "keywords")}
+    health = Counter()
+    for _, call_analysis, created_at in calls:
+        if not call_analysis:
+            continue
+        try:
+            personalization = (json.loads(call_analysis) or {}).get("personalization") or {}
+        except (TypeError, ValueError):
+            continue
+        for field, counter in counters.items():
+            counter.update(set(_clean(personalization.get(field))))
+        if created_at and created_at >= health_since:
+            health.update(set(_clean(personalization.get("health"))))
+
+    # 반복 주제: 통화 분석 키워드 + 대화 기록 키워드 라벨 + 반복 할 일
+    topics = Counter({k: v for k, v in counters["keywords"].items() if v >= 2})
+
+    call_ids = [call_id for call_id, _, _ in calls]
+    if call_ids:
+        rows = (
+            db.query(CallTranscript.call_id, CallTranscript.text)
+            .filter(CallTranscript.call_id.in_(call_ids), CallTranscript.speaker == "ELDERLY")
+            .all()
+        )
+        calls_by_label: Dict[str, set] = {}
+        for call_id, text in rows:
+            for label in classify_utterance(text).labels:
+                if label in _TRANSCRIPT_TOPIC_LABELS:
+                    calls_by_label.setdefault(label, set()).add(call_id)
+        for label, label_calls in calls_by_label.items():
+            if len(label_calls) >= max(2, len(call_ids) * _TRANSCRIPT_TOPIC_MIN_RATIO):
+                topics[_TRANSCRIPT_TOPIC_LABELS[label]] += len(label_calls)
+
+    recurring_todos = (
+        db.query(Todo.title)
+        .filter(Todo.elderly_id == elderly_id, Todo.is_recurring.is_(True), Todo.parent_recurring_id.is_(None))
+        .limit(PROFILE_MAX_ITEMS)
+        .all()
+    )
+    for (title,) in recurring_todos:
+        topics[title] += 1
+
+    diaries = (
+        db.query(Diary.title, Diary.mood)
+        .filter(Diary.user_id == elderly_id)
+        .order_by(Diary.date.desc(), Diary.created_at.desc())
+        .limit(3)
+        .all()
+    )
+    recent_diaries = [
+        f"{title} ({mood})" if mood else title
+        for title, mood in diaries
+        if title
+    ]
+
+    return {
+        "family": _top(counters["family"]),
+        "hobbies": _top(counters["hobbies"]),
+        "daily_patterns": _top(counters["daily_patterns"]),
+        "location": _top(counters["location"], limit=2),
+        "health": _top(health),
+        "topics": _top(topics),
+        "recent_diaries": recent_diaries,
+        "calls_analyzed": len(calls),
+        "updated_at": now.isoformat(),
+    }
+
+
+def save_elder_profile(elderly_id: str, profile: Dict) -> bool:
+    """프로필 Redis 저장 (실패 시 False - 통화는 프로필 없이 진행)"""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        client.set(
+            _profile_key(elderly_id),
+            json.dumps(profile, ensure_ascii=False, separators=(",", ":")),
+            ex=settings.ELDER_PROFILE_TTL_SECONDS,
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ 어르신 프로필 저장 실패 ({elderly_id}): {e}")
+        reset_redis(client)
+        return False
+
+
+def load_elder_profile(elderly_id: Optional[str]) -> Optional[Dict]:
+    """프로필 조회 (Redis GET 1회, 없거나 실패 시 None)"""
+    if not elderly_id or elderly_id == "unknown":
+        return None
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_profile_key(elderly_id))
+    except Exception as e:
+        logger.warning(f"⚠️ 어르신 프로필 조회 실패 ({elderly_id}): {e}")
+        reset_redis(client)
+        return None
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def profile_to_contextual_info(profile: Optional[Dict]) -> Optional[Dict[str, List[str]]]:
+    """프로필 → _build_personalization_context 입력 형식 (비어 있으면 None)"""
+    if not profile:
+        return None
+    contextual_info = {
+        field: list(profile.get(field) or [])
+        for field in ("family", "hobbies", "health", "daily_patterns", "location", "topics", "recent_diaries")
+    }
+    if not any(contextual_info.values()):
+        return None
+    return contextual_info
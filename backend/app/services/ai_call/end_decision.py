@@ -1,17 +1,22 @@
 import time
-import re
 from dataclasses import dataclass
+from functools import lru_cache
+
+from app.services.ai_call.text_matcher import RegexSet, compile_pattern_set
 
 # 짧은 긍정 응답 패턴 (대화 의지 부족 감지용)
 SHORT_ACKS = [r"^(응|어|음|네|예|응응|네네)[.!?]?$"]
 
+@lru_cache(maxsize=64)
+def _pattern_set(patterns: tuple[str, ...]) -> RegexSet:
+    return compile_pattern_set(patterns)
+
+_SHORT_ACK_SET = _pattern_set(tuple(SHORT_ACKS))
+
 def match_any(text: str, patterns: list[str]) -> bool:
-    """정규식 패턴 매칭 (하위 호환성 유지)"""
+    """정규식 패턴 매칭 (하위 호환성 유지, 패턴 목록별로 한 번만 컴파일)"""
     t = (text or "").strip()
-    for p in patterns:
-        if re.search(p, t, flags=re.IGNORECASE):
-            return True
-    return False
+    return _pattern_set(tuple(patterns)).search(t) is not None
 
 @dataclass
 class EndDecisionSignals:
@@ -61,4 +66,4 @@ def check_timeout(s: EndDecisionSignals) -> tuple[str | None, dict]:
     return None, breakdown
 
 def is_short_ack(text: str) -> bool:
-    return match_any(text or "", SHORT_ACKS)
\ No newline at end of file
+    return _SHORT_ACK_SET.search((text or "").strip()) is not None
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+빠른 경로 응답기 (LLM 생략)
+- 인사 / 짧은 맞장구 / 작별 인사를 규칙으로 분류하고 템플릿 응답 선택
+- 짧은 맞장구는 직전 AI 응답이 질문/제안이 아닐 때만 (질문에 대한 "네"는 화제에 맞춘 응답이 필요 → LLM 경로)
+- 템플릿 음성은 미리 합성해 8kHz μ-law로 보관 → 분류 즉시 재생
+- 적중률과 절감 지연시간(LLM 경로 대비 첫 오디오 시점 차이) 집계
+
+템플릿은 elderly_care_prompt 페르소나 규칙을 따름:
+최대 2문장 / 60자, 존댓말, 1인칭("저", "제가") 사용, "하루는/하루가" 3인칭 금지,
+짧은 대답에는 하루 자신의 이야기를 먼저 하고 질문은 하나만
+"""
+
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.ai_call.end_decision import is_short_ack
+from app.services.ai_call.streaming_pipeline import send_mulaw_audio_to_twilio, synthesize_and_send_sentence
+from app.services.ai_call.tts_engine import WavMulawNormalizer
+from app.utils.latency_sketch import RollingDDSketch
+
+logger = logging.getLogger(__name__)
+
+GREETING = "greeting"
+SHORT_ACK = "short_ack"
+FAREWELL = "farewell"
+
+# 분류 규칙 (문장 부호/공백 제거 후 전체 일치)
+_FAREWELL_PATTERN = re.compile(
+    r"^(안녕히\s*(계세요|계셔요|가세요|가셔요|주무세요)|잘\s*(있어|있어요|지내|지내요|가|가요)|"
+    r"들어가(세요|요)?|끊을게(요)?|이만\s*끊을게(요)?|다음에\s*또?\s*(통화해|얘기해|이야기해)(요)?)$"
+)
+_GREETING_PATTERN = re.compile(
+    r"^(안녕|안녕하세요|안녕하셔요|여보세요|반가워|반가워요|반갑습니다|어\s*하루야|하루야|하루\s*씨)$"
+)
+_EXTRA_ACK_PATTERN = re.compile(r"^(그래|그래요|그럼|그럼요|맞아|맞아요|알았어|알겠어요|좋아|좋아요)$")
+_STRIP_PATTERN = re.compile(r"[.,!?~…\s]+$|^[\s,.]+")
+# 직전 AI 응답이 대답을 기다리는 질문/제안인지 (물음표 또는 의문/제안 어미로 끝남)
+_INVITES_ANSWER_PATTERN = re.compile(r"[?？]|(까요|래요|나요|어때요|어떠세요|드릴게요)[.!~…\s]*$")
+
+TEMPLATES: Dict[str, List[str]] = {
+    GREETING: [
+        "네, 안녕하세요~ 저 하루예요. 오늘 기분은 어떠세요?",
+        "안녕하세요, 어르신! 하루예요. 오늘 어떻게 지내셨어요?",
+        "네~ 반가워요, 어르신. 식사는 잘 챙겨 드셨어요?",
+    ],
+    SHORT_ACK: [
+        "그러셨군요~ 저는 요즘 따뜻한 차를 자주 마셔요. 어르신도 차 좋아하세요?",
+        "그렇군요. 저는 요즘 재미있는 드라마를 보고 있어요. 어르신은 TV 자주 보세요?",
+        "네~ 저는 오늘 창밖 구경을 했는데 날이 좋더라구요. 밖에 나가 보셨어요?",
+        "그러시구나~ 저는 요즘 옛날 노래를 자주 들어요. 좋아하시는 노래 있으세요?",
+        "아, 그러셨어요. 저는 요즘 산책이 참 좋더라구요. 요즘 많이 걸으세요?",
+    ],
+    FAREWELL: [
+        "네, 어르신. 오늘 이야기 나눠서 즐거웠어요. 편안한 하루 보내세요!",
+        "네~ 들어가세요, 어르신. 다음에 또 전화드릴게요!",
+        "네, 어르신. 건강 잘 챙기시고 좋은 하루 보내세요!",
+    ],
+}
+
+
+def _last_assistant_invites_answer(conversation_history: Optional[List[Dict]]) -> bool:
+    """직전 AI 응답이 질문/제안이었는지 (AI 응답이 없으면 False)"""
+    for msg in reversed(conversation_history or []):
+        if msg.get("role") == "assistant":
+            return bool(_INVITES_ANSWER_PATTERN.search(msg.get("content") or ""))
+    return False
+
+
+def classify_utterance(text: str, conversation_history: Optional[List[Dict]] = None) -> Optional[str]:
+    """
+    최종 인식 문장을 빠른 경로 분류로 판별
+
+    Args:
+        text: 최종 인식 문장
+        conversation_history: 이번 발화 이전까지의 대화 (짧은 맞장구 판별에 직전 AI 응답 사용)
+
+    Returns:
+        "greeting" / "short_ack" / "farewell" (해당 없으면 None → LLM 경로)
+    """
+    normalized = _STRIP_PATTERN.sub("", (text or "").strip())
+    if not normalized or len(normalized) > 15:
+        return None
+    if _FAREWELL_PATTERN.match(normalized):
+        return FAREWELL
+    if _GREETING_PATTERN.match(normalized):
+        return GREETING
+    if is_short_ack(normalized) or _EXTRA_ACK_PATTERN.match(normalized):
+        # 질문/제안에 대한 대답이면 고정 템플릿(다른 화제) 대신 LLM이 이어받음
+        if _last_assistant_invites_answer(conversation_history):
+            return None
+        return SHORT_ACK
+    return None
+
+
+def choose_template(category: str, conversation_history: Optional[List[Dict]] = None) -> str:
+    """최근 AI 응답과 겹치지 않는 템플릿 선택 (같은 이야기 반복 방지)"""
+    candidates = TEMPLATES[category]
+    recent = {
+        msg.get("content")
+        for msg in (conversation_history or [])[-10:]
+        if msg.get("role") == "assistant"
+    }
+    fresh = [t for t in candidates if t not in recent]
+    return random.choice(fresh or candidates)
+
+
+class PhraseAudioCache:
+    """고정 문장 → 미리 합성한 8kHz μ-law 오디오 (프로세스 메모리)"""
+
+    def __init__(self, phrases: List[str], label: str = "빠른 응답"):
+        self.phrases = phrases
+        self.label = label
+        self._audio: Dict[str, bytes] = {}
+        self._warm_task: Optional[asyncio.Task] = None
+
+    def get(self, text: str) -> Optional[bytes]:
+        return self._audio.get(text)
+
+    def __len__(self) -> int:
+        return len(self._audio)
+
+    async def synthesize(self, text: str, tts_service) -> Optional[bytes]:
+        """Clova 스트리밍 합성 결과를 μ-law로 변환해 저장"""
+        normalizer = WavMulawNormalizer()
+        audio = bytearray()
+        async for chunk in tts_service.stream_speech(text):
+            audio += normalizer.feed(chunk)
+        if not audio:
+            return None
+        self._audio[text] = bytes(audio)
+        return self._audio[text]
+
+    async def warm(self):
+        """모든 문장 미리 합성 (서버 시작 시 백그라운드)"""
+        from app.services.ai_call.naver_clova_tts_service import NaverClovaTTSService
+
+        tts_service = NaverClovaTTSService()
+        try:
+            for text in self.phrases:
+                if text in self._audio:
+                    continue
+                try:
+                    await self.synthesize(text, tts_service)
+                except Exception as e:
+                    logger.warning(f"⚠️ [{self.label}] 템플릿 합성 실패: {text[:20]}... ({e})")
+            logger.info(f"✅ [{self.label}] 템플릿 음성 {len(self._audio)}/{len(self.phrases)}개 준비 완료")
+        finally:
+            await tts_service.close()
+
+    def start_warmup(self):
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.create_task(self.warm())
+
+    async def stop_warmup(self):
+        if self._warm_task and not self._warm_task.done():
+            self._warm_task.cancel()
+            try:
+                await self._warm_task
+            except asyncio.CancelledError:
+                pass
+
+
+class FastPathStats:
+    """적중률 / 절감 지연시간 집계 (워커 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.utterances = 0
+        self.hits: Dict[str, int] = {GREETING: 0, SHORT_ACK: 0, FAREWELL: 0}
+        self.audio_cache_misses = 0
+        # 최종 인식 → 첫 오디오 (빠른 경로 / LLM 경로)
+        self.fast_first_audio = RollingDDSketch(
+            window_seconds=3600, relative_accuracy=settings.LATENCY_SKETCH_RELATIVE_ACCURACY
+        )
+        self.llm_first_audio = RollingDDSketch(
+            window_seconds=3600, relative_accuracy=settings.LATENCY_SKETCH_RELATIVE_ACCURACY
+        )
+
+    def record_utterance(self):
+        with self._lock:
+            self.utterances += 1
+
+    def record_hit(self, category: str, first_audio_latency: float, audio_cached: bool):
+        with self._lock:
+            self.hits[category] += 1
+            if not audio_cached:
+                self.audio_cache_misses += 1
+        self.fast_first_audio.add(first_audio_latency)
+
+    def record_llm_turn(self, first_audio_latency: Optional[float]):
+        if first_audio_latency is not None and first_audio_latency >= 0:
+            self.llm_first_audio.add(first_audio_latency)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            utterances = self.utterances
+            hits = dict(self.hits)
+            cache_misses = self.audio_cache_misses
+        total_hits = sum(hits.values())
+        fast_p50 = self.fast_first_audio.quantile(0.5)
+        llm_p50 = self.llm_first_audio.quantile(0.5)
+        saved_per_hit = None
+        if fast_p50 is not None and llm_p50 is not None:
+            saved_per_hit = max(llm_p50 - fast_p50, 0.0)
+        return {
+            "utterances": utterances,
+            "hits": hits,
+            "hit_rate": (total_hits / utterances) if utterances else None,
+            "audio_cache_hit_rate": ((total_hits - cache_misses) / total_hits) if total_hits else None,
+            "cached_phrases": len(phrase_audio_cache),
+            "fast_first_audio": self.fast_first_audio.merged().summary(),
+            "llm_first_audio": self.llm_first_audio.merged().summary(),
+            "estimated_saved_seconds_per_hit": saved_per_hit,
+            "estimated_saved_seconds_total": (saved_per_hit * total_hits) if saved_per_hit is not None else None,
+        }
+
+
+phrase_audio_cache = PhraseAudioCache([t for templates in TEMPLATES.values() for t in templates])
+fast_path_stats = FastPathStats()
+
+
+async def respond_fast(
+    websocket,
+    stream_sid: str,
+    category: str,
+    conversation_history: List[Dict],
+    tts_service,
+    stt_final_time: float,
+    on_audio_ready=None,
+) -> Tuple[str, float]:
+    """
+    템플릿 응답 전송 (미리 합성된 음성이 있으면 즉시, 없으면 합성 후 캐시에 저장)
+
+    Returns:
+        (응답 텍스트, 재생 시간) - 전송 실패 시 재생 시간 0
+    """
+    text = choose_template(category, conversation_history)
+    first_audio_time = None
+
+    def mark_first_audio(sentence_index: int):
+        nonlocal first_audio_time
+        first_audio_time = time.time()
+        if on_audio_ready:
+            on_audio_ready(sentence_index)
+
+    audio = phrase_audio_cache.get(text)
+    if audio is not None:
+        playback_duration = await send_mulaw_audio_to_twilio(
+            websocket, stream_sid, audio, 1, stt_final_time, on_first_audio=mark_first_audio
+        )
+    else:
+        # 아직 미리 합성되지 않음 → 이번 통화 TTS로 재생 (LLM은 여전히 생략), 빠진 템플릿 재합성
+        phrase_audio_cache.start_warmup()
+        playback_duration = await synthesize_and_send_sentence(
+            tts_service, websocket, stream_sid, text, 1, stt_final_time, on_audio_ready=mark_first_audio
+        )
+
+    if first_audio_time is not None:
+        fast_path_stats.record_hit(category, first_audio_time - stt_final_time, audio is not None)
+        logger.info(
+            f"⚡ [빠른 응답] {category} → \"{text}\" "
+            f"(첫 오디오 +{first_audio_time - stt_final_time:.2f}초, 캐시 {'적중' if audio is not None else '미스'})"
+        )
+    return text, playback_duration
@@ -0,0 +1,163 @@
+"""
+필러 음성 (LLM 응답 대기 중 침묵 가리기)
+- 최종 인식(is_final) 후 FILLER_AUDIO_BUDGET_MS 안에 응답 첫 오디오가 준비되지 않으면
+  미리 합성한 짧은 맞장구("음~", "아, 그러셨어요")를 재생
+- 필러는 메시지 1개로 송신 대기열(OutboundSender)에 넣음 → 실제 응답 오디오는 그 뒤에 이어서 재생
+  (필러 재생 중 응답이 준비되면 남은 필러 길이만큼 응답이 늦어짐 → added_delay로 집계)
+- 발동률 / 가려진 침묵 시간(필러 재생 시점 → 응답 첫 오디오) 집계
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+from app.services.ai_call.fast_responder import PhraseAudioCache
+from app.services.ai_call.streaming_pipeline import send_media_to_twilio
+from app.utils.latency_sketch import RollingDDSketch
+
+logger = logging.getLogger(__name__)
+
+FILLER_PHRASES = [
+    "음~",
+    "아, 그러셨어요",
+    "아~ 네",
+    "네~ 그렇군요",
+]
+
+# μ-law 8kHz: 1ms = 8바이트
+_BYTES_PER_MS = 8
+
+
+class FillerStats:
+    """필러 발동률 / 가려진 지연시간 집계 (워커 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.fired = 0
+        self.cache_misses = 0  # 예산 초과했지만 준비된 필러 음성이 없음
+        # 필러 재생 → 응답 첫 오디오 (필러가 없었다면 추가로 들렸을 침묵)
+        self.hidden = RollingDDSketch(
+            window_seconds=3600, relative_accuracy=settings.LATENCY_SKETCH_RELATIVE_ACCURACY
+        )
+        # 필러 재생이 끝나기를 기다리느라 응답이 늦어진 시간
+        self.added_delay = RollingDDSketch(
+            window_seconds=3600, relative_accuracy=settings.LATENCY_SKETCH_RELATIVE_ACCURACY
+        )
+
+    def record_turn(self, fired: bool, cache_miss: bool, hidden: Optional[float], added_delay: Optional[float]):
+        with self._lock:
+            self.turns += 1
+            if fired:
+                self.fired += 1
+            if cache_miss:
+                self.cache_misses += 1
+        if hidden is not None:
+            self.hidden.add(hidden)
+        if added_delay is not None:
+            self.added_delay.add(added_delay)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            turns, fired, cache_misses = self.turns, self.fired, self.cache_misses
+        hidden = self.hidden.merged().summary()
+        return {
+            "enabled": settings.FILLER_AUDIO_ENABLED,
+            "budget_ms": settings.FILLER_AUDIO_BUDGET_MS,
+            "turns": turns,
+            "fired": fired,
+            "fire_rate": (fired / turns) if turns else None,
+            "cache_misses": cache_misses,
+            "cached_phrases": len(filler_audio_cache),
+            "hidden_silence": hidden,
+            "added_delay": self.added_delay.merged().summary(),
+        }
+
+
+filler_audio_cache = PhraseAudioCache(FILLER_PHRASES, label="필러")
+filler_stats = FillerStats()
+
+
+def _choose_clip() -> Optional[bytes]:
+    """FILLER_AUDIO_MAX_MS 이하인 준비된 필러 중 하나"""
+    max_bytes = settings.FILLER_AUDIO_MAX_MS * _BYTES_PER_MS
+    clips = [
+        audio for audio in (filler_audio_cache.get(text) for text in FILLER_PHRASES)
+        if audio and len(audio) <= max_bytes
+    ]
+    return random.choice(clips) if clips else None
+
+
+class FillerMasker:
+    """
+    LLM 경로 1턴용 (응답 생성 직전 start(), 첫 오디오 직전 mark_audio_ready(), 응답 후 finish())
+    """
+
+    def __init__(self, websocket, stream_sid: str, stt_final_time: float):
+        self.websocket = websocket
+        self.stream_sid = stream_sid
+        self.stt_final_time = stt_final_time
+        self.fired_at: Optional[float] = None
+        self.filler_duration = 0.0
+        self.audio_ready_at: Optional[float] = None
+        self._cache_miss = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        delay = self.stt_final_time + settings.FILLER_AUDIO_BUDGET_MS / 1000 - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.audio_ready_at is not None:
+            return
+
+        clip = _choose_clip()
+        if clip is None:
+            self._cache_miss = True
+            filler_audio_cache.start_warmup()
+            return
+
+        # 응답 오디오보다 먼저 대기열에 들어가도록 준비 여부 확인과 전송 사이에 양보 없음
+        self.fired_at = time.time()
+        self.filler_duration = len(clip) / (_BYTES_PER_MS * 1000)
+        try:
+            await send_media_to_twilio(self.websocket, self.stream_sid, clip)
+            logger.info(f"🫧 [필러] 응답 대기 중 맞장구 재생 (+{self.fired_at - self.stt_final_time:.2f}초)")
+        except Exception as e:
+            logger.warning(f"⚠️ [필러] 전송 실패: {e}")
+
+    def mark_audio_ready(self, sentence_index: int = 1):
+        """응답 첫 오디오 전송 직전 (이후 필러는 재생하지 않음)"""
+        if self.audio_ready_at is not None:
+            return
+        self.audio_ready_at = time.time()
+        if self._task and self.fired_at is None and not self._task.done():
+            self._task.cancel()
+
+    async def finish(self) -> float:
+        """
+        턴 종료 - 집계 기록
+
+        Returns:
+            필러 때문에 응답 재생이 늦어진 시간 (초, 재생 완료 대기에 더할 값)
+        """
+        if self._task:
+            if self.fired_at is None and not self._task.done():
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        hidden = added_delay = None
+        if self.fired_at is not None and self.audio_ready_at is not None:
+            hidden = max(self.audio_ready_at - self.fired_at, 0.0)
+            added_delay = max(self.fired_at + self.filler_duration - self.audio_ready_at, 0.0)
+        filler_stats.record_turn(self.fired_at is not None, self._cache_miss, hidden, added_delay)
+        return added_delay or 0.0
@@ -0,0 +1,259 @@
+"""
+실시간 통화용 LLM 라우터 (TTFT 꼬리 지연 완화)
+- 주 모델 / 예비 모델 설정 (OPENAI_REALTIME_MODEL / OPENAI_FALLBACK_MODEL)
+- 헤징: 주 모델의 최근 p95 TTFT 안에 첫 토큰이 없으면 예비 모델 스트림을 동시에 시작
+- 첫 토큰을 먼저 받은 스트림만 유지하고 나머지는 즉시 취소 (연결 종료)
+- 모델별 TTFT 분위수 / 요청·실패·승리 횟수 집계
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from openai import AsyncOpenAI
+
+from app.config import settings
+from app.utils.http_pool import get_http_client
+from app.utils.latency_sketch import RollingDDSketch
+
+logger = logging.getLogger(__name__)
+
+# 헤징 기준 TTFT를 계산할 최근 구간
+TTFT_WINDOW_SECONDS = 300
+
+# 헤징 대기 시간 범위 (너무 이른 중복 요청 / 너무 늦은 헤징 방지)
+HEDGE_DELAY_MIN_SECONDS = 0.3
+HEDGE_DELAY_MAX_SECONDS = 5.0
+
+
+class ModelStats:
+    """모델별 TTFT 스케치와 요청 통계 (프로세스 내 모든 통화가 공유)"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.ttft = RollingDDSketch(
+            window_seconds=TTFT_WINDOW_SECONDS,
+            relative_accuracy=settings.LATENCY_SKETCH_RELATIVE_ACCURACY,
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.hedges_started = 0  # 이 모델이 느려서 예비 스트림을 시작한 횟수
+        self.wins = 0  # 첫 토큰 경쟁에서 이긴 횟수
+
+    def record_first_token(self, ttft: float):
+        self.ttft.add(ttft)
+        with self._lock:
+            self.requests += 1
+            self.wins += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+
+    def record_cancelled(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_hedge(self):
+        with self._lock:
+            self.hedges_started += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counters = {
+                "requests": self.requests,
+                "failures": self.failures,
+                "wins": self.wins,
+                "hedges_started": self.hedges_started,
+            }
+        counters["ttft"] = self.ttft.merged().summary()
+        return counters
+
+
+_model_stats: Dict[str, ModelStats] = {}
+_model_stats_lock = threading.Lock()
+
+
+def get_model_stats(model: str) -> ModelStats:
+    with _model_stats_lock:
+        stats = _model_stats.get(model)
+        if stats is None:
+            stats = _model_stats[model] = ModelStats(model)
+        return stats
+
+
+def llm_model_snapshot() -> Dict[str, Dict]:
+    """모델별 TTFT / 요청 통계 (관리자 API용)"""
+    with _model_stats_lock:
+        models = list(_model_stats)
+    return {model: get_model_stats(model).snapshot() for model in models}
+
+
+def _delta_text(chunk) -> str:
+    if not chunk.choices:
+        return ""
+    return chunk.choices[0].delta.content or ""
+
+
+class _StreamAttempt:
+    """모델 1건 스트리밍 요청 (첫 토큰 대기 태스크 포함)"""
+
+    def __init__(self, client: AsyncOpenAI, model: str, request: Dict):
+        self.model = model
+        self.stats = get_model_stats(model)
+        self.started_at = time.time()
+        self._stream = None
+        self._iterator = None
+        self.first_token_task = asyncio.create_task(self._first_token(client, request))
+
+    async def _first_token(self, client: AsyncOpenAI, request: Dict) -> str:
+        self._stream = await client.chat.completions.create(model=self.model, stream=True, **request)
+        self._iterator = self._stream.__aiter__()
+        while True:
+            try:
+                chunk = await self._iterator.__anext__()
+            except StopAsyncIteration:
+                raise RuntimeError("토큰 없이 스트림 종료")
+            text = _delta_text(chunk)
+            if text:
+                return text
+
+    async def rest(self) -> AsyncIterator[str]:
+        """첫 토큰 이후 나머지 텍스트"""
+        async for chunk in self._iterator:
+            text = _delta_text(chunk)
+            if text:
+                yield text
+
+    async def cancel(self):
+        if not self.first_token_task.done():
+            self.first_token_task.cancel()
+        try:
+            await self.first_token_task
+        except BaseException:
+            pass
+        await self.close()
+
+    async def close(self):
+        if self._stream is not None:
+            try:
+                await self._stream.close()
+            except Exception:
+                pass
+
+
+class LLMRouter:
+    """
+    실시간 응답 스트리밍 라우터
+
+    stream_chat(messages, ...)은 주 모델 → (지연/실패 시) 예비 모델 순으로 요청하고
+    첫 토큰을 먼저 준 스트림의 텍스트 조각을 반환
+    """
+
+    _client: Optional[AsyncOpenAI] = None
+
+    def __init__(self, primary_model: Optional[str] = None, fallback_model: Optional[str] = None):
+        self.primary_model = primary_model or settings.OPENAI_REALTIME_MODEL
+        fallback_model = fallback_model if fallback_model is not None else settings.OPENAI_FALLBACK_MODEL
+        # 예비 모델이 없거나 주 모델과 같으면 같은 모델로 재요청 (헤징 효과는 유지)
+        self.fallback_model = fallback_model or self.primary_model
+
+    @classmethod
+    def get_client(cls) -> AsyncOpenAI:
+        """프로세스 공용 AsyncOpenAI 클라이언트 (연결 재사용)"""
+        if cls._client is None:
+            cls._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=get_http_client())
+        return cls._client
+
+    def _hedge_delay(self) -> float:
+        p95 = get_model_stats(self.primary_model).ttft.quantile(
+            settings.LLM_HEDGE_QUANTILE, min_count=settings.LLM_HEDGE_MIN_SAMPLES
+        )
+        if p95 is None:
+            return settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+        return min(max(p95, HEDGE_DELAY_MIN_SECONDS), HEDGE_DELAY_MAX_SECONDS)
+
+    async def stream_chat(self, messages: List[Dict], **request) -> AsyncIterator[str]:
+        """
+        첫 토큰 경쟁 후 승리한 스트림의 텍스트 조각 반환
+
+        Args:
+            messages: Chat Completions 메시지 목록
+            **request: max_tokens, temperature 등 추가 파라미터
+
+        Raises:
+            RuntimeError: 모든 모델이 첫 토큰 전에 실패한 경우
+        """
+        request = {"messages": messages, **request}
+        client = self.get_client()
+        candidates = [self.primary_model, self.fallback_model]
+        attempts: List[_StreamAttempt] = [_StreamAttempt(client, candidates.pop(0), request)]
+        winner: Optional[_StreamAttempt] = None
+        first_token = ""
+        last_error: Optional[BaseException] = None
+
+        try:
+            while winner is None and attempts:
+                pending = {a.first_token_task: a for a in attempts}
+                timeout = None
+                if settings.LLM_HEDGE_ENABLED and candidates and len(attempts) == 1:
+                    timeout = self._hedge_delay()
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # 주 모델 첫 토큰 지연 → 예비 스트림 동시 시작
+                    slow = attempts[0]
+                    slow.stats.record_hedge()
+                    attempts.append(_StreamAttempt(client, candidates.pop(0), request))
+                    logger.info(
+                        f"⏱️ [LLM 라우터] {slow.model} 첫 토큰 지연 "
+                        f"({time.time() - slow.started_at:.2f}초) → {attempts[-1].model} 헤징 스트림 시작"
+                    )
+                    continue
+
+                for task in done:
+                    attempt = pending[task]
+                    attempts.remove(attempt)
+                    try:
+                        first_token = task.result()
+                    except Exception as e:
+                        last_error = e
+                        attempt.stats.record_failure()
+                        await attempt.close()
+                        logger.warning(f"⚠️ [LLM 라우터] {attempt.model} 실패: {e}")
+                    else:
+                        winner = attempt
+                        break
+
+                if winner is None and not attempts and candidates:
+                    # 첫 토큰 전에 실패 → 예비 모델 즉시 요청
+                    attempts.append(_StreamAttempt(client, candidates.pop(0), request))
+
+            if winner is None:
+                raise RuntimeError(f"모든 LLM 모델 실패: {last_error}")
+
+            ttft = time.time() - winner.started_at
+            winner.stats.record_first_token(ttft)
+            logger.info(f"⚡ [LLM 라우터] {winner.model} 첫 토큰 승리 (TTFT: {ttft:.2f}초)")
+
+            # 첫 토큰을 못 받은 스트림은 즉시 취소
+            for attempt in attempts:
+                attempt.stats.record_cancelled()
+                await attempt.cancel()
+            attempts.clear()
+
+            yield first_token
+            async for text in winner.rest():
+                yield text
+        finally:
+            for attempt in attempts:
+                await attempt.cancel()
+            if winner is not None:
+                await winner.close()
@@ -5,6 +5,14 @@ OpenAI GPT-4o 사용 (대화 생성 및 감정 분석)
 
 from openai import OpenAI
 from app.config import settings
+from app.services.ai_call.llm_router import LLMRouter
+from app.services.ai_call.text_matcher import (
+    SENTENCE_SPLIT_PATTERN,
+    classify_response,
+    classify_utterance,
+    has_user_label,
+    response_labels,
+)
 import logging
 import time
 import json
@@ -24,8 +32,9 @@ class LLMService:
     
     def __init__(self):
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        # GPT-4o-mini 모델 사용 (빠르고 경제적)
-        self.model = "gpt-4o"
+        # 분석/요약 등 비실시간 작업 모델 (실시간 응답은 LLMRouter의 OPENAI_REALTIME_MODEL 사용)
+        self.model = settings.OPENAI_MODEL
+        self.router = LLMRouter()
         
         # GRANDBY AI LLM System Prompt: Warm Neighbor Friend Character
         self.elderly_care_prompt = """You are 하루 (Haru), a warm neighbor friend to Korean seniors. Your name means "warm day" and represents the gift of caring for each day and checking on the elderly daily. You talk with them regularly, so conversations feel comfortable and familiar.
@@ -236,21 +245,18 @@ Important: DON'T use "그렇군요" automatically after "네", "응" - it sounds
         Returns:
             str: 규칙을 준수하도록 수정된 응답
         """
-        import re
-        
-        
         # 대화 기록에서 같은 주제 반복 체크 (식사 관련)
         if conversation_history:
             recent_topics = []
             for msg in conversation_history[-6:]:  # 최근 3턴 확인
                 content = msg.get('content', '')
                 # 식사 관련 키워드 추출
-                if any(word in content for word in ['저녁', '점심', '아침', '식사', '밥', '먹']):
+                if has_user_label(content, 'meal'):
                     recent_topics.append('meal')
             
             # 같은 주제가 2회 이상 나오면 경고
             meal_count = recent_topics.count('meal')
-            meal_keywords_in_response = any(word in response for word in ['저녁', '점심', '아침', '식사', '밥', '먹', '드실', '드셨'])
+            meal_keywords_in_response = 'meal' in response_labels(response)
             
             if meal_count >= 2 and meal_keywords_in_response:
                 logger.warning(f"⚠️ 같은 주제 반복 감지: 식사 관련 {meal_count+1}회 → 주제 전환 필요")
@@ -318,7 +324,7 @@ Important: DON'T use "그렇군요" automatically after "네", "응" - it sounds
         
         # 1. 문장 수 제한 (최대 2문장) + 문자 수 제한 (최대 60자) - 적절한 길이 유지
         # 문장 끝 마침표/느낌표/물음표로 분리
-        sentences = re.split(r'([.!?])\s*', response.strip())
+        sentences = SENTENCE_SPLIT_PATTERN.split(response.strip())
         
         # 구두점과 문장을 다시 합치기
         complete_sentences = []
@@ -359,68 +365,17 @@ Important: DON'T use "그렇군요" automatically after "네", "응" - it sounds
         if response and response[-1] not in '.!?':
             response += "."
         
-        # 2. 금지 패턴 감지 및 제거 (AI 봇 표현 + 대화 품질 문제)
-        banned_patterns = [
-            # AI 봇처럼 들리는 표현 (최우선 차단)
-            (r'도와드릴', '금지: AI 봇 표현'),
-            (r'필요하시면.*말씀', '금지: AI 봇 표현'),
-            (r'알려드릴', '금지: AI 봇 표현'),
-            (r'확인해.*드리', '금지: AI 봇 표현'),
-            (r'해드릴.*수', '금지: AI 봇 표현'),
-            (r'할.*수.*있습니다', '금지: AI 봇 표현'),
-            (r'통화.*종료|전화.*끊겠', '금지: AI 봇 표현'),
-            
-            # 대화 끝내려는 시도 (강화: AI가 먼저 통화를 끊으려는 모든 표현 차단)
-            (r'(그럼|그러면|이제|나중에|다음에|다음번에)\s*(끊|통화\s*종료|전화\s*끊|헤어지|그만|끊을|끊고)', '금지: 대화 끝내기'),
-            (r'(그럼|그러면|이제|나중에|다음에)\s*(다시|또)\s*(연락|전화|통화)', '금지: 대화 끝내기'),
-            (r'(안녕히|잘\s*가|다음에\s*봐)', '금지: 대화 끝내기 (어르신이 직접 말하지 않는 한)'),
-            
-            # 금융/개인정보
-            (r'(계좌|비밀번호|카드|돈|금융|송금|이체)', '금지: 금융정보'),
-            (r'(주민등록|주소|전화번호|개인정보)', '금지: 개인정보'),
-            
-            # 진단/강요
-            (r'(병원\s*가|진료\s*받|검사\s*받|의사\s*만나).*세요', '금지: 의료 강요'),
-            (r'(해야\s*해|하셔야|반드시|꼭\s*해)', '금지: 강요'),
-            
-            # 무거운 조언
-            (r'(계획|목표|운동|다이어트).*세요', '금지: 무거운 조언'),
-            
-            # 금지 키워드: 추상적 질문 (대화 품질 저하)
-            (r'어떤.*물어보', '금지: 추상적 질문'),
-            (r'무슨.*궁금', '금지: 추상적 질문'),
-            (r'어떤 기분인지', '금지: 추상적 질문'),
-            (r'어떻게.*되셨는지', '금지: 추상적 질문'),
-            (r'왜.*그런지', '금지: 원인 추궁'),
-            (r'언제.*되셨는지', '금지: 시간 추궁'),
-            (r'어떤.*보고.*신가요', '금지: 추상적 질문'),
-            (r'어떤.*프로그램.*봐', '금지: 추상적 질문'),
-            
-            # 같은 주제 반복 추궁 금지 (저녁, 식사 등)
-            (r'(저녁|점심|아침|식사|밥).*(저녁|점심|아침|식사|밥)', '금지: 같은 주제 반복 추궁'),
-            
-            # 사용자 거부/관심 없음 표시 후 같은 주제 계속 추궁 금지
-            (r'뭘\s*드실\s*(계획|할|거예요|거야)', '금지: 식사 계획 추궁'),
-            (r'준비.*하세요', '금지: 식사 준비 강요'),
-            
-            # 3인칭 사용 금지 (자기 자신을 "하루는", "하루가" 등으로 지칭)
-            (r'하루는\s*.*', '금지: 3인칭 사용 ("하루는" 대신 "저는" 사용)'),
-            (r'하루가\s*.*', '금지: 3인칭 사용 ("하루가" 대신 "제가" 사용)'),
-            (r'하루도\s*.*', '금지: 3인칭 사용 ("하루도" 대신 "저도" 사용)'),
-        ]
-        
-        for pattern, reason in banned_patterns:
-            if re.search(pattern, response, re.IGNORECASE):
-                logger.warning(f"⚠️ {reason} 감지: '{response}' → 재생성 필요")
-                # 금지 패턴 발견 시 안전한 공감 응답으로 대체
-                response = self._generate_safe_response(user_message)
-                break
+        # 2. 금지 패턴 감지 및 제거 (AI 봇 표현 + 대화 품질 문제, 규칙은 text_matcher.BANNED_RESPONSE_RULES)
+        # 키워드 라벨과 금지 패턴을 한 번에 분류 (사전 컴파일된 매처)
+        features = classify_response(response)
+        if features.banned_reason:
+            logger.warning(f"⚠️ {features.banned_reason} 감지: '{response}' → 재생성 필요")
+            # 금지 패턴 발견 시 안전한 공감 응답으로 대체
+            response = self._generate_safe_response(user_message)
+            features = classify_response(response)
         
         # 3. 자연스러운 존댓말 확인 (강제 변환 X, 경고만)
-        jondaemal_markers = ['세요', '셔요', '습니다', '네요', '어요', '죠']
-        has_jondaemal = any(marker in response for marker in jondaemal_markers)
-        
-        if not has_jondaemal:
+        if 'jondaemal' not in features.labels:
             logger.warning(f"⚠️ 존댓말 미흡: '{response}'")
         
         return response
@@ -435,31 +390,8 @@ Important: DON'T use "그렇군요" automatically after "네", "응" - it sounds
         Returns:
             bool: 단답형이면 True
         """
-        import re
-        
-        # 인사말은 단답형으로 처리하지 않음
-        greetings = ['안녕', '안녕하세요', '안녕히가세요', '안녕히가세', '안녕하세', '반갑', '반가워']
-        if any(greeting in user_message for greeting in greetings):
-            return False
-        
-        # 메시지 길이 체크 (5자 이하)
-        if len(user_message.strip()) <= 5:
-            return True
-        
-        # 단답형 패턴
-        short_patterns = [
-            r'^(네|응|그래|맞아|아니|아니야|아직|모르겠|괜찮아|괜찮|좋아|싫어)$',
-            r'^(네|응|그래|맞아|아니|아직).*[요네]$',  # "네요", "아직 안 했어요" 등
-            r'^(아니오|아니요|아니예요)$',
-            r'^(모르겠|모르겠어|모르겠네|모르겠다)$',
-        ]
-        
-        normalized = user_message.strip()
-        for pattern in short_patterns:
-            if re.match(pattern, normalized, re.IGNORECASE):
-                return True
-        
-        return False
+        # 인사말 제외, 5자 이하 또는 단답형 패턴 (text_matcher.SHORT_RESPONSE_RULES)
+        return classify_utterance(user_message).is_short
     
     def _generate_safe_response(self, user_message: str) -> str:
         """
@@ -473,35 +405,36 @@ Important: DON'T use "그렇군요" automatically after "네", "응" - it sounds
         """
         import random
         
-        if any(word in user_message for word in ['아프', '힘들', '고통', '통증']):
+        labels = classify_utterance(user_message).labels
+        if 'pain' in labels:
             responses = [
                 "어머, 많이 힘드시겠어요. 괜찮으신가요?",
                 "어머나, 힘드시겠어요. 괜찮으신가요?",
                 "아이, 많이 힘드시겠어요."
             ]
             return random.choice(responses)
-        elif any(word in user_message for word in ['외롭', '쓸쓸', '혼자', '아무도']):
+        elif 'lonely' in labels:
             responses = [
                 "외로우시겠어요. 제가 들어드릴게요.",
                 "어머나, 외로우시겠어요. 저도 듣고 있어요.",
                 "어머, 외로우시겠어요. 제가 들어드릴게요."
             ]
             return random.choice(responses)
-        elif any(word in user_message for word in ['슬프', '우울', '속상', '걱정']):
+        elif 'sad' in labels:
             responses = [
                 "속상하시겠어요. 무슨 일 있으셨나요?",
                 "어머, 속상하시겠어요. 어떤 일이에요?",
                 "어머나, 걱정되시겠어요. 괜찮으신가요?"
             ]
             return random.choice(responses)
-        elif any(word in user_message for word in ['자식', '아들', '딸', '손주']):
+        elif 'family' in labels:
             responses = [
                 "가족분들 생각나시겠어요. 많이 보고 싶으시겠어요.",
                 "어머나, 가족분들 이야기 나오시네요. 보고 싶으시겠어요.",
                 "오호, 가족 얘기 나오시는군요. 좋으시겠어요."
             ]
             return random.choice(responses)
-        elif any(word in user_message for word in ['기쁨', '좋아', '즐거', '행복']):
+        elif 'joy' in labels:
             responses = [
                 "좋으시네요. 기분이 좋아 보이세요.",
                 "오호, 좋으시군요. 기쁘시겠어요!",
@@ -707,6 +640,16 @@ JSON 형식으로 응답:
             location_info = ", ".join(contextual_info['location'])
             context_parts.append(f"환경: {location_info} - 거주지나 환경에 대해 언급하세요")
         
+        # 자주 하는 이야기 (통화 전 계산된 프로필)
+        if contextual_info.get('topics'):
+            topics_info = ", ".join(contextual_info['topics'])
+            context_parts.append(f"자주 하는 이야기: {topics_info} - 대화 소재로 자연스럽게 활용하세요")
+        
+        # 최근 일기 (지난 통화 요약)
+        if contextual_info.get('recent_diaries'):
+            diaries_info = ", ".join(contextual_info['recent_diaries'])
+            context_parts.append(f"최근 일기: {diaries_info} - 지난 이야기를 기억하고 이어가세요")
+        
         if context_parts:
             return " | ".join(context_parts)
         return ""
@@ -1052,32 +995,24 @@ JSON 형식으로 응답:
             # 현재 사용자 메시지 추가
             messages.append({"role": "user", "content": user_message})
             
-            # 스트리밍 API 호출
-            # stream=True로 설정하면 응답이 생성되는 즉시 받을 수 있습니다
+            # 스트리밍 API 호출 (LLMRouter: 주 모델 TTFT가 p95를 넘으면 예비 모델 헤징)
             api_start_time = time.time()
-            stream = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=50,  # 2문장 또는 60자 정도 (충분한 길이 확보)
-                temperature=0.5,  # 속도 우선 (0.3은 느림)
-                stream=True  # ⭐ 핵심: 스트리밍 활성화
-            )
-            
             full_response = []  # 전체 응답 저장용
             ttft = None  # TTFT 측정용
             
-            # 스트리밍으로 받은 청크를 즉시 yield
-            for chunk in stream:
-                # delta.content가 있으면 생성된 텍스트 조각입니다
-                if chunk.choices[0].delta.content:
-                    # TTFT 측정 (첫 토큰 수신 시점)
-                    if ttft is None:
-                        ttft = time.time() - api_start_time
-                        logger.info(f"⚡ 첫 토큰 수신! TTFT: {ttft:.2f}초")
-                    
-                    content = chunk.choices[0].delta.content
-                    full_response.append(content)
-                    yield content  # 즉시 반환 (TTS가 바로 처리 가능)
+            # 스트리밍으로 받은 텍스트 조각을 즉시 yield
+            async for content in self.router.stream_chat(
+                messages,
+                max_tokens=50,  # 2문장 또는 60자 정도 (충분한 길이 확보)
+                temperature=0.5,  # 속도 우선 (0.3은 느림)
+            ):
+                # TTFT 측정 (첫 토큰 수신 시점)
+                if ttft is None:
+                    ttft = time.time() - api_start_time
+                    logger.info(f"⚡ 첫 토큰 수신! TTFT: {ttft:.2f}초")
+                
+                full_response.append(content)
+                yield content  # 즉시 반환 (TTS가 바로 처리 가능)
             
             elapsed_time = time.time() - start_time
             final_text = "".join(full_response)
@@ -1143,6 +1078,156 @@ JSON 형식으로 응답:
             logger.error(f"❌ 통화 일기 생성 실패: {e}")
             return "일기 생성 실패"    
     
+    def analyze_call_conversation(self, conversation_history: list) -> dict:
+        """
+        통화 종료 후 단일 LLM 호출로 구조화 분석 (일기/제목/기분/일정/감정/개인화 정보)
+        
+        summarize_call_conversation, extract_schedule_from_conversation,
+        analyze_emotion, extract_contextual_info를 각각 호출하던 것을 한 번의 요청으로 통합
+        
+        Args:
+            conversation_history: 대화 기록 [{"role": "user", "content": "..."}, ...]
+        
+        Returns:
+            dict: {
+                "diary": str, "title": str, "mood": str,
+                "schedules": [{title, description, category, due_date, due_time}],
+                "emotion": {"type", "score", "urgency", "keywords"},
+                "personalization": {family, hobbies, health, daily_patterns, location, keywords}
+            }
+        
+        Raises:
+            Exception: LLM 호출 또는 JSON 파싱 실패 시
+        """
+        from datetime import timedelta
+        
+        start_time = time.time()
+        logger.info(f"🧠 통화 통합 분석 시작 ({len(conversation_history)}개 메시지)")
+        
+        conversation_text = "\n".join([
+            f"{'어르신' if msg['role'] == 'user' else 'AI'}: {msg['content']}"
+            for msg in conversation_history
+        ])
+        
+        today = datetime.now(KST)
+        tomorrow = today + timedelta(days=1)
+        weekdays_kr = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
+        
+        prompt = f"""
+다음은 어르신과 AI 비서의 통화 내용입니다. 아래 항목을 한 번에 분석해 JSON으로만 응답하세요.
+현재 시각: {today.strftime('%Y-%m-%d')} ({weekdays_kr[today.weekday()]}) {today.strftime('%H:%M')}
+내일: {tomorrow.strftime('%Y-%m-%d')}
+
+통화 내용:
+{conversation_text}
+
+1. diary: 어르신이 직접 쓴 것 같은 1인칭 일기
+   - 대화에서 실제로 언급된 어르신의 말만 사용 (추측, 가정, 창작 금지 / AI 발화 제외)
+   - "오늘은", "오늘" 등으로 자연스럽게 시작 ("안녕하세요" 금지)
+   - 1인칭 구어체 ("~했어", "~거야", "~네"), 대화 순서대로, 5-8문장
+2. title: 일기 제목 (15자 이내 명사구)
+3. mood: happy, sad, calm, excited, angry, tired 중 하나
+4. schedules: 확정된 구체적인 미래 일정만 (과거/완료/막연한 표현 제외, 최대 5개)
+   - due_date: 절대 날짜 YYYY-MM-DD, due_time: HH:MM 24시간제 또는 null
+   - category: MEDICINE, HOSPITAL, EXERCISE, MEAL, OTHER 중 하나
+   - title/description: 대화에 있는 정보만, 간결한 명사구 또는 동작 표현 (서술형 어미 금지)
+5. emotion: 통화 전체의 감정
+   - type: positive, neutral, negative 중 하나
+   - score: 0.0 ~ 1.0 (감정 강도)
+   - urgency: low, medium, high (건강 문제나 긴급 상황 여부)
+   - keywords: 감정 판단 근거 키워드
+6. personalization: 어르신 핵심 정보 (없으면 빈 배열)
+   - family, hobbies, health, daily_patterns, location, keywords
+
+JSON 형식:
+{{
+  "diary": "오늘은 ...",
+  "title": "...",
+  "mood": "calm",
+  "schedules": [
+    {{"title": "...", "description": "...", "category": "HOSPITAL", "due_date": "{tomorrow.strftime('%Y-%m-%d')}", "due_time": "15:00"}}
+  ],
+  "emotion": {{"type": "neutral", "score": 0.5, "urgency": "low", "keywords": []}},
+  "personalization": {{"family": [], "hobbies": [], "health": [], "daily_patterns": [], "location": [], "keywords": []}}
+}}
+"""
+        
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=1200,
+            temperature=0.3,
+            response_format={"type": "json_object"}
+        )
+        
+        result = self._normalize_call_analysis(json.loads(response.choices[0].message.content))
+        elapsed_time = time.time() - start_time
+        logger.info(
+            f"✅ 통화 통합 분석 완료 (소요 시간: {elapsed_time:.2f}초, "
+            f"일정 {len(result['schedules'])}개, 감정 {result['emotion']['type']})"
+        )
+        return result
+    
+    @staticmethod
+    def _normalize_call_analysis(raw: dict) -> dict:
+        """통합 분석 결과를 저장/소비 가능한 고정 구조로 정규화"""
+        def str_list(value) -> list:
+            if not isinstance(value, list):
+                return []
+            return [str(v) for v in value if v]
+        
+        raw = raw if isinstance(raw, dict) else {}
+        
+        mood = str(raw.get("mood") or "").lower()
+        if mood not in ("happy", "sad", "calm", "excited", "angry", "tired"):
+            mood = None
+        
+        schedules = []
+        for item in raw.get("schedules") or []:
+            if not isinstance(item, dict) or not item.get("title"):
+                continue
+            category = str(item.get("category") or "OTHER").upper()
+            if category not in ("MEDICINE", "HOSPITAL", "EXERCISE", "MEAL", "OTHER"):
+                category = "OTHER"
+            schedules.append({
+                "title": item.get("title"),
+                "description": item.get("description"),
+                "category": category,
+                "due_date": item.get("due_date"),
+                "due_time": item.get("due_time"),
+            })
+        
+        emotion = raw.get("emotion") if isinstance(raw.get("emotion"), dict) else {}
+        emotion_type = str(emotion.get("type") or "neutral").lower()
+        if emotion_type not in ("positive", "neutral", "negative"):
+            emotion_type = "neutral"
+        try:
+            emotion_score = min(max(float(emotion.get("score", 0.5)), 0.0), 1.0)
+        except (TypeError, ValueError):
+            emotion_score = 0.5
+        urgency = str(emotion.get("urgency") or "low").lower()
+        if urgency not in ("low", "medium", "high"):
+            urgency = "low"
+        
+        personalization = raw.get("personalization") if isinstance(raw.get("personalization"), dict) else {}
+        
+        return {
+            "diary": (raw.get("diary") or "").strip(),
+            "title": (raw.get("title") or "").strip() or None,
+            "mood": mood,
+            "schedules": schedules[:5],
+            "emotion": {
+                "type": emotion_type,
+                "score": emotion_score,
+                "urgency": urgency,
+                "keywords": str_list(emotion.get("keywords")),
+            },
+            "personalization": {
+                key: str_list(personalization.get(key))
+                for key in ("family", "hobbies", "health", "daily_patterns", "location", "keywords")
+            },
+        }
+    
     def extract_schedule_from_conversation(self, conversation_text: str):
             """
             통화 내용에서 일정 정보 추출 (버전 7: 영어 프롬프트, 한국어 응답)
@@ -0,0 +1,95 @@
+"""
+Twilio 수신 media 이벤트 빠른 디코딩
+- 통화당 초당 50개(20ms) 들어오는 media 메시지는 전체 JSON 파싱 없이 문자열 탐색으로
+  payload / timestamp만 추출 (형식이 예상과 다르면 None → 호출 측이 json.loads로 처리)
+- base64는 메시지당 1번만 디코딩해 녹음기 / 에코 게이트 / STT가 같은 bytes를 공유
+- MulawBatcher: 20ms μ-law 프레임을 미리 할당한 버퍼에 모아 STT_AUDIO_BATCH_MS 단위로
+  한 번에 16bit PCM 변환 → STT 큐 항목 수와 변환 호출 수를 배치 크기만큼 줄임
+"""
+
+import audioop
+import binascii
+from typing import List, Optional, Tuple
+
+SAMPLE_RATE = 8000
+
+# Twilio media 메시지는 공백 없는 JSON이며 "event"가 첫 키
+_MEDIA_PREFIX = '{"event":"media"'
+_PAYLOAD_KEY = '"payload":"'
+_TIMESTAMP_KEY = '"timestamp":"'
+
+
+def parse_media_message(message: str) -> Optional[Tuple[bytes, Optional[int]]]:
+    """
+    media 이벤트 → (μ-law bytes, media.timestamp ms)
+
+    media 이벤트가 아니거나 빠른 경로로 해석할 수 없으면 None
+    """
+    if not message.startswith(_MEDIA_PREFIX):
+        return None
+
+    start = message.find(_PAYLOAD_KEY)
+    if start < 0:
+        return None
+    start += len(_PAYLOAD_KEY)
+    end = message.find('"', start)
+    if end < 0:
+        return None
+
+    timestamp = None
+    ts_start = message.find(_TIMESTAMP_KEY)
+    if ts_start >= 0:
+        ts_start += len(_TIMESTAMP_KEY)
+        ts_end = message.find('"', ts_start)
+        try:
+            timestamp = int(message[ts_start:ts_end])
+        except ValueError:
+            return None
+
+    try:
+        audio = binascii.a2b_base64(message[start:end])
+    except binascii.Error:
+        return None
+    return audio, timestamp
+
+
+class MulawBatcher:
+    """μ-law 프레임 → batch_ms 단위 16bit PCM (통화별 1개, 버퍼 재사용)"""
+
+    def __init__(self, batch_ms: int):
+        self.batch_bytes = max(1, SAMPLE_RATE * batch_ms // 1000)
+        self._buffer = bytearray(self.batch_bytes)
+        self._view = memoryview(self._buffer)
+        self._filled = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._filled
+
+    def push(self, frame: bytes) -> List[bytes]:
+        """
+        프레임 추가
+
+        Returns:
+            가득 찬 배치의 PCM 목록 (대부분 비어 있거나 1개)
+        """
+        ready = []
+        source = memoryview(frame)
+        offset = 0
+        while offset < len(source):
+            take = min(self.batch_bytes - self._filled, len(source) - offset)
+            self._view[self._filled:self._filled + take] = source[offset:offset + take]
+            self._filled += take
+            offset += take
+            if self._filled == self.batch_bytes:
+                ready.append(audioop.ulaw2lin(self._buffer, 2))
+                self._filled = 0
+        return ready
+
+    def flush(self) -> Optional[bytes]:
+        """남은 프레임을 PCM으로 (발화 차단 직전 / 스트림 종료 시)"""
+        if not self._filled:
+            return None
+        pcm = audioop.ulaw2lin(self._view[:self._filled], 2)
+        self._filled = 0
+        return pcm
@@ -9,8 +9,9 @@ import time
 import os
 import asyncio
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, Optional, Tuple
 from app.config import settings
+from app.utils.http_pool import get_http_client
 from app.utils.s3 import upload_file_to_s3, delete_file_from_s3
 
 logger = logging.getLogger(__name__)
@@ -35,8 +36,8 @@ class NaverClovaTTSService:
         self.audio_dir = Path(__file__).parent.parent.parent.parent / "audio_files" / "tts"
         self.audio_dir.mkdir(parents=True, exist_ok=True)
 
-        # HTTP 클라이언트 (연결 재사용)
-        self.client = httpx.AsyncClient(http2=True, timeout=10.0)
+        # HTTP 클라이언트 (프로세스 공용 - 통화마다 새 TLS 연결을 맺지 않음)
+        self.client = get_http_client()
         self.sync_client = httpx.Client(http2=True, timeout=10.0)
 
         # 헤더를 요청마다 새로 설정 (매우 중요!)
@@ -105,6 +106,63 @@ class NaverClovaTTSService:
             logger.error(f"❌ TTS 변환 오류: {e}")
             return None, 0
     
+    async def stream_speech(self, text: str, chunk_size: int = 4096) -> AsyncIterator[bytes]:
+        """
+        스트리밍 합성: 응답 본문 전체를 기다리지 않고 WAV 바이트를 도착하는 대로 반환
+        
+        Args:
+            text: 변환할 텍스트
+            chunk_size: 한 번에 읽을 최대 바이트 수
+        
+        Yields:
+            bytes: WAV 스트림 조각 (첫 조각에 RIFF 헤더 포함)
+        """
+        if not text or len(text.strip()) < 1:
+            logger.error("❌ 변환할 텍스트가 비어있습니다!")
+            return
+        
+        data = {
+            "speaker": self.speaker,
+            "speed": str(self.speed),
+            "pitch": str(self.pitch),
+            "volume": str(self.volume),
+            "alpha": str(self.alpha),
+            "emotion": str(self.emotion),
+            "text": text,
+            "format": "wav"
+        }
+        
+        start_time = time.time()
+        first_byte_time = None
+        total_bytes = 0
+        
+        try:
+            async with self.client.stream(
+                "POST",
+                self.api_url,
+                headers=self.headers,
+                data=data,
+                timeout=10.0
+            ) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    logger.error(f"❌ API 호출 실패: {response.status_code}")
+                    logger.error(f"  - 응답: {body[:500]!r}")
+                    return
+                
+                async for chunk in response.aiter_bytes(chunk_size):
+                    if not chunk:
+                        continue
+                    if first_byte_time is None:
+                        first_byte_time = time.time()
+                        logger.info(f"⚡ [Clova TTS 스트리밍] 첫 바이트 수신 ({first_byte_time - start_time:.2f}초)")
+                    total_bytes += len(chunk)
+                    yield chunk
+            
+            logger.info(f"✅ Clova TTS 스트리밍 완료: {total_bytes} bytes ({time.time() - start_time:.2f}초)")
+        except Exception as e:
+            logger.error(f"❌ TTS 스트리밍 오류: {e}")
+    
     def text_to_speech(self, text: str, output_path: str = None) -> Tuple[Optional[str], float]:
         try:
             start_time = time.time()
@@ -207,8 +265,7 @@ class NaverClovaTTSService:
         """리소스 정리"""
         if self.sync_client:
             self.sync_client.close()
-        if self.client:
-            await self.client.aclose()
+        # 비동기 클라이언트는 공용이므로 닫지 않음 (lifespan 종료 시 close_http_client)
         logger.info("🔒 HTTP 클라이언트 정리 완료")
 
 
@@ -0,0 +1,180 @@
+"""
+통화별 Twilio WebSocket 송신기 (단일 writer)
+- 환영 멘트 / 스트리밍 응답 / 종료 안내 등 모든 송신을 통화당 태스크 1개가 순서대로 전송
+  (여러 코루틴이 websocket.send_text를 동시에 호출하지 않음)
+- 큐 상한(OUTBOUND_QUEUE_MAX_FRAMES)에 도달하면 생산자가 빈자리를 기다림 → 느린 소켓에 대한 backpressure
+- 큐에 연속으로 쌓인 작은 media 프레임은 OUTBOUND_COALESCE_MAX_BYTES까지 합쳐 메시지 1개로 전송
+- 대기열 깊이 / 생산자 대기 시간 / 송신 지연(큐 투입 → 전송 완료)을 snapshot()으로 노출,
+  송신 지연은 fleet_latency "ws_send" 단계로도 기록
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import WebSocket
+
+from app.config import settings
+from app.core.state import active_recorders
+from app.utils.fleet_latency import fleet_latency
+
+logger = logging.getLogger(__name__)
+
+WS_SEND_STAGE = "ws_send"
+
+_CLOSE = object()  # writer 종료 신호
+
+
+class OutboundSenderClosed(Exception):
+    """송신기가 닫힌 뒤(소켓 오류 / 통화 종료) 전송 요청"""
+
+
+class OutboundSender:
+    """
+    통화별 송신기 (WebSocket 핸들러가 start 이벤트에서 생성, stream_sid로 등록)
+
+    send_media / send_event는 큐에 넣고 반환 (큐가 가득 차면 빈자리가 날 때까지 대기)
+    """
+
+    def __init__(self, websocket: WebSocket, stream_sid: str, call_sid: Optional[str] = None):
+        self.websocket = websocket
+        self.stream_sid = stream_sid
+        self.call_sid = call_sid
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.OUTBOUND_QUEUE_MAX_FRAMES)
+        self._coalesce_max = settings.OUTBOUND_COALESCE_MAX_BYTES
+        self._closed = False
+        self._task = asyncio.create_task(self._run(), name=f"outbound-{stream_sid}")
+
+        self.frames_queued = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.max_depth = 0
+        self.producer_waits = 0
+        self.producer_wait_max = 0.0
+        self.last_send_latency: Optional[float] = None
+        self.max_send_latency = 0.0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def _put(self, item):
+        if self._closed:
+            raise OutboundSenderClosed(self.stream_sid)
+        if self._queue.full():
+            self.producer_waits += 1
+            wait_start = time.time()
+            await self._queue.put(item)
+            self.producer_wait_max = max(self.producer_wait_max, time.time() - wait_start)
+        else:
+            self._queue.put_nowait(item)
+        self.frames_queued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    async def send_media(self, mulaw: bytes):
+        """8kHz μ-law 오디오 전송 예약 (인접한 media 프레임과 합쳐질 수 있음)"""
+        if mulaw:
+            await self._put(("media", bytes(mulaw), time.time()))
+
+    async def send_event(self, message: Dict):
+        """media 외 이벤트(clear / mark 등) 전송 예약 - 앞선 오디오 이후 순서대로 단독 전송"""
+        await self._put(("event", message, time.time()))
+
+    async def _run(self):
+        carry = None  # 합치다 만난 다음 항목 (다음 루프에서 처리)
+        try:
+            while True:
+                item = carry if carry is not None else await self._queue.get()
+                carry = None
+                if item is _CLOSE:
+                    return
+
+                kind, body, enqueued_at = item
+                if kind == "event":
+                    await self.websocket.send_text(json.dumps(body))
+                    self._record_sent(enqueued_at, 0)
+                    continue
+
+                # 큐에 이미 쌓인 media 프레임은 합쳐서 전송 (기다리지 않음)
+                chunks = [body]
+                size = len(body)
+                while size < self._coalesce_max and not self._queue.empty():
+                    nxt = self._queue.get_nowait()
+                    if nxt is _CLOSE or nxt[0] != "media" or size + len(nxt[1]) > self._coalesce_max:
+                        carry = nxt
+                        break
+                    chunks.append(nxt[1])
+                    size += len(nxt[1])
+
+                audio = b"".join(chunks)
+                await self.websocket.send_text(json.dumps({
+                    "event": "media",
+                    "streamSid": self.stream_sid,
+                    "media": {"payload": base64.b64encode(audio).decode("utf-8")},
+                }))
+                recorder = active_recorders.get(self.stream_sid)
+                if recorder:
+                    recorder.add_outbound(audio)
+                self._record_sent(enqueued_at, len(audio))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Twilio 송신 실패, 송신기 종료: {self.call_sid or self.stream_sid} - {e}")
+        finally:
+            self._closed = True
+            self._drain()
+
+    def _record_sent(self, enqueued_at: float, size: int):
+        latency = time.time() - enqueued_at
+        self.messages_sent += 1
+        self.bytes_sent += size
+        self.last_send_latency = latency
+        if latency > self.max_send_latency:
+            self.max_send_latency = latency
+        fleet_latency.record(WS_SEND_STAGE, latency)
+
+    def _drain(self):
+        """남은 프레임 폐기 (대기 중인 생산자를 깨워 OutboundSenderClosed로 끝나게 함)"""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def close(self, timeout: float = 1.0):
+        """통화 종료 - 대기 중인 프레임을 timeout 동안 보낸 뒤 writer 종료"""
+        if self._task.done():
+            self._closed = True
+            return
+        self._closed = True  # 이후 전송 요청 거부
+        deadline = time.time() + timeout
+        try:
+            await asyncio.wait_for(self._queue.put(_CLOSE), timeout=timeout)
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=max(0.0, deadline - time.time()))
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ 송신 대기열 정리 시간 초과, 남은 프레임 폐기: {self.call_sid or self.stream_sid}")
+            self._task.cancel()
+        except Exception as e:
+            logger.warning(f"⚠️ 송신기 종료 중 오류 (무시): {e}")
+
+    def snapshot(self) -> Dict:
+        """관리자 API용 상태"""
+        return {
+            "call_sid": self.call_sid,
+            "stream_sid": self.stream_sid,
+            "closed": self._closed,
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "frames_queued": self.frames_queued,
+            "messages_sent": self.messages_sent,
+            "bytes_sent": self.bytes_sent,
+            "producer_waits": self.producer_waits,
+            "producer_wait_max_seconds": self.producer_wait_max,
+            "last_send_latency_seconds": self.last_send_latency,
+            "max_send_latency_seconds": self.max_send_latency,
+        }
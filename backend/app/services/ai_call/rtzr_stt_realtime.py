@@ -6,17 +6,25 @@ Twilio WebSocket과 통합하여 실시간 음성 인식 수행
 import asyncio
 import logging
 import time
-from typing import Optional, AsyncGenerator, Callable
+from collections import deque
+from typing import Optional, AsyncGenerator, Callable, List
 from app.services.ai_call.end_decision import (
     # EndDecisionEngine,
     EndDecisionSignals,
     check_timeout,
     is_short_ack,
 )
-from app.services.ai_call.rtzr_stt_service import RTZRSTTService, PartialResultBuffer
+from app.services.ai_call.rtzr_stt_service import RTZRSTTService, PartialResultBuffer, PARTIAL_TEXT_HISTORY
+from app.services.ai_call.echo_gate import EchoGate
+from app.services.ai_call.media_decoder import MulawBatcher
+from app.config import settings
+from app.utils.timer_scheduler import call_timers, TimerHandle
 
 logger = logging.getLogger(__name__)
 
+# STT 전송 대기열 상한 (초 분량) - RTZR 전송이 밀리면 오래된 오디오부터 버림
+STT_AUDIO_QUEUE_SECONDS = 10
+
 
 class RTZRRealtimeSTT:
     """
@@ -49,25 +57,88 @@ class RTZRRealtimeSTT:
         
         # ✅ AI 응답 중 사용자 입력 차단 플래그
         self.is_bot_speaking = False
-        self.bot_silence_delay = 0  # AI 응답 종료 후 1초 대기
+        # 에코 게이트 (Twilio media timestamp 기준, 재개 시 직전 오디오 프리롤 전달)
+        self.echo_gate = EchoGate()
+        # 20ms 프레임 → STT_AUDIO_BATCH_MS 단위 PCM (변환/큐 투입 횟수 감소)
+        self.audio_batcher = MulawBatcher(settings.STT_AUDIO_BATCH_MS)
+        self.dropped_audio_batches = 0
         
         # ⏱️ 타임아웃 체크용 신호
         self._signals = EndDecisionSignals(call_start_time=time.time())
-        self._timeout_task: Optional[asyncio.Task] = None
+        self._timers: List[TimerHandle] = []
+        self._silence_timer: Optional[TimerHandle] = None
+        self._last_activity_time = time.time()  # 무응답 판단 기준 (사용자 인식 결과 / AI 발화 종료)
 
         logger.info("✅ RTZR 실시간 STT 초기화 완료")
     
     def start_bot_speaking(self):
         """AI 응답 시작 - 사용자 입력 차단"""
         self.is_bot_speaking = True
-        self.bot_silence_delay = 0
+        self.echo_gate.close()
+        self._flush_audio_batch()  # 차단 직전까지의 사용자 오디오는 바로 전송
         logger.debug("🤖 [에코 방지] AI 응답 중 - 사용자 입력 차단")
     
     def stop_bot_speaking(self):
-        """AI 응답 종료 - 1초 후 사용자 입력 재개"""
+        """AI 응답 종료 - ECHO_GATE_TAIL_MS 이후 수신 오디오부터 입력 재개"""
         self.is_bot_speaking = False
-        self.bot_silence_delay = 50  # 5개 청크 = 0.1초 대기
-        logger.debug("🤖 [에코 방지] AI 응답 종료 - 1초 후 사용자 입력 재개")
+        self._last_activity_time = time.time()
+        self.echo_gate.reopen()
+        logger.debug(f"🤖 [에코 방지] AI 응답 종료 - {self.echo_gate.tail_ms}ms 후 사용자 입력 재개")
+    
+    # ===== 통화 마감 타이머 (워커 공용 TimerScheduler) =====
+    
+    def _schedule_timeouts(self):
+        """최대 통화 시간 경고 / 강제 종료 / 무응답 마감 시각 등록"""
+        start = self._signals.call_start_time
+        warning_at = start + self._signals.max_call_seconds - self._signals.warning_before_end_seconds
+        self._timers = [
+            call_timers.call_at(warning_at, self._on_call_deadline, name="max_time_warning"),
+            call_timers.call_at(start + self._signals.max_call_seconds, self._on_call_deadline, name="max_time_exceeded"),
+        ]
+        if settings.CALL_SILENCE_TIMEOUT_SECONDS > 0:
+            self._arm_silence_timer()
+    
+    def _cancel_timeouts(self):
+        for handle in self._timers:
+            handle.cancel()
+        self._timers = []
+        if self._silence_timer:
+            self._silence_timer.cancel()
+            self._silence_timer = None
+    
+    def _on_call_deadline(self):
+        """최대 통화 시간 경고/초과 시각 도래 → 결과 큐로 이벤트 전달"""
+        if not self.is_active or self.results_queue is None:
+            return
+        event_type, breakdown = check_timeout(self._signals)
+        if event_type != "max_time_warning":
+            return
+        if breakdown.get("max_time_exceeded"):
+            logger.info(f"🔴 [타임아웃] 통화 시간 초과 ({breakdown.get('call_duration_sec', 0)}초) - 종료")
+        else:
+            logger.info(f"⚠️ [타임아웃] 통화 시간 임박 - 경고 전송 ({breakdown.get('max_time_warning', '')})")
+        self.results_queue.put_nowait({"event": "max_time_warning"})
+    
+    def _arm_silence_timer(self):
+        due = self._last_activity_time + settings.CALL_SILENCE_TIMEOUT_SECONDS
+        self._silence_timer = call_timers.call_at(due, self._on_silence_deadline, name="silence_timeout")
+    
+    def _on_silence_deadline(self):
+        """
+        무응답 마감 시각 도래 - 그 사이 활동이 있었으면 마지막 활동 기준으로 다시 등록
+        (인식 결과마다 타이머를 재등록하지 않고 시각만 갱신)
+        """
+        self._silence_timer = None
+        if not self.is_active or self.results_queue is None:
+            return
+        idle = time.time() - self._last_activity_time
+        if self.is_bot_speaking or idle < settings.CALL_SILENCE_TIMEOUT_SECONDS:
+            if self.is_bot_speaking:
+                self._last_activity_time = time.time()
+            self._arm_silence_timer()
+            return
+        logger.info(f"🔕 [타임아웃] 사용자 무응답 {idle:.0f}초 - 종료 안내")
+        self.results_queue.put_nowait({"event": "silence_timeout"})
     
     def is_user_speaking(self, threshold_seconds: float = 1.5) -> bool:
         """
@@ -98,36 +169,13 @@ class RTZRRealtimeSTT:
             }
         """
         self.is_active = True
-        self.audio_queue = asyncio.Queue()
+        self.audio_queue = asyncio.Queue(
+            maxsize=max(1, STT_AUDIO_QUEUE_SECONDS * 1000 // settings.STT_AUDIO_BATCH_MS)
+        )
         self.results_queue = asyncio.Queue()
 
-        # ⏱️ 타임아웃 체크 태스크 (1초 간격)
-        async def _timeout_check_loop():
-            """타임아웃만 체크하는 루프"""
-            logger.info("⏱️ [타임아웃 체크 루프 시작]")
-            try:
-                while self.is_active:
-                    await asyncio.sleep(1.0)
-                    
-                    # 타임아웃 체크만 수행
-                    event_type, breakdown = check_timeout(self._signals)
-                    
-                    if event_type == "max_time_warning":
-                        if breakdown.get("max_time_exceeded"):
-                            logger.info(f"🔴 [타임아웃] 통화 시간 초과 ({breakdown.get('call_duration_sec', 0)}초) - 종료")
-                        else:
-                            logger.info(f"⚠️ [타임아웃] 통화 시간 임박 - 경고 전송 ({breakdown.get('max_time_warning', '')})")
-                        
-                        await self.results_queue.put({"event": "max_time_warning"})
-                        if breakdown.get("max_time_exceeded"):
-                            return
-            except Exception as e:
-                logger.error(f"❌ 타임아웃 체크 루프 오류: {e}")
-                import traceback
-                logger.error(f"상세 오류: {traceback.format_exc()}")
-
-        self._timeout_task = asyncio.create_task(_timeout_check_loop())
-        logger.info("✅ [타임아웃 체크 태스크 생성 완료]")
+        # ⏱️ 통화 마감 시각을 워커 공용 타이머에 등록 (통화별 주기 루프 없음)
+        self._schedule_timeouts()
 
         logger.info("🎤 RTZR 실시간 스트리밍 시작")
         
@@ -162,28 +210,20 @@ class RTZRRealtimeSTT:
             self.is_active = False
             if rtzr_stream_task and not rtzr_stream_task.done():
                 rtzr_stream_task.cancel()
-            if self._timeout_task:
-                try:
-                    self._timeout_task.cancel()
-                except Exception:
-                    pass
+            self._cancel_timeouts()
             logger.info("🛑 RTZR 실시간 스트리밍 종료")
     
     async def _consume_rtzr_stream(self):
         """RTZR STT 결과를 소비해서 results_queue에 넣기"""
         try:
             async for result in self.rtzr_service.transcribe_streaming(self.audio_queue):
-                # ✅ AI 응답 중이면 사용자 입력 무시
+                # ✅ AI 응답 중이면 사용자 입력 무시 (게이트가 닫히기 전에 보낸 오디오의 늦은 결과)
                 if self.is_bot_speaking:
                     continue
                 
-                # ✅ AI 응답 종료 후 1초 대기 중이면 무시
-                if self.bot_silence_delay > 0:
-                    self.bot_silence_delay -= 1
-                    continue
-                
                 if result and 'text' in result and result['text']:
                     text = result['text']
+                    self._last_activity_time = time.time()
                     is_final = result.get('is_final', False)
                     
                     if is_final:
@@ -236,29 +276,57 @@ class RTZRRealtimeSTT:
         except Exception as e:
             logger.error(f"❌ RTZR 스트림 소비 오류: {e}")
     
+    def _queue_audio(self, pcm_data: Optional[bytes]):
+        """STT 대기열에 넣기 (가득 차면 가장 오래된 항목을 버림 - 수신 경로는 기다리지 않음)"""
+        try:
+            self.audio_queue.put_nowait(pcm_data)
+        except asyncio.QueueFull:
+            self.audio_queue.get_nowait()
+            self.audio_queue.put_nowait(pcm_data)
+            self.dropped_audio_batches += 1
+            if self.dropped_audio_batches % 50 == 1:
+                logger.warning(f"⚠️ STT 전송 지연 → 오래된 오디오 버림 (누적 {self.dropped_audio_batches}개)")
+    
+    def _flush_audio_batch(self):
+        """배치에 남은 프레임 전송"""
+        pcm_data = self.audio_batcher.flush()
+        if pcm_data and self.is_active and self.audio_queue:
+            self._queue_audio(pcm_data)
+    
     async def add_audio_chunk(self, audio_data: bytes):
         """
         오디오 청크 추가 (Twilio에서 수신한 mulaw 데이터)
         
+        STT_AUDIO_BATCH_MS 분량이 모일 때마다 PCM으로 변환해 전송
+        
         Args:
             audio_data: mulaw 포맷 오디오 (Twilio 8kHz)
         """
         if self.is_active and self.audio_queue:
             try:
-                # mulaw → PCM 변환 (RTZR 요구사항)
-                import audioop
-                pcm_data = audioop.ulaw2lin(audio_data, 2)  # 16-bit PCM으로 변환
-                
-                # PCM 데이터 전송
-                await self.audio_queue.put(pcm_data)
+                # mulaw → PCM 변환 (RTZR 요구사항, 배치 단위)
+                for pcm_data in self.audio_batcher.push(audio_data):
+                    self._queue_audio(pcm_data)
                 
             except Exception as e:
                 logger.error(f"❌ 오디오 청크 추가 오류: {e}")
     
+    async def add_inbound_audio(self, audio_data: bytes, timestamp_ms=None):
+        """
+        Twilio 수신 프레임 → 에코 게이트 → RTZR
+        
+        Args:
+            audio_data: mulaw 프레임 (Twilio 8kHz)
+            timestamp_ms: Twilio media.timestamp (통화 시작 기준 ms)
+        """
+        for frame in self.echo_gate.feed(audio_data, timestamp_ms):
+            await self.add_audio_chunk(frame)
+    
     async def end_streaming(self):
         """스트리밍 종료"""
         if self.audio_queue:
-            await self.audio_queue.put(None)  # EOS 신호
+            self._flush_audio_batch()
+            self._queue_audio(None)  # EOS 신호
         self.is_active = False
 
     # # ===== 종료 판단 신호 업데이트용 헬퍼 =====
@@ -289,7 +357,7 @@ class LLMPartialCollector:
             llm_callback: 부분 결과를 받아 처리하는 콜백 함수
         """
         self.llm_callback = llm_callback
-        self.partial_texts = []
+        self.partial_texts = deque(maxlen=PARTIAL_TEXT_HISTORY)  # 최근 부분 결과만 보관
         self.last_partial_time = time.time()
         self.is_collecting = False
         
@@ -325,7 +393,7 @@ class LLMPartialCollector:
         final_text = self.partial_texts[-1]
         
         # 초기화
-        self.partial_texts = []
+        self.partial_texts.clear()
         self.is_collecting = False
         logger.debug(f"✅ [최종 발화] {final_text}")
         
@@ -333,6 +401,6 @@ class LLMPartialCollector:
     
     def reset(self):
         """수집기 초기화"""
-        self.partial_texts = []
+        self.partial_texts.clear()
         self.is_collecting = False
         logger.debug("🔄 LLM 수집기 초기화")
@@ -7,13 +7,21 @@ import asyncio
 import json
 import logging
 import time
-from typing import AsyncGenerator, Optional
+from collections import deque
+from typing import AsyncGenerator, Optional, Tuple
 import websockets
-import requests
 from app.config import settings
+from app.utils.http_pool import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# 부분 인식 결과 보관 개수 (최신 결과만 사용하므로 긴 발화에서도 메모리 고정)
+PARTIAL_TEXT_HISTORY = 8
+
+# 인증 토큰 재발급 여유 (만료 10분 전부터 새로 발급) / 응답에 만료 시각이 없을 때 기본 유효 시간
+TOKEN_REFRESH_MARGIN_SECONDS = 600
+TOKEN_DEFAULT_TTL_SECONDS = 3600
+
 
 class RTZRSTTService:
     """
@@ -26,6 +34,9 @@ class RTZRSTTService:
     - 높은 정확도 한국어 음성 인식
     """
     
+    # (토큰, 만료 epoch 초) - 통화마다 인증 왕복을 반복하지 않도록 프로세스 공용
+    _token: Optional[Tuple[str, float]] = None
+    
     def __init__(self):
         self.client_id = settings.RTZR_CLIENT_ID
         self.client_secret = settings.RTZR_CLIENT_SECRET
@@ -37,15 +48,22 @@ class RTZRSTTService:
         
         logger.info("✅ RTZR STT 서비스 초기화 완료")
     
-    async def get_access_token(self) -> str:
+    async def get_access_token(self, force_refresh: bool = False) -> str:
         """
-        RTZR 인증 토큰 발급
+        RTZR 인증 토큰 발급 (프로세스 공용 캐시, 만료 TOKEN_REFRESH_MARGIN_SECONDS 전까지 재사용)
+        
+        Args:
+            force_refresh: 캐시를 무시하고 새로 발급
         
         Returns:
             str: Access token
         """
+        cached = RTZRSTTService._token
+        if not force_refresh and cached and cached[1] - TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+            return cached[0]
+        
         try:
-            response = requests.post(
+            response = await get_http_client().post(
                 f"https://{self.api_host}/v1/authenticate",
                 data={
                     "client_id": self.client_id,
@@ -59,6 +77,7 @@ class RTZRSTTService:
             
             result = response.json()
             token = result["access_token"]
+            RTZRSTTService._token = (token, float(result.get("expire_at") or time.time() + TOKEN_DEFAULT_TTL_SECONDS))
             logger.info("✅ RTZR 인증 토큰 발급 완료")
             return token
             
@@ -189,8 +208,12 @@ class RTZRSTTService:
                 except Exception as e:
                     logger.error(f"❌ 스트리밍 루프 오류: {e}")
                 finally:
-                    # 오디오 전송 태스크 종료
-                    await audio_queue.put(None)
+                    # 오디오 전송 태스크 종료 (대기열이 가득 차 있어도 막히지 않도록)
+                    try:
+                        audio_queue.put_nowait(None)
+                    except asyncio.QueueFull:
+                        audio_queue.get_nowait()
+                        audio_queue.put_nowait(None)
                     
                     # 태스크 완료 대기
                     try:
@@ -218,7 +241,7 @@ class PartialResultBuffer:
     """
     
     def __init__(self):
-        self.partial_texts = []  # 부분 인식 결과 리스트
+        self.partial_texts = deque(maxlen=PARTIAL_TEXT_HISTORY)  # 최근 부분 인식 결과 (오래된 것은 밀려남)
         self.current_text = ""   # 현재 인식 중인 텍스트
         self.is_final = False    # 최종 결과 여부
         
@@ -257,7 +280,7 @@ class PartialResultBuffer:
     
     def reset(self):
         """버퍼 초기화"""
-        self.partial_texts = []
+        self.partial_texts.clear()
         self.current_text = ""
         self.is_final = False
         logger.debug("🔄 버퍼 초기화")
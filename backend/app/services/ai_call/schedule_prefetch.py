@@ -0,0 +1,132 @@
+"""
+오늘 일정 미리 가져오기 (통화 발신 시점)
+- 발신 직후(initiate_realtime_call / check_and_make_calls) 어르신의 오늘 미완료 TODO를 조회해
+  LLM 프롬프트 형식({"task", "time"})으로 변환
+- Redis `call:{call_sid}:schedule` 키에 저장 → WebSocket 시작 시 1회 조회 후 통화 동안 메모리에서 사용
+- 통화 중 이벤트 루프에서 Postgres를 조회하지 않음
+"""
+
+import json
+import logging
+from datetime import time as dt_time
+from typing import Dict, List, Optional
+
+from app.models.todo import Todo, TodoStatus
+from app.utils.datetime_utils import kst_now
+from app.utils.redis_client import get_redis, reset_redis
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_KEY = "call:{call_sid}:schedule"
+
+# 발신 → 통화 연결까지 여유 (벨 울림 + 통화 시간)
+SCHEDULE_TTL_SECONDS = 2 * 3600
+
+# 프롬프트에 넣을 최대 일정 수 (LLMService는 앞에서 2개만 사용)
+MAX_SCHEDULE_ITEMS = 5
+
+
+def _schedule_key(call_sid: str) -> str:
+    return SCHEDULE_KEY.format(call_sid=call_sid)
+
+
+def format_korean_time(value: Optional[dt_time]) -> str:
+    """datetime.time → "오전 10시" / "오후 2시 30분" (없으면 빈 문자열)"""
+    if value is None:
+        return ""
+    period = "오전" if value.hour < 12 else "오후"
+    hour = value.hour % 12 or 12
+    if value.minute:
+        return f"{period} {hour}시 {value.minute}분"
+    return f"{period} {hour}시"
+
+
+def build_today_schedule(db, elderly_id: str) -> List[Dict[str, str]]:
+    """
+    어르신의 오늘 미완료 TODO → 프롬프트 형식 일정 목록
+
+    아직 지나지 않은 일정을 시간순으로 먼저, 시간이 지났거나 시간 미지정 일정은 뒤에 배치
+
+    Returns:
+        [{"task": "병원 검진", "time": "오전 10시"}, ...]
+    """
+    now = kst_now()
+    todos = (
+        db.query(Todo.title, Todo.due_time)
+        .filter(
+            Todo.elderly_id == elderly_id,
+            Todo.due_date == now.date(),
+            Todo.status == TodoStatus.PENDING,
+        )
+        .all()
+    )
+
+    current = now.time().replace(tzinfo=None)
+
+    def sort_key(row):
+        due_time = row[1]
+        if due_time is None:
+            return (2, dt_time.max)
+        return (0 if due_time >= current else 1, due_time)
+
+    return [
+        {"task": title, "time": format_korean_time(due_time)}
+        for title, due_time in sorted(todos, key=sort_key)[:MAX_SCHEDULE_ITEMS]
+    ]
+
+
+def cache_today_schedule(call_sid: str, schedule: List[Dict[str, str]]) -> bool:
+    """통화 SID 기준으로 일정 저장 (빈 목록도 저장 → 시작 시 '일정 없음'으로 확정)"""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        client.set(
+            _schedule_key(call_sid),
+            json.dumps(schedule, ensure_ascii=False, separators=(",", ":")),
+            ex=SCHEDULE_TTL_SECONDS,
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ 오늘 일정 캐시 저장 실패 ({call_sid}): {e}")
+        reset_redis(client)
+        return False
+
+
+def prefetch_today_schedule(db, call_sid: str, elderly_id: str) -> Optional[List[Dict[str, str]]]:
+    """
+    발신 직후 호출 - 오늘 일정 조회 후 캐시 (실패해도 통화 발신에는 영향 없음)
+
+    Returns:
+        일정 목록 (실패 시 None)
+    """
+    try:
+        schedule = build_today_schedule(db, elderly_id)
+    except Exception as e:
+        logger.warning(f"⚠️ 오늘 일정 조회 실패 (계속 진행): {elderly_id} - {e}")
+        db.rollback()
+        return None
+
+    if cache_today_schedule(call_sid, schedule):
+        logger.info(f"📅 오늘 일정 {len(schedule)}개 미리 저장: {call_sid}")
+    return schedule
+
+
+def load_today_schedule(call_sid: str) -> Optional[List[Dict[str, str]]]:
+    """WebSocket 시작 시 1회 조회 (Redis GET 1회, 없거나 실패 시 None)"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_schedule_key(call_sid))
+    except Exception as e:
+        logger.warning(f"⚠️ 오늘 일정 캐시 조회 실패 ({call_sid}): {e}")
+        reset_redis(client)
+        return None
+    if not raw:
+        return None
+    try:
+        schedule = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    return schedule if isinstance(schedule, list) else None
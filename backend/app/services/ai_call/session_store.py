@@ -10,7 +10,8 @@ Stored items per call_sid:
 
 import json
 import logging
-from typing import List, Dict, Optional
+from collections import deque
+from typing import Deque, List, Dict, Optional
 
 from app.config import settings
 
@@ -49,7 +50,7 @@ class BaseSessionStore:
 
 class MemorySessionStore(BaseSessionStore):
     def __init__(self):
-        self._conversations: Dict[str, List[Dict[str, str]]] = {}
+        self._conversations: Dict[str, Deque[Dict[str, str]]] = {}
         self._saved_flags: set[str] = set()
         self._finalized_flags: set[str] = set()
         self._locks: set[str] = set()
@@ -58,11 +59,9 @@ class MemorySessionStore(BaseSessionStore):
         if not call_sid:
             return
         if call_sid not in self._conversations:
-            self._conversations[call_sid] = []
+            # Bounded ring buffer: keeps the last 20 messages (matches Redis LTRIM)
+            self._conversations[call_sid] = deque(maxlen=20)
         self._conversations[call_sid].append({"role": role, "content": content})
-        # Trim to last 20 to prevent unbounded growth (matches existing behavior)
-        if len(self._conversations[call_sid]) > 20:
-            self._conversations[call_sid] = self._conversations[call_sid][-20:]
 
     def get_conversation(self, call_sid: str) -> List[Dict[str, str]]:
         return list(self._conversations.get(call_sid, []))
@@ -11,12 +11,42 @@ import wave
 import io
 import audioop
 
+from typing import AsyncIterator
+
 from fastapi import WebSocket
+from app.config import settings
 from app.services.ai_call.llm_service import LLMService
-from app.core.state import active_tts_completions
+from app.services.ai_call.audio_stream import StreamingWavDecoder, MulawStreamEncoder
+from app.services.ai_call.tts_engine import TTSEngine
+from app.core.state import active_tts_completions, active_recorders, active_senders
 
 logger = logging.getLogger(__name__)
 
+# 스트리밍 전송 시 한 번에 보내는 최소 μ-law 바이트 (8kHz 기준 200ms)
+STREAM_SEND_MIN_BYTES = 1600
+
+
+async def send_media_to_twilio(websocket: WebSocket, stream_sid: str, mulaw: bytes):
+    """
+    μ-law 오디오 1개 메시지 전송
+
+    통화별 송신기(OutboundSender)가 등록되어 있으면 그 대기열로 넘기고 (순서 보장 + backpressure),
+    없으면 (송신기 생성 전 / 단독 사용) 소켓에 직접 전송
+    """
+    sender = active_senders.get(stream_sid)
+    if sender is not None:
+        await sender.send_media(mulaw)
+        return
+
+    await websocket.send_text(json.dumps({
+        "event": "media",
+        "streamSid": stream_sid,
+        "media": {"payload": base64.b64encode(mulaw).decode('utf-8')}
+    }))
+    recorder = active_recorders.get(stream_sid)
+    if recorder:
+        recorder.add_outbound(mulaw)
+
 
 async def process_streaming_response(
     websocket: WebSocket,
@@ -27,7 +57,11 @@ async def process_streaming_response(
     call_sid=None,
     metrics_collector=None,
     turn_index=None,
-    tts_service=None  # 각 통화마다 독립적인 TTS 서비스 인스턴스
+    tts_service=None,  # 각 통화마다 독립적인 TTS 서비스 인스턴스
+    today_schedule=None,  # 발신 시 미리 조회한 오늘 일정 (schedule_prefetch)
+    emotion_context=None,  # 이전 턴까지의 감정 분석 결과 (TurnAnalyzer)
+    contextual_info=None,  # 이전 턴까지 누적된 맥락 정보 (TurnAnalyzer)
+    on_first_audio=None  # 응답 첫 오디오 전송 직전 호출 (필러 음성 중단용)
 ) -> str:
     """
     최적화된 스트리밍 응답 처리 - 사전 연결된 WebSocket 사용
@@ -55,7 +89,11 @@ async def process_streaming_response(
             call_sid=call_sid,
             metrics_collector=metrics_collector,
             turn_index=turn_index,
-            tts_service=tts_service  # 독립적인 TTS 서비스 인스턴스 전달
+            tts_service=tts_service,  # 독립적인 TTS 서비스 인스턴스 전달
+            today_schedule=today_schedule,
+            emotion_context=emotion_context,
+            contextual_info=contextual_info,
+            on_first_audio=on_first_audio
         )
         
         pipeline_time = time.time() - pipeline_start
@@ -89,7 +127,11 @@ async def llm_to_clova_tts_pipeline(
     call_sid=None,
     metrics_collector=None,
     turn_index=None,
-    tts_service=None  # 각 통화마다 독립적인 TTS 서비스 인스턴스
+    tts_service=None,  # 각 통화마다 독립적인 TTS 서비스 인스턴스
+    today_schedule=None,
+    emotion_context=None,
+    contextual_info=None,
+    on_first_audio=None
 ) -> float:
     """
     LLM 텍스트 생성 → Naver Clova TTS → Twilio 전송 파이프라인
@@ -102,6 +144,24 @@ async def llm_to_clova_tts_pipeline(
     """
     llm_service = LLMService()
     
+    if tts_service is None:
+        # Fallback: 전역 인스턴스 사용 (하위 호환성)
+        from app.services.ai_call.naver_clova_tts_service import naver_clova_tts_service
+        tts_service = naver_clova_tts_service
+    
+    def record_tts_ready(sentence_index: int):
+        """문장의 첫 오디오가 준비된 시점 기록 (스트리밍 모드: 첫 블록, 일반 모드: 전체 합성 완료)"""
+        tts_completion_time = time.time()
+        logger.info(f"✅ [문장 {sentence_index}] TTS 오디오 준비 (+{tts_completion_time - pipeline_start:.2f}초)")
+        if sentence_index == 1 and on_first_audio:
+            on_first_audio(sentence_index)
+        if metrics_collector is not None and turn_index is not None:
+            # 첫 문장의 TTS 완료 시간 (LLM 첫 토큰부터 첫 TTS 완료까지의 지연시간 계산용)
+            # 나머지 문장들은 완료 시간만 업데이트 (first_completion_time은 기록하지 않음)
+            metrics_collector.record_tts_completion(
+                turn_index, tts_completion_time, is_first_sentence=(sentence_index == 1)
+            )
+    
     try:
         sentence_buffer = ""
         sentence_count = 0
@@ -111,7 +171,13 @@ async def llm_to_clova_tts_pipeline(
         logger.info("🤖 [LLM] Naver Clova TTS 스트리밍 시작")
         
         first_token_time = None
-        async for chunk in llm_service.generate_response_streaming(user_text, conversation_history):
+        async for chunk in llm_service.generate_response_streaming(
+            user_text,
+            conversation_history,
+            today_schedule=today_schedule,
+            emotion_context=emotion_context,
+            contextual_info=contextual_info
+        ):
             # 메트릭 수집: LLM 첫 토큰 시간
             if first_token_time is None and chunk.strip():
                 first_token_time = time.time()
@@ -155,43 +221,18 @@ async def llm_to_clova_tts_pipeline(
                     metrics_collector.record_tts_start(turn_index, tts_start_time)
                     logger.debug(f"📊 [메트릭] TTS 시작 시간 기록: {tts_start_time:.3f}")
                 
-                # ✅ 독립적인 TTS 서비스 인스턴스 사용 (동시 통화 충돌 방지)
-                if tts_service is None:
-                    # Fallback: 전역 인스턴스 사용 (하위 호환성)
-                    from app.services.ai_call.naver_clova_tts_service import naver_clova_tts_service
-                    audio_data, tts_time = await naver_clova_tts_service.text_to_speech_bytes(sentence)
-                else:
-                    audio_data, tts_time = await tts_service.text_to_speech_bytes(sentence)
+                # 문장 TTS → Twilio 전송 (스트리밍 모드면 첫 블록 도착 즉시 전송 시작)
+                playback_duration = await synthesize_and_send_sentence(
+                    tts_service,
+                    websocket,
+                    stream_sid,
+                    sentence,
+                    sentence_count,
+                    pipeline_start,
+                    on_audio_ready=record_tts_ready
+                )
                 
-                if audio_data:
-                    elapsed_tts = time.time() - pipeline_start
-                    logger.info(f"✅ [문장 {sentence_count}] TTS 완료 (+{elapsed_tts:.2f}초, {tts_time:.2f}초)")
-                    
-                    # 메트릭 수집: TTS 완료 시간 기록
-                    tts_completion_time = time.time()
-                    if metrics_collector is not None and turn_index is not None:
-                        # 첫 문장의 TTS 완료 시간 (LLM 첫 토큰부터 첫 TTS 완료까지의 지연시간 계산용)
-                        if sentence_count == 1:
-                            # 첫 문장의 TTS 완료 시간을 정확히 기록
-                            metrics_collector.record_tts_completion(turn_index, tts_completion_time, is_first_sentence=True)
-                            logger.debug(
-                                f"📊 [메트릭] 첫 문장 TTS 완료 시간 기록: {tts_completion_time:.6f} "
-                                f"(LLM 첫 토큰 이후: {turn_index < len(metrics_collector.metrics['turns']) and metrics_collector.metrics['turns'][turn_index]['llm']['first_token_time'] is not None})"
-                            )
-                        else:
-                            # 나머지 문장들은 완료 시간만 업데이트 (first_completion_time은 기록하지 않음)
-                            metrics_collector.record_tts_completion(turn_index, tts_completion_time, is_first_sentence=False)
-                            logger.debug(f"📊 [메트릭] 문장 {sentence_count} TTS 완료 시간 업데이트: {tts_completion_time:.3f}")
-                    
-                    # WAV → mulaw 변환 및 Twilio 전송
-                    playback_duration = await send_clova_audio_to_twilio(
-                        websocket,
-                        stream_sid,
-                        audio_data,
-                        sentence_count,
-                        pipeline_start
-                    )
-                    
+                if playback_duration > 0:
                     total_playback_duration += playback_duration
                 else:
                     logger.warning(f"⚠️ [문장 {sentence_count}] TTS 실패, 건너뜀")
@@ -203,29 +244,17 @@ async def llm_to_clova_tts_pipeline(
             sentence_count += 1
             logger.info(f"🔊 [마지막 문장] TTS 변환 시작: {sentence_buffer.strip()[:40]}...")
             
-            # ✅ 독립적인 TTS 서비스 인스턴스 사용 (동시 통화 충돌 방지)
-            if tts_service is None:
-                # Fallback: 전역 인스턴스 사용 (하위 호환성)
-                from app.services.ai_call.naver_clova_tts_service import naver_clova_tts_service
-                audio_data, tts_time = await naver_clova_tts_service.text_to_speech_bytes(sentence_buffer.strip())
-            else:
-                audio_data, tts_time = await tts_service.text_to_speech_bytes(sentence_buffer.strip())
+            playback_duration = await synthesize_and_send_sentence(
+                tts_service,
+                websocket,
+                stream_sid,
+                sentence_buffer.strip(),
+                sentence_count,
+                pipeline_start,
+                on_audio_ready=record_tts_ready
+            )
             
-            if audio_data:
-                # 마지막 문장의 TTS 완료 시간 기록 (first_completion_time은 기록하지 않음)
-                tts_completion_time = time.time()
-                if metrics_collector is not None and turn_index is not None:
-                    metrics_collector.record_tts_completion(turn_index, tts_completion_time, is_first_sentence=False)
-                    logger.debug(f"📊 [메트릭] 마지막 문장 TTS 완료 시간 업데이트: {tts_completion_time:.3f}")
-                
-                playback_duration = await send_clova_audio_to_twilio(
-                    websocket,
-                    stream_sid,
-                    audio_data,
-                    sentence_count,
-                    pipeline_start
-                )
-
+            if playback_duration > 0:
                 total_playback_duration += playback_duration
             else:
                 logger.warning("⚠️ 마지막 문장 TTS 실패, 건너뜀")
@@ -300,28 +329,20 @@ async def send_clova_audio_to_twilio(
         # 재생 시간 계산
         playback_duration = len(mulaw_data) / 8000.0
         
-        # Base64 인코딩
-        audio_base64 = base64.b64encode(mulaw_data).decode('utf-8')
-        
         # Twilio로 청크 단위 전송
-        chunk_size = 8000  # 8KB 청크
+        chunk_size = 6000  # Base64 8KB 청크
         chunk_count = 0
         
-        for i in range(0, len(audio_base64), chunk_size):
-            chunk = audio_base64[i:i + chunk_size]
+        for i in range(0, len(mulaw_data), chunk_size):
+            chunk = mulaw_data[i:i + chunk_size]
             chunk_count += 1
             
-            message = {
-                "event": "media",
-                "streamSid": stream_sid,
-                "media": {"payload": chunk}}
-            
             try:
-                await websocket.send_text(json.dumps(message))
+                await send_media_to_twilio(websocket, stream_sid, chunk)
                 logger.debug(f"📤 [문장 {sentence_index}] 청크 {chunk_count} 전송 완료 ({len(chunk)} bytes)")
                 
                 # 마지막 청크가 아니면 짧은 딜레이
-                if i + chunk_size < len(audio_base64):
+                if i + chunk_size < len(mulaw_data):
                     await asyncio.sleep(0.02)  # 20ms
                     
             except Exception as e:
@@ -343,3 +364,194 @@ async def send_clova_audio_to_twilio(
         logger.error(traceback.format_exc())
         return 0.0
 
+
+
+async def synthesize_and_send_sentence(
+    tts_service,
+    websocket: WebSocket,
+    stream_sid: str,
+    sentence: str,
+    sentence_index: int,
+    pipeline_start: float,
+    on_audio_ready=None
+) -> float:
+    """
+    문장 하나를 합성하여 Twilio로 전송
+    
+    - TTSEngine: 제공자 라우팅/헤징 후 정규화된 μ-law 블록을 도착하는 대로 전송
+    - NAVER_CLOVA_TTS_STREAMING=True: 응답을 받는 대로 디코딩해 첫 블록부터 전송
+    - False: 전체 WAV 수신 후 변환/전송 (기존 방식)
+    
+    Args:
+        tts_service: TTSEngine 또는 NaverClovaTTSService 인스턴스
+        on_audio_ready: 첫 오디오가 준비된 시점에 호출 (sentence_index 전달)
+    
+    Returns:
+        float: 전송한 오디오 재생 시간 (실패 시 0)
+    """
+    if isinstance(tts_service, TTSEngine):
+        return await send_mulaw_stream_to_twilio(
+            websocket,
+            stream_sid,
+            tts_service.stream_mulaw(sentence),
+            sentence_index,
+            pipeline_start,
+            on_first_audio=on_audio_ready
+        )
+    
+    if settings.NAVER_CLOVA_TTS_STREAMING:
+        return await stream_clova_audio_to_twilio(
+            websocket,
+            stream_sid,
+            tts_service.stream_speech(sentence),
+            sentence_index,
+            pipeline_start,
+            on_first_audio=on_audio_ready
+        )
+    
+    audio_data, tts_time = await tts_service.text_to_speech_bytes(sentence)
+    if not audio_data:
+        return 0.0
+    
+    if on_audio_ready:
+        on_audio_ready(sentence_index)
+    
+    return await send_clova_audio_to_twilio(
+        websocket,
+        stream_sid,
+        audio_data,
+        sentence_index,
+        pipeline_start
+    )
+
+
+async def stream_clova_audio_to_twilio(
+    websocket: WebSocket,
+    stream_sid: str,
+    wav_chunks: AsyncIterator[bytes],
+    sentence_index: int,
+    pipeline_start: float,
+    on_first_audio=None
+) -> float:
+    """
+    스트리밍 WAV 응답을 점진적으로 디코딩하여 Twilio로 전송
+    
+    헤더가 도착하면 바로 PCM 블록을 8kHz μ-law로 변환하여 send_mulaw_stream_to_twilio로 전달
+    
+    Args:
+        websocket: Twilio WebSocket
+        stream_sid: Twilio Stream SID
+        wav_chunks: WAV 바이트 스트림 (NaverClovaTTSService.stream_speech)
+        sentence_index: 문장 번호
+        pipeline_start: 파이프라인 시작 시간
+        on_first_audio: 첫 오디오 전송 직전 호출 (sentence_index 전달)
+    
+    Returns:
+        float: 전송한 오디오 재생 시간
+    """
+    async def mulaw_chunks():
+        decoder = StreamingWavDecoder()
+        encoder = None
+        async for chunk in wav_chunks:
+            pcm = decoder.feed(chunk)
+            if not pcm:
+                continue
+            if encoder is None:
+                logger.info(f"🎵 [문장 {sentence_index}] 원본: {decoder.framerate}Hz, {decoder.channels}ch (스트리밍)")
+                encoder = MulawStreamEncoder(decoder.framerate, decoder.sample_width, decoder.channels)
+            yield encoder.encode(pcm)
+    
+    return await send_mulaw_stream_to_twilio(
+        websocket,
+        stream_sid,
+        mulaw_chunks(),
+        sentence_index,
+        pipeline_start,
+        on_first_audio=on_first_audio
+    )
+
+
+async def send_mulaw_stream_to_twilio(
+    websocket: WebSocket,
+    stream_sid: str,
+    mulaw_chunks: AsyncIterator[bytes],
+    sentence_index: int,
+    pipeline_start: float,
+    on_first_audio=None
+) -> float:
+    """
+    8kHz μ-law 블록 스트림을 Twilio로 전송
+    
+    STREAM_SEND_MIN_BYTES 이상 모일 때마다 나머지 합성/다운로드와 병행해 전송
+    
+    Args:
+        websocket: Twilio WebSocket
+        stream_sid: Twilio Stream SID
+        mulaw_chunks: 8kHz mono μ-law 바이트 스트림
+        sentence_index: 문장 번호
+        pipeline_start: 파이프라인 시작 시간
+        on_first_audio: 첫 오디오 전송 직전 호출 (sentence_index 전달)
+    
+    Returns:
+        float: 전송한 오디오 재생 시간
+    """
+    pending = bytearray()
+    sent_bytes = 0
+    message_count = 0
+    
+    async def flush():
+        nonlocal sent_bytes, message_count
+        if not pending:
+            return
+        if message_count == 0 and on_first_audio:
+            on_first_audio(sentence_index)
+        await send_media_to_twilio(websocket, stream_sid, bytes(pending))
+        sent_bytes += len(pending)
+        message_count += 1
+        pending.clear()
+    
+    try:
+        async for chunk in mulaw_chunks:
+            pending += chunk
+            if len(pending) >= STREAM_SEND_MIN_BYTES:
+                await flush()
+        
+        await flush()
+        
+    except Exception as e:
+        logger.error(f"❌ [문장 {sentence_index}] 스트리밍 전송 오류: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+    
+    playback_duration = sent_bytes / 8000.0
+    elapsed = time.time() - pipeline_start
+    logger.debug(f"📤 [문장 {sentence_index}] Twilio 스트리밍 전송 완료 ({message_count}개 메시지, {playback_duration:.2f}초 분량, +{elapsed:.2f}초)")
+    return playback_duration
+
+
+async def send_mulaw_audio_to_twilio(
+    websocket: WebSocket,
+    stream_sid: str,
+    mulaw_audio: bytes,
+    sentence_index: int,
+    pipeline_start: float,
+    on_first_audio=None
+) -> float:
+    """
+    미리 합성된 8kHz μ-law 오디오를 Twilio로 전송 (템플릿 응답 캐시 등)
+    
+    Returns:
+        float: 전송한 오디오 재생 시간
+    """
+    async def mulaw_chunks():
+        for i in range(0, len(mulaw_audio), STREAM_SEND_MIN_BYTES):
+            yield mulaw_audio[i:i + STREAM_SEND_MIN_BYTES]
+    
+    return await send_mulaw_stream_to_twilio(
+        websocket,
+        stream_sid,
+        mulaw_chunks(),
+        sentence_index,
+        pipeline_start,
+        on_first_audio=on_first_audio
+    )
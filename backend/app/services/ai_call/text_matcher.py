@@ -0,0 +1,248 @@
+"""
+발화/응답 키워드 분류기 (사전 컴파일)
+- 부분 문자열 키워드: Aho-Corasick 오토마톤 1회 순회로 모든 라벨 수집
+- 정규식 규칙: 규칙 목록을 이름 있는 그룹의 단일 정규식으로 합쳐 1회 검색
+- 모듈 로드 시 한 번만 구축하고, LLMService 후처리 / 단답형 감지 / 공감 응답 / end_decision이 공유
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+
+class AhoCorasick:
+    """
+    다중 키워드 부분 문자열 매칭 (라벨 단위)
+
+    Args:
+        keyword_groups: {라벨: [키워드, ...]}
+    """
+
+    def __init__(self, keyword_groups: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[str]] = [frozenset()]
+
+        outputs: List[set] = [set()]
+        for label, keywords in keyword_groups.items():
+            for keyword in keywords:
+                state = 0
+                for ch in keyword:
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append(set())
+                    state = nxt
+                outputs[state].add(label)
+
+        # BFS로 실패 링크 구성 (실패 상태의 출력도 합쳐 둠)
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+
+        self._output = [frozenset(o) for o in outputs]
+
+    def labels(self, text: str) -> FrozenSet[str]:
+        """text에 등장하는 키워드의 라벨 집합"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found |= output[state]
+        return frozenset(found)
+
+
+class RegexSet:
+    """
+    정규식 규칙 묶음을 하나의 정규식으로 컴파일
+
+    search()는 가장 앞에서 일치한 규칙 이름을 반환 (어느 규칙이든 일치 여부는 규칙별 검색과 동일)
+
+    Args:
+        rules: [(규칙 이름, 패턴), ...]
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, str]], flags: int = 0):
+        self._names: Dict[str, str] = {}
+        parts = []
+        for i, (name, pattern) in enumerate(rules):
+            group = f"r{i}"
+            self._names[group] = name
+            parts.append(f"(?P<{group}>{pattern})")
+        self._regex = re.compile("|".join(parts), flags) if parts else None
+
+    def _name(self, match: Optional[re.Match]) -> Optional[str]:
+        if match is None:
+            return None
+        return self._names[match.lastgroup]
+
+    def search(self, text: str) -> Optional[str]:
+        if self._regex is None:
+            return None
+        return self._name(self._regex.search(text))
+
+    def match(self, text: str) -> Optional[str]:
+        if self._regex is None:
+            return None
+        return self._name(self._regex.match(text))
+
+
+# ==================== 키워드 사전 ====================
+
+MEAL_KEYWORDS = ("저녁", "점심", "아침", "식사", "밥", "먹")
+
+# 사용자 발화 키워드 (라벨 → 부분 문자열)
+USER_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "greeting": ("안녕", "반갑", "반가워"),
+    "pain": ("아프", "힘들", "고통", "통증"),
+    "lonely": ("외롭", "쓸쓸", "혼자", "아무도"),
+    "sad": ("슬프", "우울", "속상", "걱정"),
+    "family": ("자식", "아들", "딸", "손주"),
+    "joy": ("기쁨", "좋아", "즐거", "행복"),
+    "meal": MEAL_KEYWORDS,
+}
+
+# AI 응답 키워드
+RESPONSE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "meal": MEAL_KEYWORDS + ("드실", "드셨"),
+    "jondaemal": ("세요", "셔요", "습니다", "네요", "어요", "죠"),
+}
+
+# 단답형 패턴 (문장 전체 기준)
+SHORT_RESPONSE_RULES = [
+    ("short", r"^(네|응|그래|맞아|아니|아니야|아직|모르겠|괜찮아|괜찮|좋아|싫어)$"),
+    ("short_polite", r"^(네|응|그래|맞아|아니|아직).*[요네]$"),  # "네요", "아직 안 했어요" 등
+    ("no", r"^(아니오|아니요|아니예요)$"),
+    ("dont_know", r"^(모르겠|모르겠어|모르겠네|모르겠다)$"),
+]
+
+# AI 응답 금지 패턴 (규칙 이름 = 로그용 사유)
+BANNED_RESPONSE_RULES = [
+    # AI 봇처럼 들리는 표현 (최우선 차단)
+    ("금지: AI 봇 표현", r"도와드릴"),
+    ("금지: AI 봇 표현", r"필요하시면.*말씀"),
+    ("금지: AI 봇 표현", r"알려드릴"),
+    ("금지: AI 봇 표현", r"확인해.*드리"),
+    ("금지: AI 봇 표현", r"해드릴.*수"),
+    ("금지: AI 봇 표현", r"할.*수.*있습니다"),
+    ("금지: AI 봇 표현", r"통화.*종료|전화.*끊겠"),
+
+    # 대화 끝내려는 시도 (강화: AI가 먼저 통화를 끊으려는 모든 표현 차단)
+    ("금지: 대화 끝내기", r"(그럼|그러면|이제|나중에|다음에|다음번에)\s*(끊|통화\s*종료|전화\s*끊|헤어지|그만|끊을|끊고)"),
+    ("금지: 대화 끝내기", r"(그럼|그러면|이제|나중에|다음에)\s*(다시|또)\s*(연락|전화|통화)"),
+    ("금지: 대화 끝내기 (어르신이 직접 말하지 않는 한)", r"(안녕히|잘\s*가|다음에\s*봐)"),
+
+    # 금융/개인정보
+    ("금지: 금융정보", r"(계좌|비밀번호|카드|돈|금융|송금|이체)"),
+    ("금지: 개인정보", r"(주민등록|주소|전화번호|개인정보)"),
+
+    # 진단/강요
+    ("금지: 의료 강요", r"(병원\s*가|진료\s*받|검사\s*받|의사\s*만나).*세요"),
+    ("금지: 강요", r"(해야\s*해|하셔야|반드시|꼭\s*해)"),
+
+    # 무거운 조언
+    ("금지: 무거운 조언", r"(계획|목표|운동|다이어트).*세요"),
+
+    # 금지 키워드: 추상적 질문 (대화 품질 저하)
+    ("금지: 추상적 질문", r"어떤.*물어보"),
+    ("금지: 추상적 질문", r"무슨.*궁금"),
+    ("금지: 추상적 질문", r"어떤 기분인지"),
+    ("금지: 추상적 질문", r"어떻게.*되셨는지"),
+    ("금지: 원인 추궁", r"왜.*그런지"),
+    ("금지: 시간 추궁", r"언제.*되셨는지"),
+    ("금지: 추상적 질문", r"어떤.*보고.*신가요"),
+    ("금지: 추상적 질문", r"어떤.*프로그램.*봐"),
+
+    # 같은 주제 반복 추궁 금지 (저녁, 식사 등)
+    ("금지: 같은 주제 반복 추궁", r"(저녁|점심|아침|식사|밥).*(저녁|점심|아침|식사|밥)"),
+
+    # 사용자 거부/관심 없음 표시 후 같은 주제 계속 추궁 금지
+    ("금지: 식사 계획 추궁", r"뭘\s*드실\s*(계획|할|거예요|거야)"),
+    ("금지: 식사 준비 강요", r"준비.*하세요"),
+
+    # 3인칭 사용 금지 (자기 자신을 "하루는", "하루가" 등으로 지칭)
+    ("금지: 3인칭 사용 (\"하루는\" 대신 \"저는\" 사용)", r"하루는"),
+    ("금지: 3인칭 사용 (\"하루가\" 대신 \"제가\" 사용)", r"하루가"),
+    ("금지: 3인칭 사용 (\"하루도\" 대신 \"저도\" 사용)", r"하루도"),
+]
+
+_user_automaton = AhoCorasick(USER_KEYWORDS)
+_response_automaton = AhoCorasick(RESPONSE_KEYWORDS)
+_short_response_rules = RegexSet(SHORT_RESPONSE_RULES, re.IGNORECASE)
+_banned_response_rules = RegexSet(BANNED_RESPONSE_RULES, re.IGNORECASE)
+
+# 응답 문장 분리 (구두점 유지)
+SENTENCE_SPLIT_PATTERN = re.compile(r'([.!?])\s*')
+
+
+@dataclass(frozen=True)
+class UtteranceFeatures:
+    """사용자 발화 분류 결과"""
+    labels: FrozenSet[str]
+    is_short: bool
+
+
+@dataclass(frozen=True)
+class ResponseFeatures:
+    """AI 응답 분류 결과"""
+    labels: FrozenSet[str]
+    banned_reason: Optional[str]
+
+
+def classify_utterance(text: str) -> UtteranceFeatures:
+    """
+    사용자 발화 1회 분류 (키워드 라벨 + 단답형 여부)
+
+    단답형: 인사말이 없고, 5자 이하이거나 단답형 패턴에 일치
+    """
+    text = text or ""
+    labels = _user_automaton.labels(text)
+    if "greeting" in labels:
+        is_short = False
+    else:
+        normalized = text.strip()
+        is_short = len(normalized) <= 5 or _short_response_rules.match(normalized) is not None
+    return UtteranceFeatures(labels=labels, is_short=is_short)
+
+
+def classify_response(text: str) -> ResponseFeatures:
+    """AI 응답 1회 분류 (키워드 라벨 + 금지 패턴 사유)"""
+    text = text or ""
+    return ResponseFeatures(
+        labels=_response_automaton.labels(text),
+        banned_reason=_banned_response_rules.search(text),
+    )
+
+
+def has_user_label(text: str, label: str) -> bool:
+    """사용자 발화 키워드 라벨 포함 여부 (대화 기록 주제 확인 등)"""
+    return label in _user_automaton.labels(text or "")
+
+
+def response_labels(text: str) -> FrozenSet[str]:
+    """AI 응답 키워드 라벨만 (금지 패턴 검사 없이)"""
+    return _response_automaton.labels(text or "")
+
+
+def compile_pattern_set(patterns: Sequence[str], flags: int = re.IGNORECASE) -> RegexSet:
+    """임의 패턴 목록 → RegexSet (이름은 원래 패턴)"""
+    return RegexSet([(p, p) for p in patterns], flags)
@@ -0,0 +1,474 @@
+"""
+다중 제공자 TTS 엔진 (지연시간 기반 라우팅)
+- 제공자: Naver Clova / OpenAI TTS / Cartesia
+- 출력 정규화: 모든 제공자의 출력을 8kHz mono μ-law(Twilio 형식) 블록으로 변환
+- 제공자별 첫 오디오 지연시간 DDSketch 추적 (최근 구간 기준)
+- 헤징: 주 제공자가 자신의 p90 안에 첫 오디오를 못 주면 예비 제공자를 동시에 요청, 먼저 도착한 쪽 사용
+  (통화의 첫 문장에서만 - 이후 문장은 첫 문장에 쓴 제공자로 고정해 통화 중 목소리가 바뀌지 않음)
+- 서킷 브레이커: 연속 실패 시 일정 시간 제외 후 한 번 시험 요청(half-open)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.services.ai_call.audio_stream import StreamingWavDecoder, MulawStreamEncoder
+from app.utils.http_pool import get_http_client
+from app.utils.latency_sketch import RollingDDSketch
+
+logger = logging.getLogger(__name__)
+
+# 최근 지연시간만 반영하도록 스케치를 이 주기로 교체 (현재 + 직전 구간 병합)
+LATENCY_WINDOW_SECONDS = 300
+
+# 헤징 대기 시간 범위 (너무 빠른 중복 요청 / 너무 늦은 헤징 방지)
+HEDGE_DELAY_MIN_SECONDS = 0.15
+HEDGE_DELAY_MAX_SECONDS = 3.0
+
+OPENAI_SPEECH_URL = "https://api.openai.com/v1/audio/speech"
+OPENAI_PCM_SAMPLE_RATE = 24000  # response_format=pcm: 24kHz 16bit mono LE
+CARTESIA_TTS_URL = "https://api.cartesia.ai/tts/bytes"
+CARTESIA_API_VERSION = "2025-04-16"
+
+
+# ==================== 출력 정규화 ====================
+
+class WavMulawNormalizer:
+    """WAV 스트림 → 8kHz μ-law"""
+
+    def __init__(self):
+        self._decoder = StreamingWavDecoder()
+        self._encoder: Optional[MulawStreamEncoder] = None
+
+    def feed(self, data: bytes) -> bytes:
+        pcm = self._decoder.feed(data)
+        if not pcm:
+            return b""
+        if self._encoder is None:
+            self._encoder = MulawStreamEncoder(
+                self._decoder.framerate, self._decoder.sample_width, self._decoder.channels
+            )
+        return self._encoder.encode(pcm)
+
+
+class PcmMulawNormalizer:
+    """헤더 없는 PCM 스트림 → 8kHz μ-law (샘플 경계에 걸친 바이트는 다음 조각으로 이월)"""
+
+    def __init__(self, framerate: int, sample_width: int = 2, channels: int = 1):
+        self._frame_bytes = sample_width * channels
+        self._remainder = b""
+        self._encoder = MulawStreamEncoder(framerate, sample_width, channels)
+
+    def feed(self, data: bytes) -> bytes:
+        data = self._remainder + data
+        usable = len(data) - len(data) % self._frame_bytes
+        self._remainder = data[usable:]
+        return self._encoder.encode(data[:usable])
+
+
+class MulawPassthroughNormalizer:
+    """이미 8kHz μ-law인 출력 (변환 없음)"""
+
+    def feed(self, data: bytes) -> bytes:
+        return data
+
+
+# ==================== 제공자 상태 (지연시간 / 서킷) ====================
+
+class ProviderHealth:
+    """제공자별 첫 오디오 지연시간 스케치와 서킷 브레이커 상태 (프로세스 내 모든 통화가 공유)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.first_audio_latency = RollingDDSketch(
+            window_seconds=LATENCY_WINDOW_SECONDS,
+            relative_accuracy=settings.LATENCY_SKETCH_RELATIVE_ACCURACY,
+        )
+
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._half_open_in_flight = False
+
+        self.requests = 0
+        self.failures = 0
+        self.backup_wins = 0  # 주 제공자 대신 사용된 횟수 (헤징/대체)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """최근 구간 첫 오디오 지연시간 분위수 (표본 부족 시 None)"""
+        return self.first_audio_latency.quantile(q, min_count=settings.TTS_HEDGE_MIN_SAMPLES)
+
+    # ---------- 서킷 브레이커 ----------
+
+    def allow_request(self) -> bool:
+        """closed: 항상 허용 / open: 대기 시간 경과 후 시험 요청 1건만 허용"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at < settings.TTS_CIRCUIT_OPEN_SECONDS:
+                return False
+            if self._half_open_in_flight:
+                return False
+            self._half_open_in_flight = True
+            return True
+
+    def record_success(self, first_audio_latency: float):
+        self.first_audio_latency.add(first_audio_latency)
+        with self._lock:
+            self.requests += 1
+            if self.opened_at is not None:
+                logger.info(f"✅ [TTS 엔진] {self.name} 서킷 닫힘 (시험 요청 성공)")
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._half_open_in_flight = False
+
+    def record_failure(self, reason: str):
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            reopen = self._half_open_in_flight
+            self._half_open_in_flight = False
+            if reopen or (
+                self.opened_at is None
+                and self.consecutive_failures >= settings.TTS_CIRCUIT_FAILURE_THRESHOLD
+            ):
+                self.opened_at = time.time()
+                logger.warning(
+                    f"🚫 [TTS 엔진] {self.name} 서킷 열림 ({self.consecutive_failures}회 연속 실패: {reason}, "
+                    f"{settings.TTS_CIRCUIT_OPEN_SECONDS:.0f}초간 제외)"
+                )
+
+    def release_half_open(self):
+        """시험 요청이 결과 없이 취소된 경우 (헤징에서 짐) 다음 시험 요청 허용"""
+        with self._lock:
+            self._half_open_in_flight = False
+
+    def snapshot(self) -> Dict:
+        latency = self.first_audio_latency.merged().summary()
+        with self._lock:
+            if self.opened_at is None:
+                state = "closed"
+            elif time.time() - self.opened_at < settings.TTS_CIRCUIT_OPEN_SECONDS:
+                state = "open"
+            else:
+                state = "half_open"
+            return {
+                "circuit": state,
+                "consecutive_failures": self.consecutive_failures,
+                "requests": self.requests,
+                "failures": self.failures,
+                "backup_wins": self.backup_wins,
+                "first_audio_latency": latency,
+            }
+
+
+_provider_health: Dict[str, ProviderHealth] = {}
+_provider_health_lock = threading.Lock()
+
+
+def get_provider_health(name: str) -> ProviderHealth:
+    with _provider_health_lock:
+        health = _provider_health.get(name)
+        if health is None:
+            health = _provider_health[name] = ProviderHealth(name)
+        return health
+
+
+def tts_provider_snapshot() -> Dict[str, Dict]:
+    """제공자별 지연시간 / 서킷 상태 (관리자 API용)"""
+    with _provider_health_lock:
+        names = list(_provider_health)
+    return {name: get_provider_health(name).snapshot() for name in names}
+
+
+# ==================== 제공자 ====================
+
+class ClovaTTSProvider:
+    """Naver Clova TTS (WAV 스트리밍 응답)"""
+
+    name = "clova"
+
+    def __init__(self, tts_service):
+        self.tts_service = tts_service
+
+    def is_configured(self) -> bool:
+        return bool(settings.NAVER_CLOVA_CLIENT_ID and settings.NAVER_CLOVA_CLIENT_SECRET)
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        normalizer = WavMulawNormalizer()
+        async for chunk in self.tts_service.stream_speech(text):
+            mulaw = normalizer.feed(chunk)
+            if mulaw:
+                yield mulaw
+
+
+class _HttpTTSProvider:
+    """HTTP 스트리밍 응답을 정규화하는 공통 구현 (프로세스 공용 클라이언트)"""
+
+    name = ""
+
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        return get_http_client()
+
+    def _build_request(self, text: str) -> Dict:
+        raise NotImplementedError
+
+    def _normalizer(self):
+        raise NotImplementedError
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        normalizer = self._normalizer()
+        async with self._get_client().stream("POST", **self._build_request(text)) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                raise RuntimeError(f"HTTP {response.status_code}: {body[:200]!r}")
+            async for chunk in response.aiter_bytes(4096):
+                mulaw = normalizer.feed(chunk)
+                if mulaw:
+                    yield mulaw
+
+
+class OpenAITTSProvider(_HttpTTSProvider):
+    """OpenAI TTS (response_format=pcm, 24kHz 16bit)"""
+
+    name = "openai"
+
+    def is_configured(self) -> bool:
+        return bool(settings.OPENAI_API_KEY)
+
+    def _build_request(self, text: str) -> Dict:
+        return {
+            "url": OPENAI_SPEECH_URL,
+            "headers": {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+            "json": {
+                "model": settings.OPENAI_TTS_MODEL,
+                "voice": settings.OPENAI_TTS_VOICE,
+                "input": text,
+                "response_format": "pcm",
+            },
+        }
+
+    def _normalizer(self):
+        return PcmMulawNormalizer(OPENAI_PCM_SAMPLE_RATE)
+
+
+class CartesiaTTSProvider(_HttpTTSProvider):
+    """Cartesia TTS (raw pcm_mulaw 8kHz 요청 → 변환 불필요)"""
+
+    name = "cartesia"
+
+    def is_configured(self) -> bool:
+        return bool(settings.CARTESIA_API_KEY)
+
+    def _build_request(self, text: str) -> Dict:
+        return {
+            "url": CARTESIA_TTS_URL,
+            "headers": {
+                "Cartesia-Version": CARTESIA_API_VERSION,
+                "Authorization": f"Bearer {settings.CARTESIA_API_KEY}",
+            },
+            "json": {
+                "model_id": settings.CARTESIA_TTS_MODEL,
+                "transcript": text,
+                "voice": {"mode": "id", "id": settings.CARTESIA_TTS_VOICE},
+                "language": "ko",
+                "output_format": {
+                    "container": "raw",
+                    "encoding": "pcm_mulaw",
+                    "sample_rate": 8000,
+                },
+            },
+        }
+
+    def _normalizer(self):
+        return MulawPassthroughNormalizer()
+
+
+# ==================== 엔진 ====================
+
+class _Attempt:
+    """제공자 1건 요청 (첫 오디오 조각 대기 태스크 포함)"""
+
+    def __init__(self, provider, text: str):
+        self.provider = provider
+        self.health = get_provider_health(provider.name)
+        self.started_at = time.time()
+        self.stream = provider.stream(text)
+        self.first_chunk_task = asyncio.create_task(self._first_chunk())
+
+    async def _first_chunk(self) -> bytes:
+        return await self.stream.__anext__()
+
+    async def cancel(self):
+        if not self.first_chunk_task.done():
+            self.first_chunk_task.cancel()
+        try:
+            await self.first_chunk_task
+        except BaseException:
+            pass
+        try:
+            await self.stream.aclose()
+        except Exception:
+            pass
+
+
+class TTSEngine:
+    """
+    통화별 TTS 엔진 (제공자 통계/서킷 상태는 프로세스 전역 공유)
+
+    stream_mulaw(text)는 제공자와 관계없이 8kHz μ-law 블록을 반환하므로
+    streaming_pipeline.send_mulaw_stream_to_twilio로 바로 전송할 수 있음
+    """
+
+    def __init__(self, clova_service=None):
+        if clova_service is None:
+            from app.services.ai_call.naver_clova_tts_service import NaverClovaTTSService
+            clova_service = NaverClovaTTSService()
+        self.clova_service = clova_service
+
+        available = {
+            "clova": ClovaTTSProvider(clova_service),
+            "openai": OpenAITTSProvider(),
+            "cartesia": CartesiaTTSProvider(),
+        }
+        self.providers = []
+        for name in settings.TTS_PROVIDERS.split(","):
+            provider = available.get(name.strip().lower())
+            if provider is None:
+                logger.warning(f"⚠️ [TTS 엔진] 알 수 없는 제공자: {name}")
+            elif provider.is_configured() and provider not in self.providers:
+                self.providers.append(provider)
+        if not self.providers:
+            self.providers.append(available["clova"])
+
+        # 통화 목소리 고정: 첫 오디오를 낸 제공자 (이후 헤징 없음, 고정 제공자 실패 시에만 전환)
+        self.pinned_provider = None
+
+        logger.info(f"🔊 [TTS 엔진] 제공자 순서: {', '.join(p.name for p in self.providers)}")
+
+    @staticmethod
+    def _hedge_delay(health: ProviderHealth) -> float:
+        p90 = health.quantile(settings.TTS_HEDGE_QUANTILE)
+        if p90 is None:
+            return settings.TTS_HEDGE_DEFAULT_DELAY_SECONDS
+        return min(max(p90, HEDGE_DELAY_MIN_SECONDS), HEDGE_DELAY_MAX_SECONDS)
+
+    async def stream_mulaw(self, text: str) -> AsyncIterator[bytes]:
+        """
+        문장 하나를 합성하여 8kHz μ-law 블록을 도착하는 대로 반환
+
+        첫 오디오가 나오기 전까지만 제공자를 전환/헤징하고,
+        첫 블록을 보낸 뒤에는 해당 제공자로 끝까지 재생 (중간 전환 시 음성 중복 방지)
+        목소리가 정해진 뒤(pinned_provider)에는 헤징하지 않고 고정 제공자가 실패할 때만 다음 제공자 사용
+        """
+        if not text or not text.strip():
+            return
+
+        pinned = self.pinned_provider
+        if pinned is None:
+            candidates = list(self.providers)
+            hedge = settings.TTS_HEDGE_ENABLED
+        else:
+            candidates = [pinned] + [p for p in self.providers if p is not pinned]
+            hedge = False
+        primary = candidates[0]
+        attempts: List[_Attempt] = []
+        winner: Optional[_Attempt] = None
+        first_chunk = b""
+
+        def launch_next() -> bool:
+            """서킷이 닫혀 있는(또는 시험 요청 가능한) 다음 제공자 요청 시작"""
+            while candidates:
+                provider = candidates.pop(0)
+                if get_provider_health(provider.name).allow_request():
+                    attempts.append(_Attempt(provider, text))
+                    return True
+            return False
+
+        if not launch_next():
+            # 모든 서킷이 열려 있으면 최우선 제공자로 시도 (무음보다 낫다)
+            attempts.append(_Attempt(primary, text))
+        try:
+            while winner is None and attempts:
+                pending = {a.first_chunk_task: a for a in attempts}
+                timeout = None
+                if hedge and candidates and len(attempts) == 1:
+                    timeout = self._hedge_delay(attempts[0].health)
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # 주 제공자가 p90 안에 응답하지 않음 → 예비 제공자 동시 요청
+                    slow = attempts[0]
+                    if launch_next():
+                        logger.info(
+                            f"⏱️ [TTS 엔진] {slow.provider.name} 첫 오디오 지연 "
+                            f"({time.time() - slow.started_at:.2f}초) → {attempts[-1].provider.name} 헤징 요청"
+                        )
+                    continue
+
+                for task in done:
+                    attempt = pending[task]
+                    attempts.remove(attempt)
+                    try:
+                        first_chunk = task.result()
+                    except StopAsyncIteration:
+                        attempt.health.record_failure("빈 응답")
+                        logger.warning(f"⚠️ [TTS 엔진] {attempt.provider.name} 오디오 없음")
+                    except Exception as e:
+                        attempt.health.record_failure(type(e).__name__)
+                        logger.warning(f"⚠️ [TTS 엔진] {attempt.provider.name} 실패: {e}")
+                    else:
+                        winner = attempt
+                        break
+
+                if winner is None and not attempts:
+                    # 진행 중인 요청이 모두 실패 → 다음 제공자 즉시 요청
+                    launch_next()
+
+            if winner is None:
+                logger.error("❌ [TTS 엔진] 모든 제공자 실패")
+                return
+
+            latency = time.time() - winner.started_at
+            winner.health.record_success(latency)
+            if winner.provider is not self.providers[0]:
+                winner.health.backup_wins += 1
+            logger.info(f"⚡ [TTS 엔진] {winner.provider.name} 첫 오디오 {latency:.2f}초")
+            if winner.provider is not pinned:
+                if pinned is not None:
+                    logger.warning(f"⚠️ [TTS 엔진] {pinned.name} 실패 → 통화 목소리를 {winner.provider.name}(으)로 전환")
+                self.pinned_provider = winner.provider
+
+            # 진 요청은 취소 (연결 종료)
+            for attempt in attempts:
+                await attempt.cancel()
+                attempt.health.release_half_open()
+            attempts.clear()
+
+            yield first_chunk
+            try:
+                async for chunk in winner.stream:
+                    yield chunk
+            except Exception as e:
+                # 첫 오디오 이후 실패: 이미 재생 중이므로 전환하지 않고 실패만 기록
+                winner.health.record_failure(f"스트리밍 중단: {type(e).__name__}")
+                logger.warning(f"⚠️ [TTS 엔진] {winner.provider.name} 스트리밍 중단: {e}")
+        finally:
+            for attempt in attempts:
+                await attempt.cancel()
+                attempt.health.release_half_open()
+            if winner is not None:
+                await winner.stream.aclose()
+
+    async def close(self):
+        await self.clova_service.close()
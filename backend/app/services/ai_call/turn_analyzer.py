@@ -0,0 +1,131 @@
+"""
+통화 중 감정/맥락 분석 사이드 파이프라인
+- 사용자 발화마다 감정 분석(analyze_emotion)과 맥락 정보 추출(extract_contextual_info)을
+  응답 생성과 동시에 백그라운드 스레드에서 실행
+- 결과는 통화별로 보관했다가 다음 턴 프롬프트에 반영 (한 턴 뒤따라감)
+- 응답 경로는 분석을 기다리지 않음: 분석이 진행 중이면 최신 발화만 대기열에 남기고 이어서 처리
+- 통화 전 계산된 어르신 프로필(elder_profile)을 기본 맥락으로 두고 통화 중 추출한 정보를 앞에 붙임
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.ai_call.llm_service import LLMService
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_FIELDS = ("family", "hobbies", "health", "daily_patterns", "location", "keywords")
+
+# 통화 중 누적하는 맥락 항목 수 (필드별, 최신 우선)
+MAX_ITEMS_PER_FIELD = 10
+
+
+class TurnAnalyzer:
+    """통화별 감정/맥락 분석 상태 (WebSocket 핸들러가 통화마다 생성)"""
+
+    def __init__(self, call_sid: str, profile_context: Optional[Dict[str, List[str]]] = None):
+        self.call_sid = call_sid
+        # 통화 전 계산된 프로필 맥락 (통화 중 변경 없음)
+        self.profile_context: Dict[str, List[str]] = profile_context or {}
+        # 각 통화마다 독립적인 LLM 서비스 인스턴스 (동시 통화 충돌 방지)
+        self.llm_service = LLMService()
+
+        self.emotion_context: Optional[Dict] = None
+        self.contextual_info: Dict[str, List[str]] = {field: [] for field in CONTEXT_FIELDS}
+        self.analyzed_turns = 0
+
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Optional[Tuple[str, List[Dict]]] = None
+
+    def context(self) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        다음 응답 프롬프트에 넣을 (감정 분석 결과, 맥락 정보) - 대기 없이 현재 값 반환
+
+        통화 중 추출한 맥락이 프로필보다 앞에 옴 (프로필/추출 맥락 모두 없으면 None)
+        """
+        merged: Dict[str, List[str]] = {}
+        for field in set(CONTEXT_FIELDS) | set(self.profile_context):
+            current = self.contextual_info.get(field, [])
+            values = list(reversed(current))
+            values += [v for v in self.profile_context.get(field, []) if v not in current]
+            if values:
+                merged[field] = values
+        return self.emotion_context, (merged or None)
+
+    def submit(self, user_text: str, conversation_history: List[Dict]):
+        """
+        발화 분석 요청 (즉시 반환)
+
+        Args:
+            user_text: 이번 턴 사용자 발화
+            conversation_history: 대화 기록 (마지막이 이번 발화여도 됨 - 중복 제거)
+        """
+        history = list(conversation_history)
+        if history and history[-1].get("role") == "user" and history[-1].get("content") == user_text:
+            history = history[:-1]
+
+        if self._task is not None and not self._task.done():
+            # 이전 분석 진행 중 → 가장 최근 발화만 이어서 분석
+            self._pending = (user_text, history)
+            return
+
+        self._task = asyncio.create_task(self._run(user_text, history))
+
+    async def _run(self, user_text: str, history: List[Dict]):
+        while True:
+            await self._analyze(user_text, history)
+            if self._pending is None:
+                return
+            user_text, history = self._pending
+            self._pending = None
+
+    async def _analyze(self, user_text: str, history: List[Dict]):
+        jobs = [asyncio.to_thread(self.llm_service.extract_contextual_info, user_text, history)]
+        if settings.ENABLE_EMOTION_ANALYSIS:
+            jobs.append(asyncio.to_thread(self.llm_service.analyze_emotion, user_text))
+
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+
+        contextual, emotion = results[0], results[1] if len(results) > 1 else None
+        if isinstance(contextual, dict):
+            self._merge_context(contextual)
+        elif isinstance(contextual, Exception):
+            logger.warning(f"⚠️ [턴 분석] 맥락 정보 추출 실패 ({self.call_sid}): {contextual}")
+
+        if isinstance(emotion, tuple):
+            self.emotion_context = emotion[0]
+            if self.emotion_context.get("urgency") == "high":
+                logger.warning(f"🚨 [턴 분석] 긴급도 높음 ({self.call_sid}): {self.emotion_context.get('summary')}")
+        elif isinstance(emotion, Exception):
+            logger.warning(f"⚠️ [턴 분석] 감정 분석 실패 ({self.call_sid}): {emotion}")
+
+        self.analyzed_turns += 1
+        logger.debug(f"🧭 [턴 분석] {self.call_sid} {self.analyzed_turns}번째 발화 분석 반영")
+
+    def _merge_context(self, extracted: Dict):
+        for field in CONTEXT_FIELDS:
+            values = extracted.get(field) or []
+            if not isinstance(values, list):
+                continue
+            merged = self.contextual_info[field]
+            for value in values:
+                value = str(value).strip()
+                if not value:
+                    continue
+                if value in merged:
+                    merged.remove(value)
+                merged.append(value)
+            # 최신 항목 우선으로 제한
+            del merged[:-MAX_ITEMS_PER_FIELD]
+
+    async def close(self):
+        """통화 종료 시 진행 중인 분석 취소 (스레드에서 실행 중인 API 호출은 끝난 뒤 버려짐)"""
+        self._pending = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
@@ -4,18 +4,58 @@ AI 자동 전화 스케줄링 작업 (Celery Beat)
 
 from app.tasks.celery_app import celery_app
 from app.database import SessionLocal
-from app.models.call import CallLog, CallStatus , CallSettings
+from app.models.call import CallSettings
 from app.models.user import User
 from app.services.ai_call.twilio_service import TwilioService
+from app.services.ai_call.call_schedule_cache import load_due_call_settings
+from app.services.ai_call.dialer import DialTarget, OutboundDialer
 from app.config import settings
-from app.utils.phone import normalize_phone_number
+from app.utils.worker_registry import assign_call_hosts, available_call_slots
 from datetime import datetime
+from typing import Dict, List
 import pytz
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _dial_targets(db, targets: List[DialTarget], scheduled_at: float, attempt: int) -> Dict:
+    """
+    통화 수용량 안에서 병렬 발신, 남은 대상은 DIAL_DEFER_SECONDS 뒤로 미룸
+    
+    Returns:
+        dict: 발신 결과 (calls_made, failed_calls, deferred, batches, ...)
+    """
+    # 워커 등록부 기준 남은 통화 수용량 (None: 알 수 없음 → 전부 발신)
+    slots = available_call_slots()
+    deferred: List[DialTarget] = []
+    if slots is not None and slots < len(targets):
+        if attempt < settings.DIAL_MAX_DEFERS:
+            targets, deferred = targets[:slots], targets[slots:]
+            logger.warning(
+                f"⏸️ 통화 수용량 부족: {len(targets)}건 발신, {len(deferred)}건은 "
+                f"{settings.DIAL_DEFER_SECONDS}초 뒤로 미룸 (재시도 {attempt + 1}/{settings.DIAL_MAX_DEFERS})"
+            )
+        else:
+            logger.warning(f"⚠️ 통화 수용량 부족하지만 최대 미룸 횟수 도달, 남은 {len(targets)}건 모두 발신")
+    
+    result = {"calls_made": 0, "failed_calls": 0, "failed": [], "batches": [], "seconds": 0.0}
+    if targets:
+        # 통화별 연결 워커 (drain 중인 워커 제외, 남은 수용량이 큰 워커부터 / 없으면 로드밸런서 도메인)
+        for target, host in zip(targets, assign_call_hosts(len(targets))):
+            target.call_host = host
+        dialer = OutboundDialer(TwilioService(), settings.API_BASE_URL, scheduled_at=scheduled_at)
+        result = dialer.dial_all(db, targets)
+    
+    if deferred:
+        dial_deferred_calls.apply_async(
+            args=[[target.elderly_id for target in deferred], scheduled_at, attempt + 1],
+            countdown=settings.DIAL_DEFER_SECONDS,
+        )
+    result["deferred"] = len(deferred)
+    return result
+
+
 @celery_app.task(name="app.tasks.call_scheduler.check_and_make_calls")
 def check_and_make_calls():
     """
@@ -36,121 +76,32 @@ def check_and_make_calls():
         
         logger.info(f"⏰ 현재 시간: {current_hour:02d}:{current_minute:02d}")
         
-        # 자동 통화가 활성화된 설정 조회
-        settings_list = db.query(CallSettings).filter(
-            CallSettings.is_active == True,
-            CallSettings.call_time != None
-        ).all()
-        
-        if not settings_list:
-            logger.info("활성화된 통화 설정이 없습니다")
-            return {"calls_made": 0, "message": "No active settings"}
+        # 이번 분에 예약된 활성 설정 + 어르신 (Redis 예약 캐시 → 인덱스 조회, 조인 1번)
+        due_settings = load_due_call_settings(db, current_hour * 60 + current_minute)
         
-        logger.info(f"📋 활성화된 통화 설정: {len(settings_list)}개")
-        
-        # 현재 시간에 전화해야 하는 설정 필터링
-        settings_to_call = []
-        
-        for setting in settings_list:
-            try:
-                call_hour = setting.call_time.hour
-                call_minute = setting.call_time.minute
-            except (ValueError, AttributeError, IndexError) as e:
-                logger.warning(f"⚠️  잘못된 시간 형식 (사용자: {setting.elderly_id}): {setting.call_time}")
-                continue
-            
-            # 시간 차이 계산 (분 단위)
-            time_diff = abs((call_hour * 60 + call_minute) - (current_hour * 60 + current_minute))
-            
-            # 정확히 설정한 시간에만 전화 (0분 차이)
-            if time_diff == 0:
-                settings_to_call.append(setting)
-                logger.info(f"📞 예약 통화 대상: {setting.elderly_id} ({call_hour:02d}:{call_minute:02d})")
-        
-        if not settings_to_call:
+        if not due_settings:
             logger.info("이번 시간에 전화할 대상이 없습니다")
             return {"calls_made": 0, "message": "No calls scheduled at this time"}
         
+        for setting, elderly in due_settings:
+            logger.info(f"📞 예약 통화 대상: {setting.elderly_id} ({setting.call_time.hour:02d}:{setting.call_time.minute:02d})")
+        
         # API Base URL 확인 (Twilio 콜백용)
         if not settings.API_BASE_URL:
             logger.error("❌ API_BASE_URL이 환경 변수에 설정되지 않았습니다")
             return {"calls_made": 0, "error": "API_BASE_URL not configured"}
         
-        # Twilio 서비스 초기화
-        twilio_service = TwilioService()
-        calls_made = 0
-        failed_calls = 0
-        
-        # 실제로 전화 걸 설정들을 순회
-        for setting in settings_to_call:
-            try:
-                # 사용자 정보 조회
-                elderly = db.query(User).filter(User.user_id == setting.elderly_id).first()
-                
-                if not elderly:
-                    logger.warning(f"⚠️  사용자를 찾을 수 없음: {setting.elderly_id}")
-                    failed_calls += 1
-                    continue
-                
-                if not elderly.phone_number:
-                    logger.warning(f"⚠️  전화번호 없음 (사용자: {elderly.name})")
-                    failed_calls += 1
-                    continue
-
-                # 전화번호 국제 형식으로 변환
-                normalized_phone = normalize_phone_number(elderly.phone_number)
-                
-                # ✅ 수동 통화와 동일한 설정 사용
-                api_base_url = settings.API_BASE_URL
-                voice_url = f"https://{api_base_url}/api/twilio/voice?elderly_id={elderly.user_id}"  # WebSocket 시작 엔드포인트 (사용자 식별자 포함)
-                status_callback_url = f"https://{api_base_url}/api/twilio/call-status"
-                
-                logger.info(f"┌{'─'*58}┐")
-                logger.info(f"│ 📞 실시간 AI 대화 통화 발신 (자동 스케줄)             │")
-                logger.info(f"│ 이름: {elderly.name:47} │")
-                logger.info(f"│ 전화번호: {elderly.phone_number:43} │")
-                logger.info(f"│ 정규화: {normalized_phone:45} │")
-                logger.info(f"│ 사용자 ID: {elderly.user_id:42} │")
-                logger.info(f"└{'─'*58}┘")
-                logger.info(f"🔗 Voice URL (WebSocket): {voice_url}")
-                logger.info(f"🔗 Status Callback: {status_callback_url}")
-                
-                # ✅ 수동 통화와 동일한 방식으로 전화 발신
-                call_sid = twilio_service.make_call(
-                    to_number=normalized_phone,
-                    voice_url=voice_url,
-                    status_callback_url=status_callback_url
-                )
-                
-                # ✅ 수동 통화와 동일한 방식으로 CallLog 생성
-                new_call = CallLog(
-                    call_id=call_sid,
-                    elderly_id=elderly.user_id,
-                    call_status=CallStatus.INITIATED,
-                    twilio_call_sid=call_sid,
-                    created_at=datetime.utcnow()
-                )
-                db.add(new_call)
-                db.commit()
-                db.refresh(new_call)
-                
-                calls_made += 1
-                logger.info(f"✅ 통화 발신 성공: {elderly.name} (Call SID: {call_sid})")
-                logger.info(f"💾 통화 기록 저장 완료 (ID: {call_sid})")
-                logger.info(f"🌐 WebSocket 연결 대기 중... (사용자가 전화 받으면 자동 연결)")
-                logger.info("")
-                
-            except Exception as e:
-                failed_calls += 1
-                logger.error(f"❌ 통화 발신 실패 (사용자: {setting.elderly_id}): {str(e)}")
-                import traceback
-                logger.error(traceback.format_exc())
-                db.rollback()
-                continue
+        targets = [
+            DialTarget(elderly_id=elderly.user_id, name=elderly.name, phone_number=elderly.phone_number)
+            for _, elderly in due_settings
+        ]
+        scheduled_at = current_datetime.replace(second=0, microsecond=0).timestamp()
+        dial_result = _dial_targets(db, targets, scheduled_at, attempt=0)
+        calls_made = dial_result["calls_made"]
+        failed_calls = dial_result["failed_calls"]
         
         result = {
-            "calls_made": calls_made,
-            "failed_calls": failed_calls,
+            **dial_result,
             "timestamp": f"{current_hour:02d}:{current_minute:02d}",
             "datetime": current_datetime.isoformat()
         }
@@ -173,6 +124,43 @@ def check_and_make_calls():
         db.close()
 
 
+@celery_app.task(name="app.tasks.call_scheduler.dial_deferred_calls")
+def dial_deferred_calls(elderly_ids: List[str], scheduled_at: float, attempt: int):
+    """
+    통화 수용량 부족으로 미룬 예약 통화 발신
+    
+    Args:
+        elderly_ids: 미룬 어르신 ID 목록
+        scheduled_at: 원래 예약 시각 (epoch, 발신 지연 보고용)
+        attempt: 미룬 횟수
+    """
+    logger.info(f"📞 미룬 예약 통화 발신: {len(elderly_ids)}건 (재시도 {attempt})")
+    
+    db = SessionLocal()
+    try:
+        # 그 사이 자동 통화를 끈 어르신은 제외 (조인 1번)
+        rows = db.query(User.user_id, User.name, User.phone_number).join(
+            CallSettings, CallSettings.elderly_id == User.user_id
+        ).filter(
+            User.user_id.in_(elderly_ids),
+            CallSettings.is_active.is_(True),
+        ).all()
+        targets = [
+            DialTarget(elderly_id=user_id, name=name, phone_number=phone_number)
+            for user_id, name, phone_number in rows
+        ]
+        return _dial_targets(db, targets, scheduled_at, attempt)
+    
+    except Exception as e:
+        logger.error(f"❌ 미룬 예약 통화 발신 오류: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return {"calls_made": 0, "error": str(e)}
+    
+    finally:
+        db.close()
+
+
 @celery_app.task(name="app.tasks.call_scheduler.process_call_result")
 def process_call_result(call_id: str):
     """
@@ -56,6 +56,11 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.todo_scheduler.check_overdue_todos",
         "schedule": crontab(hour=21, minute=0),  # 매일 21:00
     },
+    # 어르신 개인화 프로필 갱신 (매일 새벽 3시)
+    "refresh-elder-profiles": {
+        "task": "app.tasks.elder_profile.refresh_all_elder_profiles",
+        "schedule": crontab(hour=3, minute=0),  # 매일 03:00
+    },
     # 오래된 TODO 정리 (매주 일요일 자정)
     "cleanup-old-todos": {
         "task": "app.tasks.todo_scheduler.cleanup_old_todos",
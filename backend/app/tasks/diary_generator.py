@@ -32,25 +32,25 @@ def generate_diary_from_call(call_id: str):
             logger.error(f"Call not found: {call_id}")
             return
         
-        # 통화 텍스트 조합 (CallTranscript에서)
-        transcripts = call.transcripts
-        conversation_text = "\n".join([
-            f"{t.speaker}: {t.text}"
-            for t in transcripts
-        ])
+        # 통화 후처리에서 저장된 통합 분석 결과 우선 사용 (요약 LLM 재호출 없음)
+        analysis = call.analysis or {}
+        diary_content = analysis.get("diary")
         
-        if not conversation_text:
-            logger.warning(f"No transcript for call: {call_id}")
-            return
-        
-        # LLM으로 일기 생성
-        llm_service = LLMService()
-
-        conversation_history = [
-            {"role": "user" if t.speaker == "ELDERLY" else "assistant", "content": t.text}
-             for t in transcripts
-        ]
-        diary_content = llm_service.summarize_call_conversation(conversation_history)
+        if not diary_content:
+            # 통화 텍스트 조합 (CallTranscript에서)
+            transcripts = call.transcripts
+            if not transcripts:
+                logger.warning(f"No transcript for call: {call_id}")
+                return
+            
+            # LLM으로 일기 생성
+            llm_service = LLMService()
+            
+            conversation_history = [
+                {"role": "user" if t.speaker == "ELDERLY" else "assistant", "content": t.text}
+                 for t in transcripts
+            ]
+            diary_content = llm_service.summarize_call_conversation(conversation_history)
         
         # 다이어리 저장
         new_diary = Diary(
@@ -58,8 +58,9 @@ def generate_diary_from_call(call_id: str):
             author_id=call.elderly_id,
             call_id=call.call_id,
             date=date.today(),
-            title="AI와의 대화 기록",
+            title=analysis.get("title") or "AI와의 대화 기록",
             content=diary_content,
+            mood=analysis.get("mood"),
             author_type=AuthorType.ELDERLY,
             is_auto_generated=True,
             status=DiaryStatus.PUBLISHED,
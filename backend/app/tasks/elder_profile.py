@@ -0,0 +1,74 @@
+"""
+어르신 개인화 프로필 갱신 작업 (Celery)
+- 야간 배치: 활성 어르신 전체 프로필 재계산
+- 통화 후처리 직후: 해당 어르신 프로필만 재계산 (다음 통화에 바로 반영)
+"""
+
+from app.tasks.celery_app import celery_app
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+from app.services.ai_call.elder_profile import build_elder_profile, save_elder_profile
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.elder_profile.refresh_elder_profile")
+def refresh_elder_profile(elderly_id: str):
+    """
+    어르신 1명의 개인화 프로필 재계산 후 Redis 저장
+
+    Args:
+        elderly_id: 어르신 ID
+    """
+    db = SessionLocal()
+    try:
+        profile = build_elder_profile(db, elderly_id)
+    finally:
+        db.close()
+
+    if save_elder_profile(elderly_id, profile):
+        logger.info(
+            f"🧓 어르신 프로필 갱신: {elderly_id} "
+            f"(통화 {profile['calls_analyzed']}건, 주제 {len(profile['topics'])}개)"
+        )
+    else:
+        logger.warning(f"⚠️ 어르신 프로필 저장 실패 (Redis 사용 불가): {elderly_id}")
+
+
+@celery_app.task(name="app.tasks.elder_profile.refresh_all_elder_profiles")
+def refresh_all_elder_profiles():
+    """
+    활성 어르신 전체 프로필 재계산 (매일 새벽)
+
+    Returns:
+        dict: 처리 결과 통계
+    """
+    db = SessionLocal()
+    try:
+        elderly_ids = [
+            user_id
+            for (user_id,) in db.query(User.user_id)
+            .filter(User.role == UserRole.ELDERLY, User.is_active.is_(True))
+            .all()
+        ]
+
+        refreshed = 0
+        failed = 0
+        for elderly_id in elderly_ids:
+            try:
+                profile = build_elder_profile(db, elderly_id)
+            except Exception as e:
+                failed += 1
+                logger.error(f"❌ 어르신 프로필 계산 실패: {elderly_id} - {e}")
+                db.rollback()
+                continue
+            if save_elder_profile(elderly_id, profile):
+                refreshed += 1
+            else:
+                failed += 1
+
+        logger.info(f"✅ 어르신 프로필 일괄 갱신 완료: {refreshed}명 (실패 {failed}명)")
+        return {"refreshed": refreshed, "failed": failed}
+    finally:
+        db.close()
@@ -0,0 +1,155 @@
+"""
+통화 종료 후 처리 작업 (Celery)
+WebSocket 종료 경로에서 스냅샷한 대화를 받아 요약 생성, 대화 기록 저장, 후속 처리 수행
+"""
+
+from app.tasks.celery_app import celery_app
+from app.database import SessionLocal
+from app.models.call import CallLog, EmotionLog, EmotionType
+from app.models.diary import Diary
+from app.services.ai_call.llm_service import LLMService
+from app.services.ai_call.session_store import get_session_store
+from app.utils.transcript_writer import write_transcripts
+from app.config import settings
+from typing import Dict, List
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 워커 간 중복 처리 방지용 (Redis 백엔드일 때 분산 락)
+session_store = get_session_store()
+
+# 처리 락 유지 시간 (요약 LLM 호출 + DB 저장 여유)
+FINALIZE_LOCK_TTL_SECONDS = 10 * 60
+
+
+def enqueue_post_call_processing(call_sid: str, conversation: List[Dict[str, str]]):
+    """
+    통화 후처리 작업을 브로커에 등록 (동기 - API에서는 to_thread로 호출)
+
+    Args:
+        call_sid: Twilio Call SID
+        conversation: 대화 스냅샷 [{"role": "user"|"assistant", "content": "...", "offset": 초}, ...]
+    """
+    process_call_conversation.apply_async(
+        args=[call_sid, conversation],
+        retry=True,
+        retry_policy={
+            "max_retries": 3,
+            "interval_start": 0.2,
+            "interval_step": 0.5,
+            "interval_max": 2,
+        },
+    )
+
+
+def run_post_call_pipeline(call_sid: str, conversation: List[Dict[str, str]]) -> bool:
+    """
+    통화 후처리 본체 (각 단계는 재시도되어도 중복 저장되지 않도록 DB 상태로 확인)
+
+    1. 통화 통합 분석 → CallLog.call_analysis / conversation_summary / EmotionLog
+    2. CallTranscript 일괄 저장 (화자별 대화 내용 + 실제 발화 시각)
+    3. 후속 처리 (자동 일기 생성)
+
+    Returns:
+        bool: 처리 완료 여부 (이미 처리됨/다른 워커가 처리 중이면 False)
+    """
+    if session_store.is_finalized(call_sid):
+        logger.info(f"⏭️  이미 후처리된 통화: {call_sid}")
+        return False
+
+    if not session_store.acquire_finalize_lock(call_sid, ttl_seconds=FINALIZE_LOCK_TTL_SECONDS):
+        logger.info(f"⏭️  다른 워커가 후처리 중: {call_sid}")
+        return False
+
+    db = SessionLocal()
+    try:
+        logger.info(f"💾 통화 후처리 시작: {call_sid} ({len(conversation)}개 메시지)")
+
+        call_log = db.query(CallLog).filter(CallLog.call_id == call_sid).first()
+        if not call_log:
+            logger.warning(f"⚠️  CallLog를 찾을 수 없음: {call_sid}")
+
+        # 1. 통화 통합 분석 (일기/제목/기분/일정/감정/개인화 정보를 한 번의 LLM 호출로)
+        if call_log and not call_log.call_analysis and not call_log.conversation_summary:
+            # 각 통화마다 독립적인 LLM 서비스 인스턴스 생성 (동시 통화 충돌 방지)
+            llm_service = LLMService()
+            try:
+                analysis = llm_service.analyze_call_conversation(conversation)
+            except Exception as e:
+                logger.error(f"❌ 통화 통합 분석 실패, 요약만 생성: {e}")
+                analysis = None
+            
+            if analysis and analysis["diary"]:
+                call_log.call_analysis = json.dumps(analysis, ensure_ascii=False)
+                call_log.conversation_summary = analysis["diary"]
+                if settings.ENABLE_EMOTION_ANALYSIS:
+                    emotion = analysis["emotion"]
+                    db.add(EmotionLog(
+                        call_id=call_sid,
+                        emotion_type=EmotionType(emotion["type"]),
+                        emotion_score=emotion["score"],
+                        detected_keywords=json.dumps(emotion["keywords"], ensure_ascii=False),
+                    ))
+            else:
+                call_log.conversation_summary = llm_service.summarize_call_conversation(conversation)
+            
+            db.commit()
+            logger.info(f"✅ 요약 생성 완료: {call_log.conversation_summary[:100]}...")
+
+        # 2. CallTranscript 일괄 저장 ((call_id, sequence) 충돌 시 무시 → 재시도 안전)
+        write_transcripts(db, call_sid, conversation)
+        db.commit()
+
+        # 3. 후속 처리
+        if call_log and settings.POST_CALL_AUTO_DIARY:
+            has_diary = db.query(Diary.diary_id).filter(Diary.call_id == call_sid).first()
+            if not has_diary:
+                from app.tasks.diary_generator import generate_diary_from_call
+                generate_diary_from_call.delay(call_sid)
+                logger.info(f"📔 자동 일기 생성 작업 등록: {call_sid}")
+
+        if call_log and settings.ELDER_PROFILE_ENABLED:
+            from app.tasks.elder_profile import refresh_elder_profile
+            refresh_elder_profile.delay(call_log.elderly_id)
+
+        session_store.mark_finalized(call_sid)
+        logger.info(f"✅ 통화 후처리 완료: {call_sid}")
+        return True
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        session_store.release_finalize_lock(call_sid)
+
+
+@celery_app.task(
+    name="app.tasks.post_call.process_call_conversation",
+    bind=True,
+    acks_late=True,  # 워커가 처리 도중 죽어도 작업이 유실되지 않도록 완료 후 ack
+    reject_on_worker_lost=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    max_retries=5,
+)
+def process_call_conversation(self, call_sid: str, conversation: List[Dict[str, str]]):
+    """
+    통화 종료 후처리 작업
+
+    Args:
+        call_sid: Twilio Call SID
+        conversation: 대화 스냅샷
+    """
+    if not conversation:
+        logger.warning(f"⚠️  저장할 대화 내용이 없음: {call_sid}")
+        return
+
+    try:
+        run_post_call_pipeline(call_sid, conversation)
+    except Exception as e:
+        logger.error(f"❌ 통화 후처리 실패 (재시도 {self.request.retries}회): {call_sid} - {e}")
+        raise
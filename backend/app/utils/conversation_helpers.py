@@ -1,15 +1,14 @@
 """
 대화 관련 Helper 함수들
 """
+import asyncio
 import logging
 from datetime import datetime
 from pytz import timezone
 import random
 
-from app.database import get_db
 from app.services.ai_call.session_store import get_session_store
-from app.services.ai_call.llm_service import LLMService
-from app.core.state import saved_calls
+from app.core.state import performance_collectors
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +18,9 @@ KST = timezone('Asia/Seoul')
 # 세션 스토어
 session_store = get_session_store()
 
+# 브로커 등록이 진행 중인 후처리 요청 (종료 시 flush용)
+_pending_post_call_enqueues: set = set()
+
 
 def get_time_based_welcome_message() -> str:
     """
@@ -127,13 +129,16 @@ def get_time_based_welcome_message() -> str:
 
 async def save_conversation_to_db(call_sid: str, conversation: list):
     """
-    대화 내용을 DB에 저장하는 공통 함수
+    대화 내용 저장 요청 (통화 후처리 작업 큐에 등록)
+    
+    요약 생성과 DB 저장은 Celery 워커(app.tasks.post_call)에서 수행되며,
+    이 함수는 대화를 스냅샷한 뒤 등록만 백그라운드로 넘기고 즉시 반환함
     
     Args:
         call_sid: Twilio Call SID
         conversation: 대화 내용 리스트 [{"role": "user", "content": "..."}, ...]
     """
-    # 이미 저장되었으면 스킵 (중복 방지)
+    # 이미 저장 요청되었으면 스킵 (중복 방지)
     if session_store.is_saved(call_sid):
         logger.info(f"⏭️  이미 저장된 통화: {call_sid}")
         return
@@ -143,56 +148,63 @@ async def save_conversation_to_db(call_sid: str, conversation: list):
         logger.warning(f"⚠️  저장할 대화 내용이 없음: {call_sid}")
         return
     
-    logger.info(f"💾 대화 기록 저장 시작: {len(conversation)}개 메시지")
+    # 턴 메트릭에서 실제 발화 시각(통화 시작 기준 초) 계산
+    offsets = None
+    metrics_collector = performance_collectors.get(call_sid)
+    if metrics_collector is not None:
+        try:
+            offsets = metrics_collector.utterance_offsets(conversation)
+        except Exception as e:
+            logger.warning(f"⚠️  발화 시각 계산 실패 (시각 없이 저장): {e}")
+    
+    # 호출 측에서 세션이 곧 삭제되므로 복사본으로 스냅샷
+    snapshot = [
+        {
+            "role": message["role"],
+            "content": message["content"],
+            "offset": offsets[idx] if offsets else None,
+        }
+        for idx, message in enumerate(conversation)
+    ]
+    session_store.mark_saved(call_sid)
+    
+    task = asyncio.create_task(_enqueue_post_call(call_sid, snapshot))
+    _pending_post_call_enqueues.add(task)
+    task.add_done_callback(_pending_post_call_enqueues.discard)
+    
+    logger.info(f"💾 통화 후처리 등록 요청: {call_sid} ({len(snapshot)}개 메시지)")
+
+
+async def _enqueue_post_call(call_sid: str, conversation: list):
+    """브로커 등록 (실패 시 같은 프로세스의 스레드에서 직접 처리)"""
+    from app.tasks.post_call import enqueue_post_call_processing, run_post_call_pipeline
+    
+    try:
+        await asyncio.to_thread(enqueue_post_call_processing, call_sid, conversation)
+        logger.info(f"✅ 통화 후처리 작업 등록 완료: {call_sid}")
+        return
+    except Exception as e:
+        logger.error(f"❌ 통화 후처리 작업 등록 실패, 직접 처리로 전환: {call_sid} - {e}")
     
     try:
-        from app.models.call import CallLog, CallTranscript, CallStatus
-        db = next(get_db())
-        
-        # 1. CallLog 업데이트 (대화 요약)
-        call_log_db = db.query(CallLog).filter(CallLog.call_id == call_sid).first()
-        
-        if call_log_db:
-            # LLM 요약 생성 (대화가 있는 경우에만)
-            if len(conversation) > 0:
-                logger.info("🤖 LLM으로 통화 요약 생성 중...")
-                # 각 통화마다 독립적인 LLM 서비스 인스턴스 생성 (동시 통화 충돌 방지)
-                llm_service = LLMService()
-                summary = llm_service.summarize_call_conversation(conversation)
-                call_log_db.conversation_summary = summary
-                logger.info(f"✅ 요약 생성 완료: {summary[:100]}...")
-            
-            db.commit()
-            logger.info(f"✅ CallLog 업데이트 완료")
-        else:
-            logger.warning(f"⚠️  CallLog를 찾을 수 없음: {call_sid}")
-        
-        # 2. CallTranscript 저장 (화자별 대화 내용)
-        for idx, message in enumerate(conversation):
-            speaker = "ELDERLY" if message["role"] == "user" else "AI"
-            
-            transcript = CallTranscript(
-                call_id=call_sid,
-                speaker=speaker,
-                text=message["content"],
-                timestamp=idx * 10.0,  # 대략적인 타임스탬프 (10초 간격)
-                created_at=datetime.utcnow()
-            )
-            db.add(transcript)
-        
-        db.commit()
-        logger.info(f"✅ 대화 내용 {len(conversation)}개 저장 완료")
-        
-        # 저장 성공 플래그 설정
-        session_store.mark_saved(call_sid)
-        
-        db.close()
-        
+        await asyncio.to_thread(run_post_call_pipeline, call_sid, conversation)
     except Exception as e:
-        logger.error(f"❌ DB 저장 실패: {e}")
+        logger.error(f"❌ 통화 후처리 직접 처리 실패: {call_sid} - {e}")
         import traceback
         logger.error(traceback.format_exc())
-        if 'db' in locals():
-            db.rollback()
-            db.close()
 
+
+async def flush_pending_post_call_jobs(timeout: float = 30.0) -> int:
+    """
+    아직 등록 중인 통화 후처리 요청이 끝날 때까지 대기 (서버 종료 시)
+    
+    Returns:
+        int: 시간 내에 끝나지 않은 요청 수
+    """
+    pending = list(_pending_post_call_enqueues)
+    if not pending:
+        return 0
+    
+    logger.info(f"⏳ 통화 후처리 등록 대기: {len(pending)}건")
+    _, not_done = await asyncio.wait(pending, timeout=timeout)
+    return len(not_done)
@@ -0,0 +1,157 @@
+"""
+배포용 drain 모드 (API 워커)
+- 시작: SIGUSR1 또는 관리자 API (POST /api/admin/drain)
+- drain 중에는
+  1) /health가 503 → 로드밸런서가 새 연결을 보내지 않음
+  2) 새 /api/twilio/media-stream 연결 거절, /api/twilio/voice는 다른 active 워커로 스트림 연결
+  3) 워커 등록부에 draining으로 기록 → 통화 스케줄러가 다른 워커로 발신
+- 진행 중 통화는 MAX_CALL_DURATION(분)까지 기다린 뒤 등록 중인 통화 후처리 요청을 마무리하고
+  (DRAIN_EXIT_ON_COMPLETE면) 자기 자신에게 SIGTERM → 일반 종료 절차(lifespan shutdown)
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+from app.core.state import active_connections
+from app.utils.conversation_helpers import flush_pending_post_call_jobs
+from app.utils.worker_registry import (
+    STATUS_ACTIVE,
+    STATUS_DRAINED,
+    STATUS_DRAINING,
+    publish_worker,
+    remove_worker,
+)
+
+logger = logging.getLogger(__name__)
+
+# 진행 중 통화 수 확인 주기
+_POLL_SECONDS = 1.0
+
+
+class DrainController:
+    """워커당 1개 - lifespan에서 start() / stop()"""
+
+    def __init__(self):
+        self.draining = False
+        self.reason: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.deadline: Optional[float] = None
+        self.completed_at: Optional[float] = None
+        self.calls_at_start = 0
+        self.rejected_connections = 0
+        self.unflushed_jobs: Optional[int] = None
+        self._exit_on_complete = settings.DRAIN_EXIT_ON_COMPLETE
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._drain_task: Optional[asyncio.Task] = None
+
+    @property
+    def status(self) -> str:
+        if not self.draining:
+            return STATUS_ACTIVE
+        return STATUS_DRAINED if self.completed_at else STATUS_DRAINING
+
+    async def start(self):
+        """워커 등록부 하트비트 시작 + SIGUSR1 처리기 등록"""
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.begin, "SIGUSR1")
+        except (NotImplementedError, RuntimeError, AttributeError) as e:
+            logger.warning(f"⚠️ [Drain] SIGUSR1 처리기 등록 실패 (관리자 API로만 시작 가능): {e}")
+
+    async def stop(self):
+        try:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+        except (NotImplementedError, RuntimeError, AttributeError):
+            pass
+        for task in (self._drain_task, self._heartbeat_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        await asyncio.to_thread(remove_worker)
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.to_thread(publish_worker, self.status, len(active_connections))
+            await asyncio.sleep(settings.WORKER_HEARTBEAT_SECONDS)
+
+    def begin(self, reason: str = "admin", exit_on_complete: Optional[bool] = None) -> bool:
+        """
+        drain 시작 (이미 진행 중이면 무시)
+
+        Returns:
+            새로 시작했으면 True
+        """
+        if self.draining:
+            return False
+
+        self.draining = True
+        self.reason = reason
+        self.started_at = time.time()
+        self.deadline = self.started_at + settings.MAX_CALL_DURATION * 60
+        self.calls_at_start = len(active_connections)
+        if exit_on_complete is not None:
+            self._exit_on_complete = exit_on_complete
+        logger.warning(
+            f"🚧 [Drain] 시작 ({reason}): 진행 중 통화 {self.calls_at_start}건, "
+            f"최대 {settings.MAX_CALL_DURATION}분 대기"
+        )
+        self._drain_task = asyncio.create_task(self._run_drain())
+        return True
+
+    def record_rejected(self):
+        self.rejected_connections += 1
+
+    async def _run_drain(self):
+        # 스케줄러가 다음 발신부터 이 워커를 제외하도록 즉시 기록
+        await asyncio.to_thread(publish_worker, self.status, len(active_connections))
+
+        while active_connections and time.time() < self.deadline:
+            await asyncio.sleep(_POLL_SECONDS)
+
+        if active_connections:
+            logger.warning(f"⚠️ [Drain] 최대 통화 시간 초과, 남은 통화 {len(active_connections)}건은 종료 절차에서 정리")
+
+        self.unflushed_jobs = await flush_pending_post_call_jobs(settings.DRAIN_POST_CALL_FLUSH_SECONDS)
+        self.completed_at = time.time()
+        await asyncio.to_thread(publish_worker, self.status, len(active_connections))
+        logger.info(
+            f"✅ [Drain] 완료 ({self.completed_at - self.started_at:.0f}초, "
+            f"미등록 후처리 {self.unflushed_jobs}건, 거절한 연결 {self.rejected_connections}건)"
+        )
+
+        if self._exit_on_complete:
+            logger.info("👋 [Drain] 프로세스 종료 요청 (SIGTERM)")
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    def snapshot(self) -> Dict:
+        """관리자 API / 헬스 체크용 진행 상황"""
+        active_calls = len(active_connections)
+        progress = elapsed = None
+        if self.started_at:
+            elapsed = (self.completed_at or time.time()) - self.started_at
+        if self.draining:
+            finished = self.calls_at_start - min(active_calls, self.calls_at_start)
+            progress = 1.0 if self.completed_at or not self.calls_at_start else finished / self.calls_at_start
+        return {
+            "status": self.status,
+            "reason": self.reason,
+            "active_calls": active_calls,
+            "calls_at_start": self.calls_at_start,
+            "progress": progress,
+            "elapsed_seconds": elapsed,
+            "deadline_in_seconds": max(self.deadline - time.time(), 0.0) if self.deadline and not self.completed_at else None,
+            "rejected_connections": self.rejected_connections,
+            "unflushed_post_call_jobs": self.unflushed_jobs,
+            "exit_on_complete": self._exit_on_complete,
+        }
+
+
+drain_controller = DrainController()
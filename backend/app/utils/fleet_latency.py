@@ -0,0 +1,266 @@
+"""
+전체 통화 대상 롤링 지연시간 분위수 집계
+- 단계(stage)별 DDSketch를 분/시간 버킷으로 프로세스 내부에 누적
+- 주기적으로 Redis 해시에 직렬화하여 워커 간 병합 (최근 5분 / 1시간 / 1일)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.config import settings
+from app.utils.latency_sketch import DDSketch
+from app.utils.redis_client import get_redis, reset_redis
+
+logger = logging.getLogger(__name__)
+
+# PerformanceMetricsCollector 통계 키와 동일한 단계 이름 (+ 이벤트 루프 지연 / 타이머 실행 지연 / 송신 / 발신)
+STAGES = (
+    "stt_latency",
+    "stt_partial_latency",
+    "llm_first_token_latency",
+    "llm_completion_latency",
+    "tts_latency",
+    "first_token_to_first_tts_completion_latency",
+    "stt_to_first_audio_latency",
+    "e2e_latency",
+    "event_loop_lag",
+    "timer_drift",
+    "ws_send",
+    "twilio_dial",
+)
+
+# 윈도우 이름 → (버킷 단위, 버킷 개수)
+WINDOWS = {
+    "5m": ("m", 5),
+    "1h": ("m", 60),
+    "1d": ("h", 24),
+}
+
+_BUCKET_SECONDS = {"m": 60, "h": 3600}
+_BUCKET_RETENTION = {"m": 60, "h": 24}
+_REDIS_TTL_SECONDS = {"m": 2 * 3600, "h": 26 * 3600}
+_REDIS_KEY_PREFIX = "latency:sketch"
+
+
+def get_worker_id() -> str:
+    """워커 식별자 (호스트명:PID)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _redis_key(unit: str, bucket: int) -> str:
+    return f"{_REDIS_KEY_PREFIX}:{unit}:{bucket}"
+
+
+class RollingLatencyAggregator:
+    """단계별 롤링 윈도우 지연시간 스케치 (워커 로컬 + Redis 병합)"""
+
+    def __init__(self, relative_accuracy: float = 0.01, worker_id: Optional[str] = None):
+        """
+        Args:
+            relative_accuracy: DDSketch 상대 오차
+            worker_id: 워커 식별자 (기본: 호스트명:PID)
+        """
+        self.relative_accuracy = relative_accuracy
+        self.worker_id = worker_id or get_worker_id()
+
+        # unit → {bucket_epoch: {stage: DDSketch}}
+        self._buckets: Dict[str, Dict[int, Dict[str, DDSketch]]] = {"m": {}, "h": {}}
+        # 마지막 flush 이후 변경된 (unit, bucket)
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+
+    # ---------- 기록 ----------
+
+    def record(self, stage: str, value: Optional[float], ts: Optional[float] = None):
+        """
+        지연시간 1건 기록
+
+        Args:
+            stage: 단계 이름 (STAGES 중 하나)
+            value: 지연시간 (초)
+            ts: 관측 시각 (기본: 현재)
+        """
+        if value is None:
+            return
+        ts = ts if ts is not None else time.time()
+
+        with self._lock:
+            for unit, seconds in _BUCKET_SECONDS.items():
+                bucket = int(ts // seconds)
+                stages = self._buckets[unit].setdefault(bucket, {})
+                sketch = stages.get(stage)
+                if sketch is None:
+                    sketch = DDSketch(self.relative_accuracy)
+                    stages[stage] = sketch
+                sketch.add(value)
+                self._dirty.add((unit, bucket))
+            self._prune_locked(ts)
+
+    def _prune_locked(self, now: float):
+        for unit, seconds in _BUCKET_SECONDS.items():
+            oldest = int(now // seconds) - _BUCKET_RETENTION[unit]
+            buckets = self._buckets[unit]
+            if buckets and min(buckets) <= oldest:
+                for bucket in [b for b in buckets if b <= oldest]:
+                    del buckets[bucket]
+
+    # ---------- 조회 ----------
+
+    @staticmethod
+    def _window_buckets(window: str, now: float) -> Tuple[str, Iterable[int]]:
+        unit, size = WINDOWS[window]
+        current = int(now // _BUCKET_SECONDS[unit])
+        return unit, range(current - size + 1, current + 1)
+
+    def local_snapshot(self, now: Optional[float] = None) -> Dict:
+        """이 워커의 윈도우별/단계별 분위수 {window: {stage: summary}}"""
+        now = now if now is not None else time.time()
+        result = {}
+
+        with self._lock:
+            for window in WINDOWS:
+                unit, buckets = self._window_buckets(window, now)
+                merged: Dict[str, DDSketch] = {}
+                for bucket in buckets:
+                    for stage, sketch in self._buckets[unit].get(bucket, {}).items():
+                        merged.setdefault(stage, DDSketch(self.relative_accuracy)).merge(sketch)
+                result[window] = {
+                    stage: merged[stage].summary() if stage in merged else DDSketch().summary()
+                    for stage in STAGES
+                }
+
+        return result
+
+    # ---------- Redis 병합 ----------
+
+    def flush_to_redis(self) -> bool:
+        """
+        변경된 버킷의 스케치를 Redis에 기록 (동기 - to_thread에서 호출)
+
+        Returns:
+            bool: 기록 성공 여부 (변경 없음 포함)
+        """
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+            payload = []
+            for unit, bucket in dirty:
+                stages = self._buckets[unit].get(bucket)
+                if not stages:
+                    continue
+                fields = {
+                    f"{self.worker_id}|{stage}": json.dumps(sketch.to_dict(), separators=(",", ":"))
+                    for stage, sketch in stages.items()
+                }
+                payload.append((unit, bucket, fields))
+
+        if not payload:
+            return True
+
+        client = get_redis()
+        if client is None:
+            self._restore_dirty(dirty)
+            return False
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for unit, bucket, fields in payload:
+                key = _redis_key(unit, bucket)
+                pipe.hset(key, mapping=fields)
+                pipe.expire(key, _REDIS_TTL_SECONDS[unit])
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ 지연시간 스케치 Redis 기록 실패: {e}")
+            reset_redis(client)
+            self._restore_dirty(dirty)
+            return False
+
+    def _restore_dirty(self, dirty: set):
+        with self._lock:
+            self._dirty |= dirty
+
+    def fleet_snapshot(self, now: Optional[float] = None) -> Optional[Dict]:
+        """
+        Redis에 모인 전체 워커 스케치를 병합한 분위수
+
+        Returns:
+            {"fleet": {window: {stage: summary}},
+             "workers": {worker_id: {window: {stage: summary}}}}
+            Redis 사용 불가 시 None
+        """
+        now = now if now is not None else time.time()
+        client = get_redis()
+        if client is None:
+            return None
+
+        keys = []
+        for unit in _BUCKET_SECONDS:
+            size = max(s for u, s in WINDOWS.values() if u == unit)
+            current = int(now // _BUCKET_SECONDS[unit])
+            keys.extend((unit, b) for b in range(current - size + 1, current + 1))
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for unit, bucket in keys:
+                pipe.hgetall(_redis_key(unit, bucket))
+            raw_buckets = dict(zip(keys, pipe.execute()))
+        except Exception as e:
+            logger.warning(f"⚠️ 지연시간 스케치 Redis 조회 실패: {e}")
+            reset_redis(client)
+            return None
+
+        fleet: Dict[str, Dict[str, DDSketch]] = {}
+        workers: Dict[str, Dict[str, Dict[str, DDSketch]]] = {}
+
+        for window in WINDOWS:
+            unit, buckets = self._window_buckets(window, now)
+            fleet_window = fleet.setdefault(window, {})
+            for bucket in buckets:
+                for field, value in (raw_buckets.get((unit, bucket)) or {}).items():
+                    worker_id, _, stage = field.rpartition("|")
+                    try:
+                        sketch = DDSketch.from_dict(json.loads(value))
+                    except Exception:
+                        continue
+                    fleet_window.setdefault(stage, DDSketch(sketch.relative_accuracy)).merge(sketch)
+                    worker_window = workers.setdefault(worker_id, {}).setdefault(window, {})
+                    worker_window.setdefault(stage, DDSketch(sketch.relative_accuracy)).merge(sketch)
+
+        def summarize(windows: Dict[str, Dict[str, DDSketch]]) -> Dict:
+            return {
+                window: {
+                    stage: windows.get(window, {}).get(stage, DDSketch()).summary()
+                    for stage in STAGES
+                }
+                for window in WINDOWS
+            }
+
+        return {
+            "fleet": summarize(fleet),
+            "workers": {worker_id: summarize(w) for worker_id, w in workers.items()},
+        }
+
+    async def run_flush_loop(self, interval_seconds: float):
+        """주기적으로 Redis에 스케치 병합 (lifespan에서 백그라운드 태스크로 실행)"""
+        logger.info(f"📊 지연시간 스케치 병합 루프 시작 (worker={self.worker_id}, {interval_seconds}초 주기)")
+        try:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                await asyncio.to_thread(self.flush_to_redis)
+        except asyncio.CancelledError:
+            # 종료 직전 마지막 구간까지 반영
+            await asyncio.to_thread(self.flush_to_redis)
+            raise
+
+
+# 전역 집계기 (프로세스당 1개)
+fleet_latency = RollingLatencyAggregator(
+    relative_accuracy=settings.LATENCY_SKETCH_RELATIVE_ACCURACY
+)
@@ -0,0 +1,114 @@
+"""
+공용 비동기 HTTP 클라이언트 (외부 API 연결 재사용)
+- OpenAI / Clova / RTZR / Cartesia 요청이 프로세스 공용 httpx.AsyncClient 1개를 사용
+  (HTTP/2, keep-alive 유지 시간 HTTP_KEEPALIVE_EXPIRY_SECONDS)
+- 요청마다 httpcore trace로 새 TCP 연결을 열었는지 확인해 제공자별 warm(기존 연결 재사용) /
+  cold(새 연결: DNS + TCP + TLS) 횟수 집계
+- 미리 연결(prewarming) 중 요청은 집계에서 따로 셈
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import settings
+
+# 호스트 → 제공자 이름 (집계 키)
+_VENDOR_HOSTS = {
+    "api.openai.com": "openai",
+    "naveropenapi.apigw.ntruss.com": "clova",
+    "api.cartesia.ai": "cartesia",
+}
+
+_prewarming = contextvars.ContextVar("http_prewarming", default=False)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def vendor_for_host(host: str) -> str:
+    if host == settings.RTZR_API_HOST:
+        return "rtzr"
+    return _VENDOR_HOSTS.get(host, host)
+
+
+@contextmanager
+def prewarming():
+    """이 블록 안의 요청은 미리 연결 요청으로 집계"""
+    token = _prewarming.set(True)
+    try:
+        yield
+    finally:
+        _prewarming.reset(token)
+
+
+class ConnectionStats:
+    """제공자별 warm / cold 연결 사용 횟수 (워커 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vendors: Dict[str, Dict[str, int]] = {}
+
+    def record(self, vendor: str, cold: bool, prewarm: bool):
+        with self._lock:
+            stats = self._vendors.setdefault(vendor, {"requests": 0, "warm": 0, "cold": 0, "prewarm": 0})
+            if prewarm:
+                stats["prewarm"] += 1
+                return
+            stats["requests"] += 1
+            stats["cold" if cold else "warm"] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            vendors = {name: dict(stats) for name, stats in self._vendors.items()}
+        for stats in vendors.values():
+            stats["warm_rate"] = (stats["warm"] / stats["requests"]) if stats["requests"] else None
+        return vendors
+
+
+connection_stats = ConnectionStats()
+
+
+async def _on_request(request: httpx.Request):
+    state = {"cold": False}
+
+    async def trace(event_name: str, info: Dict):
+        # 풀에 재사용할 연결이 없을 때만 connect_tcp 이벤트 발생
+        if event_name.startswith("connection.connect_tcp."):
+            state["cold"] = True
+
+    request.extensions["trace"] = trace
+    request.extensions["connection_state"] = state
+
+
+async def _on_response(response: httpx.Response):
+    state = response.request.extensions.get("connection_state")
+    if state is not None:
+        connection_stats.record(vendor_for_host(response.request.url.host), state["cold"], _prewarming.get())
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """프로세스 공용 AsyncClient (닫혀 있으면 새로 생성)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            event_hooks={"request": [_on_request], "response": [_on_response]},
+        )
+    return _client
+
+
+async def close_http_client():
+    """lifespan 종료 시 호출"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
@@ -0,0 +1,207 @@
+"""
+병합 가능한 분위수 스케치 (DDSketch)
+상대 오차를 보장하는 로그 버킷 히스토그램으로, 여러 통화/워커의 지연시간 분포를
+정렬 없이 누적하고 합칠 수 있음
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+
+class DDSketch:
+    """
+    DDSketch 구현 (양수 값 전용)
+
+    값 v는 ceil(log_gamma(v)) 버킷에 카운트되며, 분위수는 버킷 대표값
+    2·gamma^k / (gamma + 1)로 복원됨 → 상대 오차 relative_accuracy 이내
+    """
+
+    __slots__ = (
+        "relative_accuracy",
+        "_gamma",
+        "_log_gamma",
+        "_min_value",
+        "bins",
+        "zero_count",
+        "count",
+        "sum",
+        "min",
+        "max",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        """
+        Args:
+            relative_accuracy: 분위수 상대 오차 (0.01 = 1%)
+            min_value: 이 값 이하는 0 버킷으로 집계 (초 단위 기준 1µs)
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy는 0과 1 사이여야 합니다")
+
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._min_value = min_value
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2.0 * math.pow(self._gamma, key) / (self._gamma + 1)
+
+    def add(self, value: float, weight: int = 1):
+        """값 추가 (음수는 0으로 취급)"""
+        if value is None:
+            return
+        if value < 0:
+            value = 0.0
+
+        if value <= self._min_value:
+            self.zero_count += weight
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + weight
+
+        self.count += weight
+        self.sum += value * weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "DDSketch"):
+        """다른 스케치를 현재 스케치에 병합 (동일한 relative_accuracy 필요)"""
+        if other.count == 0:
+            return
+        if other._gamma != self._gamma:
+            raise ValueError("relative_accuracy가 다른 스케치는 병합할 수 없습니다")
+
+        for key, cnt in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + cnt
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수 (0 ≤ q ≤ 1) 추정값"""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                # 실제 관측 범위를 벗어나지 않도록 보정
+                return min(max(self._value(key), self.min), self.max)
+
+        return self.max
+
+    def summary(self) -> Dict:
+        """performance_metrics 통계 형식과 동일한 요약"""
+        if self.count == 0:
+            return {
+                "count": 0,
+                "avg": None,
+                "min": None,
+                "max": None,
+                "p50": None,
+                "p95": None,
+                "p99": None
+            }
+
+        return {
+            "count": self.count,
+            "avg": self.sum / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+    def to_dict(self) -> Dict:
+        """직렬화 (Redis 저장용)"""
+        return {
+            "a": self.relative_accuracy,
+            "b": {str(k): v for k, v in self.bins.items()},
+            "z": self.zero_count,
+            "n": self.count,
+            "s": self.sum,
+            "lo": self.min,
+            "hi": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DDSketch":
+        """to_dict() 결과로부터 복원"""
+        sketch = cls(relative_accuracy=data["a"])
+        sketch.bins = {int(k): int(v) for k, v in data.get("b", {}).items()}
+        sketch.zero_count = int(data.get("z", 0))
+        sketch.count = int(data.get("n", 0))
+        sketch.sum = float(data.get("s", 0.0))
+        sketch.min = data.get("lo")
+        sketch.max = data.get("hi")
+        return sketch
+
+
+class RollingDDSketch:
+    """
+    최근 구간만 반영하는 스케치 (현재 + 직전 구간 병합, window_seconds마다 교체)
+
+    헤징 기준처럼 최근 지연시간 변화에 따라가야 하는 분위수용 (스레드 안전)
+    """
+
+    def __init__(self, window_seconds: float = 300, relative_accuracy: float = 0.01):
+        self.window_seconds = window_seconds
+        self.relative_accuracy = relative_accuracy
+        self._lock = threading.Lock()
+        self._current = DDSketch(relative_accuracy=relative_accuracy)
+        self._previous: Optional[DDSketch] = None
+        self._window_started = time.time()
+
+    def _rotate_locked(self, now: float):
+        if now - self._window_started >= self.window_seconds:
+            # 두 구간 이상 비어 있었으면 직전 구간도 오래된 값이므로 버림
+            stale = now - self._window_started >= 2 * self.window_seconds
+            self._previous = None if stale else self._current
+            self._current = DDSketch(relative_accuracy=self.relative_accuracy)
+            self._window_started = now
+
+    def add(self, value: float):
+        with self._lock:
+            self._rotate_locked(time.time())
+            self._current.add(value)
+
+    def merged(self) -> DDSketch:
+        """최근 구간 스케치 사본"""
+        with self._lock:
+            self._rotate_locked(time.time())
+            merged = DDSketch(relative_accuracy=self.relative_accuracy)
+            merged.merge(self._current)
+            if self._previous is not None:
+                merged.merge(self._previous)
+            return merged
+
+    def quantile(self, q: float, min_count: int = 1) -> Optional[float]:
+        """최근 구간 q 분위수 (표본이 min_count 미만이면 None)"""
+        merged = self.merged()
+        if merged.count < max(min_count, 1):
+            return None
+        return merged.quantile(q)
@@ -0,0 +1,186 @@
+"""
+이벤트 루프 상태 모니터 (API 프로세스 상시 실행)
+- 지연(lag) 측정: 주기적으로 sleep 후 예정 시각 대비 늦어진 시간을 기록
+- 느린 콜백 감지: 별도 워치독 스레드가 루프 하트비트가 임계값 이상 멈추면
+  그 순간 루프 스레드의 스택을 캡처 (= 루프를 막고 있는 코드)
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.utils.fleet_latency import fleet_latency
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_STAGE = "event_loop_lag"
+
+
+class EventLoopMonitor:
+    """이벤트 루프 지연 측정 + 느린 콜백 스택 캡처"""
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        slow_callback_threshold: float = 0.1,
+        history_size: int = 50,
+    ):
+        """
+        Args:
+            interval: 하트비트 주기 (초)
+            slow_callback_threshold: 이 시간 이상 루프가 멈추면 느린 콜백으로 기록 (초)
+            history_size: 보관할 느린 콜백 이벤트 수
+        """
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+        self._last_tick = time.perf_counter()
+        self._lock = threading.Lock()
+        self._current_stall: Optional[Dict] = None
+        self._slow_callbacks: deque = deque(maxlen=history_size)
+        self.slow_callbacks_total = 0
+        self.max_lag = 0.0
+        self.started_at: Optional[float] = None
+
+    # ---------- 루프 측 ----------
+
+    async def _run(self):
+        expected = time.perf_counter() + self.interval
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            expected = now + self.interval
+
+            with self._lock:
+                self._last_tick = now
+                stall = self._current_stall
+                self._current_stall = None
+            if stall is not None:
+                # 워치독이 잡은 정체 구간 종료 → 실제 차단 시간 확정
+                stall["blocked_seconds"] = now - stall["_stall_started"]
+                logger.warning(
+                    f"🐢 이벤트 루프 차단 {stall['blocked_seconds'] * 1000:.0f}ms "
+                    f"({stall['location']})"
+                )
+
+            if lag > self.max_lag:
+                self.max_lag = lag
+            fleet_latency.record(LOOP_LAG_STAGE, lag)
+
+    # ---------- 워치독 스레드 ----------
+
+    def _watch(self):
+        check_interval = max(self.slow_callback_threshold / 2, 0.01)
+        while not self._stop_event.wait(check_interval):
+            now = time.perf_counter()
+            with self._lock:
+                last_tick = self._last_tick
+                stalled_for = now - last_tick - self.interval
+                if stalled_for < self.slow_callback_threshold or self._current_stall is not None:
+                    continue
+
+            stack = self._capture_loop_stack()
+            event = {
+                "detected_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+                "blocked_seconds": stalled_for,  # 루프 재개 시 최종값으로 갱신
+                "location": stack[-1].strip().splitlines()[0] if stack else "unknown",
+                "stack": stack,
+                "_stall_started": last_tick + self.interval,
+            }
+
+            with self._lock:
+                # 캡처 도중 루프가 재개되었으면 다른 코드의 스택이므로 버림
+                if self._last_tick != last_tick:
+                    continue
+                self._current_stall = event
+                self._slow_callbacks.append(event)
+                self.slow_callbacks_total += 1
+
+    def _capture_loop_stack(self) -> List[str]:
+        if self._loop_thread_id is None:
+            return []
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)
+
+    # ---------- 시작/종료 ----------
+
+    async def start(self):
+        """lifespan 시작 시 호출 (실행 중인 루프 스레드 기준)"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self.started_at = time.time()
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"🩺 이벤트 루프 모니터 시작 (주기 {self.interval * 1000:.0f}ms, "
+            f"느린 콜백 임계값 {self.slow_callback_threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self):
+        """lifespan 종료 시 호출"""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._watchdog = None
+
+    # ---------- 조회 ----------
+
+    def snapshot(self) -> Dict:
+        """디버그 엔드포인트용 상태"""
+        with self._lock:
+            events = [
+                {k: v for k, v in event.items() if not k.startswith("_")}
+                for event in reversed(self._slow_callbacks)
+            ]
+            stalled_now = self._current_stall is not None
+
+        lag_windows = {
+            window: stages.get(LOOP_LAG_STAGE)
+            for window, stages in fleet_latency.local_snapshot().items()
+        }
+
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "started_at": self.started_at,
+            "interval_seconds": self.interval,
+            "slow_callback_threshold_seconds": self.slow_callback_threshold,
+            "max_lag_seconds": self.max_lag,
+            "lag": lag_windows,
+            "stalled_now": stalled_now,
+            "slow_callbacks_total": self.slow_callbacks_total,
+            "recent_slow_callbacks": events,
+        }
+
+
+# 전역 모니터 (API 프로세스당 1개)
+event_loop_monitor = EventLoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    slow_callback_threshold=settings.LOOP_SLOW_CALLBACK_SECONDS,
+    history_size=settings.LOOP_SLOW_CALLBACK_HISTORY,
+)
@@ -6,11 +6,15 @@
 import json
 import logging
 import time
+from array import array
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 import statistics
 
+from app.utils.fleet_latency import fleet_latency
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +44,110 @@ def format_timestamp(ts: float, call_start_time: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
 
 
+# 통계 계산 단계 (PerformanceMetricsCollector 누적 시계열 순서)
+STAT_STAGES = (
+    "stt_latency",
+    "stt_partial_latency",
+    "llm_first_token_latency",
+    "llm_completion_latency",
+    "tts_latency",
+    "first_token_to_first_tts_completion_latency",
+    "stt_to_first_audio_latency",
+    "e2e_latency",
+)
+
+
+@dataclass(slots=True)
+class TurnMetrics:
+    """
+    대화 턴 1개 메트릭 (통화 중 메모리 보관용 평면 구조)
+
+    JSON 저장 시 to_dict()로 기존 중첩 형식(stt/llm/tts/e2e/...)으로 변환
+    """
+    turn_number: int
+    user_utterance: str
+    turn_start_time: float
+    ai_response: str = ""
+    fast_path: Optional[str] = None  # 템플릿 응답 분류 (LLM 생략 시)
+
+    # STT
+    user_speech_start_time: Optional[float] = None  # 사용자가 실제로 말하기 시작한 시점
+    first_partial_time: Optional[float] = None  # STT 첫 부분 인식 시간
+    final_recognition_time: Optional[float] = None  # STT 최종 인식 시간
+    stt_latency: Optional[float] = None  # user_speech_start_time → final_recognition_time
+    stt_partial_latency: Optional[float] = None  # user_speech_start_time → first_partial_time
+
+    # LLM
+    llm_first_token_time: Optional[float] = None
+    llm_completion_time: Optional[float] = None
+    llm_first_token_latency: Optional[float] = None
+    llm_completion_latency: Optional[float] = None
+
+    # TTS
+    tts_start_time: Optional[float] = None
+    tts_completion_time: Optional[float] = None
+    tts_first_completion_time: Optional[float] = None
+    tts_latency: Optional[float] = None
+    first_token_to_first_tts_completion_latency: Optional[float] = None
+
+    # E2E
+    turn_end_time: Optional[float] = None
+    e2e_latency: Optional[float] = None
+    stt_to_first_audio_latency: Optional[float] = None  # STT 완료 → 첫 음성 출력까지의 시간
+
+    # 턴 종료 시점의 단계별 누적 개수 (통계는 저장 시 시계열 앞부분으로 재계산)
+    stats_counts: Optional[Tuple[int, ...]] = None
+
+    def to_dict(self, call_start_time: float, statistics: Dict) -> Dict:
+        """JSON 저장 형식 (시:분:초.밀리초 형식 포함)"""
+        ended = self.stats_counts is not None  # 시각 문자열은 종료된 턴만 추가
+
+        def with_formatted(section: Dict, keys: Tuple[str, ...]) -> Dict:
+            for key in keys:
+                if ended and section[key]:
+                    section[f"{key}_formatted"] = format_timestamp(section[key], call_start_time)
+            return section
+
+        turn = {
+            "turn_number": self.turn_number,
+            "user_utterance": self.user_utterance,
+            "ai_response": self.ai_response,
+            "turn_start_time": self.turn_start_time,
+            "fast_path": self.fast_path,
+            "stt": with_formatted({
+                "user_speech_start_time": self.user_speech_start_time,
+                "first_partial_time": self.first_partial_time,
+                "final_recognition_time": self.final_recognition_time,
+                "latency": self.stt_latency,
+                "partial_latency": self.stt_partial_latency,
+            }, ("user_speech_start_time", "first_partial_time", "final_recognition_time")),
+            "llm": with_formatted({
+                "first_token_time": self.llm_first_token_time,
+                "completion_time": self.llm_completion_time,
+                "first_token_latency": self.llm_first_token_latency,
+                "completion_latency": self.llm_completion_latency,
+            }, ("first_token_time", "completion_time")),
+            "tts": with_formatted({
+                "start_time": self.tts_start_time,
+                "completion_time": self.tts_completion_time,
+                "first_completion_time": self.tts_first_completion_time,
+                "latency": self.tts_latency,
+                "first_token_to_first_tts_completion_latency": self.first_token_to_first_tts_completion_latency,
+            }, ("start_time", "first_completion_time", "completion_time")),
+            "e2e": with_formatted({
+                "turn_end_time": self.turn_end_time,
+                "latency": self.e2e_latency,
+            }, ("turn_end_time",)),
+            "stt_to_first_audio": {
+                "latency": self.stt_to_first_audio_latency,
+            },
+            "statistics": statistics,  # 턴 종료 시점까지의 통계 (p50, p95, p99)
+        }
+        if ended and self.turn_start_time:
+            turn["turn_start_time_formatted"] = format_timestamp(self.turn_start_time, call_start_time)
+        return turn
+
+
 class PerformanceMetricsCollector:
     """통화 성능 메트릭 수집기"""
     
@@ -61,28 +169,27 @@ class PerformanceMetricsCollector:
         # JSON 파일 경로 (통화 시작 시각을 파일명으로)
         self.metrics_file = self.output_dir / f"call_metrics_{self.call_start_timestamp}_{call_sid[:8]}.json"
         
-        # 메트릭 데이터 구조
-        self.metrics = {
-            "call_sid": call_sid,
-            "call_start_time": self.call_start_timestamp,
-            "call_start_datetime": self.call_start_datetime.strftime("%Y-%m-%d %H:%M:%S"),
-            "turns": [],  # 각 대화 턴별 메트릭
-            "summary": {}  # 통화 종료 시 전체 통계
-        }
+        # 턴별 메트릭 (TurnMetrics 목록)
+        self.turns: List[TurnMetrics] = []
+        self.summary: Dict = {}  # 통화 종료 시 전체 통계
         
-        # 누적 데이터 (통계 계산용)
-        self._stt_latencies: List[float] = []
-        self._stt_partial_latencies: List[float] = []
-        self._llm_first_token_latencies: List[float] = []
-        self._llm_completion_latencies: List[float] = []
-        self._tts_latencies: List[float] = []
-        self._first_token_to_first_tts_completion_latencies: List[float] = []  # LLM 첫 토큰 → 첫 TTS 완료
-        self._stt_to_first_audio_latencies: List[float] = []  # STT 완료 → 첫 음성 출력
-        self._e2e_latencies: List[float] = []
+        # 누적 데이터 (통계 계산용, 단계별 float 배열)
+        self._series: Dict[str, array] = {stage: array("d") for stage in STAT_STAGES}
         
         logger.info(f"📊 성능 메트릭 수집기 초기화: {self.metrics_file}")
     
-    def start_turn(self, user_utterance: str, turn_start_time: float) -> Dict:
+    def _record_latency(self, stage: str, value: float):
+        """통화별 누적 배열과 전체 통화 롤링 스케치에 동시 기록"""
+        self._series[stage].append(value)
+        fleet_latency.record(stage, value)
+    
+    def get_turn(self, turn_index: Optional[int]) -> Optional[TurnMetrics]:
+        """턴 인덱스 → TurnMetrics (범위 밖이면 None)"""
+        if turn_index is None or not (0 <= turn_index < len(self.turns)):
+            return None
+        return self.turns[turn_index]
+    
+    def start_turn(self, user_utterance: str, turn_start_time: float) -> TurnMetrics:
         """
         새로운 대화 턴 시작
         
@@ -91,52 +198,21 @@ class PerformanceMetricsCollector:
             turn_start_time: 턴 시작 시간
             
         Returns:
-            turn_metrics: 턴 메트릭 딕셔너리
+            turn_metrics: 턴 메트릭
         """
-        turn_metrics = {
-            "turn_number": len(self.metrics["turns"]) + 1,
-            "user_utterance": user_utterance,
-            "ai_response": "",
-            "turn_start_time": turn_start_time,
-            "stt": {
-                "user_speech_start_time": None,  # 사용자가 실제로 말하기 시작한 시점
-                "first_partial_time": None,  # STT 첫 부분 인식 시간
-                "final_recognition_time": None,  # STT 최종 인식 시간
-                "latency": None,  # user_speech_start_time → final_recognition_time
-                "partial_latency": None  # user_speech_start_time → first_partial_time
-            },
-            "llm": {
-                "first_token_time": None,
-                "completion_time": None,
-                "first_token_latency": None,
-                "completion_latency": None
-            },
-            "tts": {
-                "start_time": None,
-                "completion_time": None,
-                "first_completion_time": None,
-                "latency": None,
-                "first_token_to_first_tts_completion_latency": None
-            },
-            "e2e": {
-                "turn_end_time": None,
-                "latency": None
-            },
-            "stt_to_first_audio": {
-                "latency": None  # STT 완료 → 첫 음성 출력까지의 시간
-            },
-            "statistics": {}  # 현재까지의 통계 (p50, p95, p99)
-        }
-        
-        self.metrics["turns"].append(turn_metrics)
+        turn_metrics = TurnMetrics(
+            turn_number=len(self.turns) + 1,
+            user_utterance=user_utterance,
+            turn_start_time=turn_start_time,
+        )
+        self.turns.append(turn_metrics)
         return turn_metrics
     
     def record_user_speech_start(self, turn_index: int, speech_start_time: float):
         """사용자 발화 시작 시간 기록 (STT 첫 부분 인식 시점)"""
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            if turn["stt"]["user_speech_start_time"] is None:
-                turn["stt"]["user_speech_start_time"] = speech_start_time
+        turn = self.get_turn(turn_index)
+        if turn and turn.user_speech_start_time is None:
+            turn.user_speech_start_time = speech_start_time
     
     def record_stt_partial(self, turn_index: int, partial_time: float, speech_start_time: float = None):
         """
@@ -147,22 +223,23 @@ class PerformanceMetricsCollector:
             partial_time: 부분 인식 시간
             speech_start_time: 사용자 발화 시작 시간 (있는 경우)
         """
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            
-            # 사용자 발화 시작 시간이 제공되면 기록
-            if speech_start_time is not None and turn["stt"]["user_speech_start_time"] is None:
-                turn["stt"]["user_speech_start_time"] = speech_start_time
+        turn = self.get_turn(turn_index)
+        if not turn:
+            return
+        
+        # 사용자 발화 시작 시간이 제공되면 기록
+        if speech_start_time is not None and turn.user_speech_start_time is None:
+            turn.user_speech_start_time = speech_start_time
+        
+        # 첫 부분 인식 시간 기록
+        if turn.first_partial_time is None:
+            turn.first_partial_time = partial_time
             
-            # 첫 부분 인식 시간 기록
-            if turn["stt"]["first_partial_time"] is None:
-                turn["stt"]["first_partial_time"] = partial_time
-                
-                # 부분 지연시간 계산: 사용자 발화 시작 → 첫 부분 인식
-                reference_time = turn["stt"]["user_speech_start_time"] or turn["turn_start_time"]
-                if reference_time:
-                    turn["stt"]["partial_latency"] = partial_time - reference_time
-                    self._stt_partial_latencies.append(turn["stt"]["partial_latency"])
+            # 부분 지연시간 계산: 사용자 발화 시작 → 첫 부분 인식
+            reference_time = turn.user_speech_start_time or turn.turn_start_time
+            if reference_time:
+                turn.stt_partial_latency = partial_time - reference_time
+                self._record_latency("stt_partial_latency", turn.stt_partial_latency)
     
     def record_stt_final(self, turn_index: int, final_time: float):
         """
@@ -172,40 +249,49 @@ class PerformanceMetricsCollector:
             turn_index: 턴 인덱스
             final_time: 최종 인식 시간
         """
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            turn["stt"]["final_recognition_time"] = final_time
-            
-            # STT 지연시간 계산: 사용자 발화 시작 → 최종 인식
-            reference_time = turn["stt"]["user_speech_start_time"] or turn["turn_start_time"]
-            if reference_time:
-                turn["stt"]["latency"] = final_time - reference_time
-                self._stt_latencies.append(turn["stt"]["latency"])
+        turn = self.get_turn(turn_index)
+        if not turn:
+            return
+        turn.final_recognition_time = final_time
+        
+        # STT 지연시간 계산: 사용자 발화 시작 → 최종 인식
+        reference_time = turn.user_speech_start_time or turn.turn_start_time
+        if reference_time:
+            turn.stt_latency = final_time - reference_time
+            self._record_latency("stt_latency", turn.stt_latency)
     
     def record_llm_first_token(self, turn_index: int, first_token_time: float):
         """LLM 첫 토큰 생성 시간 기록"""
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            turn["llm"]["first_token_time"] = first_token_time
-            if turn["stt"]["final_recognition_time"]:
-                turn["llm"]["first_token_latency"] = first_token_time - turn["stt"]["final_recognition_time"]
-                self._llm_first_token_latencies.append(turn["llm"]["first_token_latency"])
+        turn = self.get_turn(turn_index)
+        if not turn:
+            return
+        turn.llm_first_token_time = first_token_time
+        if turn.final_recognition_time:
+            turn.llm_first_token_latency = first_token_time - turn.final_recognition_time
+            self._record_latency("llm_first_token_latency", turn.llm_first_token_latency)
     
     def record_llm_completion(self, turn_index: int, completion_time: float, ai_response: str):
         """LLM 완료 시간 기록"""
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            turn["ai_response"] = ai_response
-            turn["llm"]["completion_time"] = completion_time
-            if turn["llm"]["first_token_time"]:
-                turn["llm"]["completion_latency"] = completion_time - turn["llm"]["first_token_time"]
-                self._llm_completion_latencies.append(turn["llm"]["completion_latency"])
+        turn = self.get_turn(turn_index)
+        if not turn:
+            return
+        turn.ai_response = ai_response
+        turn.llm_completion_time = completion_time
+        if turn.llm_first_token_time:
+            turn.llm_completion_latency = completion_time - turn.llm_first_token_time
+            self._record_latency("llm_completion_latency", turn.llm_completion_latency)
+    
+    def record_fast_path(self, turn_index: int, category: str):
+        """LLM 없이 템플릿으로 응답한 턴 표시 (greeting / short_ack / farewell)"""
+        turn = self.get_turn(turn_index)
+        if turn:
+            turn.fast_path = category
     
     def record_tts_start(self, turn_index: int, tts_start_time: float):
         """TTS 시작 시간 기록"""
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            turn["tts"]["start_time"] = tts_start_time
+        turn = self.get_turn(turn_index)
+        if turn:
+            turn.tts_start_time = tts_start_time
     
     def record_tts_completion(self, turn_index: int, tts_completion_time: float, is_first_sentence: bool = False):
         """
@@ -216,142 +302,145 @@ class PerformanceMetricsCollector:
             tts_completion_time: TTS 완료 시간
             is_first_sentence: 첫 번째 문장인지 여부 (첫 문장의 TTS 완료 시간만 정확히 기록)
         """
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            turn["tts"]["completion_time"] = tts_completion_time
+        turn = self.get_turn(turn_index)
+        if not turn:
+            return
+        turn.tts_completion_time = tts_completion_time
+        
+        # 첫 TTS 완료 시간 기록 (첫 번째 문장의 TTS 완료 시간만 기록)
+        # LLM 첫 토큰부터 첫 TTS 완료까지의 지연시간 계산용
+        if is_first_sentence and turn.tts_first_completion_time is None:
+            # 타임스탬프 검증: first_token_time보다 이후인지 확인
+            if turn.llm_first_token_time:
+                if tts_completion_time < turn.llm_first_token_time:
+                    # 음수값 방지: first_token_time을 기준으로 재계산
+                    logger.warning(
+                        f"⚠️ [메트릭] TTS 완료 시간이 LLM 첫 토큰 시간보다 빠름. "
+                        f"first_token_time={turn.llm_first_token_time:.6f}, "
+                        f"tts_completion_time={tts_completion_time:.6f}. "
+                        f"first_token_time 기준으로 조정합니다."
+                    )
+                    # first_token_time 이후의 최소 시간으로 설정 (0.001초 후)
+                    tts_completion_time = turn.llm_first_token_time + 0.001
             
-            # 첫 TTS 완료 시간 기록 (첫 번째 문장의 TTS 완료 시간만 기록)
-            # LLM 첫 토큰부터 첫 TTS 완료까지의 지연시간 계산용
-            if is_first_sentence and turn["tts"]["first_completion_time"] is None:
-                # 타임스탬프 검증: first_token_time보다 이후인지 확인
-                if turn["llm"]["first_token_time"]:
-                    if tts_completion_time < turn["llm"]["first_token_time"]:
-                        # 음수값 방지: first_token_time을 기준으로 재계산
-                        logger.warning(
-                            f"⚠️ [메트릭] TTS 완료 시간이 LLM 첫 토큰 시간보다 빠름. "
-                            f"first_token_time={turn['llm']['first_token_time']:.6f}, "
-                            f"tts_completion_time={tts_completion_time:.6f}. "
-                            f"first_token_time 기준으로 조정합니다."
-                        )
-                        # first_token_time 이후의 최소 시간으로 설정 (0.001초 후)
-                        tts_completion_time = turn["llm"]["first_token_time"] + 0.001
-                
-                turn["tts"]["first_completion_time"] = tts_completion_time
-                
-                # LLM 첫 토큰부터 첫 TTS 완료까지의 지연시간 계산
-                if turn["llm"]["first_token_time"]:
-                    latency = tts_completion_time - turn["llm"]["first_token_time"]
-                    # 음수값 방지 (타임스탬프 동기화 문제 대비)
-                    if latency < 0:
-                        logger.warning(
-                            f"⚠️ [메트릭] first_token_to_first_tts_completion_latency가 음수입니다. "
-                            f"latency={latency:.6f}. 0으로 설정합니다."
-                        )
-                        latency = 0.0
-                    turn["tts"]["first_token_to_first_tts_completion_latency"] = latency
-                    # 통계 계산용 리스트에 추가
-                    self._first_token_to_first_tts_completion_latencies.append(latency)
-                
-                # STT 완료부터 첫 음성 출력까지의 지연시간 계산
-                if turn["stt"]["final_recognition_time"]:
-                    latency = tts_completion_time - turn["stt"]["final_recognition_time"]
-                    # 음수값 방지
-                    if latency < 0:
-                        logger.warning(
-                            f"⚠️ [메트릭] stt_to_first_audio_latency가 음수입니다. "
-                            f"latency={latency:.6f}. 0으로 설정합니다."
-                        )
-                        latency = 0.0
-                    turn["stt_to_first_audio"]["latency"] = latency
-                    # 통계 계산용 리스트에 추가
-                    self._stt_to_first_audio_latencies.append(latency)
+            turn.tts_first_completion_time = tts_completion_time
             
-            # TTS 지연시간 계산 (start_time 기준)
-            if turn["tts"]["start_time"]:
-                latency = tts_completion_time - turn["tts"]["start_time"]
+            # LLM 첫 토큰부터 첫 TTS 완료까지의 지연시간 계산
+            if turn.llm_first_token_time:
+                latency = tts_completion_time - turn.llm_first_token_time
+                # 음수값 방지 (타임스탬프 동기화 문제 대비)
+                if latency < 0:
+                    logger.warning(
+                        f"⚠️ [메트릭] first_token_to_first_tts_completion_latency가 음수입니다. "
+                        f"latency={latency:.6f}. 0으로 설정합니다."
+                    )
+                    latency = 0.0
+                turn.first_token_to_first_tts_completion_latency = latency
+                # 통계 계산용 배열에 추가
+                self._record_latency("first_token_to_first_tts_completion_latency", latency)
+            
+            # STT 완료부터 첫 음성 출력까지의 지연시간 계산
+            if turn.final_recognition_time:
+                latency = tts_completion_time - turn.final_recognition_time
                 # 음수값 방지
                 if latency < 0:
                     logger.warning(
-                        f"⚠️ [메트릭] tts_latency가 음수입니다. "
+                        f"⚠️ [메트릭] stt_to_first_audio_latency가 음수입니다. "
                         f"latency={latency:.6f}. 0으로 설정합니다."
                     )
                     latency = 0.0
-                turn["tts"]["latency"] = latency
-                self._tts_latencies.append(latency)
+                turn.stt_to_first_audio_latency = latency
+                # 통계 계산용 배열에 추가
+                self._record_latency("stt_to_first_audio_latency", latency)
+        
+        # TTS 지연시간 계산 (start_time 기준)
+        if turn.tts_start_time:
+            latency = tts_completion_time - turn.tts_start_time
+            # 음수값 방지
+            if latency < 0:
+                logger.warning(
+                    f"⚠️ [메트릭] tts_latency가 음수입니다. "
+                    f"latency={latency:.6f}. 0으로 설정합니다."
+                )
+                latency = 0.0
+            turn.tts_latency = latency
+            self._record_latency("tts_latency", latency)
     
     def record_turn_end(self, turn_index: int, turn_end_time: float):
         """턴 종료 시간 기록 및 통계 계산"""
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            turn["e2e"]["turn_end_time"] = turn_end_time
-            if turn["turn_start_time"]:
-                turn["e2e"]["latency"] = turn_end_time - turn["turn_start_time"]
-                self._e2e_latencies.append(turn["e2e"]["latency"])
-            
-            # 현재까지의 통계 계산
-            turn["statistics"] = self._calculate_current_statistics()
-            
-            # 시:분:초.밀리초 형식 추가 (읽기 쉬운 형식)
-            self._add_formatted_times(turn_index)
-            
-            # 즉시 파일에 저장 (실시간 업데이트)
-            self._save_metrics()
+        turn = self.get_turn(turn_index)
+        if not turn:
+            return
+        turn.turn_end_time = turn_end_time
+        if turn.turn_start_time:
+            turn.e2e_latency = turn_end_time - turn.turn_start_time
+            self._record_latency("e2e_latency", turn.e2e_latency)
+        
+        # 현재까지의 통계 기준점 (단계별 누적 개수만 보관)
+        turn.stats_counts = tuple(len(self._series[stage]) for stage in STAT_STAGES)
+        
+        # 즉시 파일에 저장 (실시간 업데이트)
+        self._save_metrics()
     
-    def _add_formatted_times(self, turn_index: int):
-        """각 시간 값에 시:분:초.밀리초 형식 추가"""
-        if turn_index < len(self.metrics["turns"]):
-            turn = self.metrics["turns"][turn_index]
-            
-            # STT 시간 포맷팅
-            if turn["stt"]["user_speech_start_time"]:
-                turn["stt"]["user_speech_start_time_formatted"] = format_timestamp(
-                    turn["stt"]["user_speech_start_time"], self.call_start_time
-                )
-            if turn["stt"]["first_partial_time"]:
-                turn["stt"]["first_partial_time_formatted"] = format_timestamp(
-                    turn["stt"]["first_partial_time"], self.call_start_time
-                )
-            if turn["stt"]["final_recognition_time"]:
-                turn["stt"]["final_recognition_time_formatted"] = format_timestamp(
-                    turn["stt"]["final_recognition_time"], self.call_start_time
-                )
-            
-            # LLM 시간 포맷팅
-            if turn["llm"]["first_token_time"]:
-                turn["llm"]["first_token_time_formatted"] = format_timestamp(
-                    turn["llm"]["first_token_time"], self.call_start_time
-                )
-            if turn["llm"]["completion_time"]:
-                turn["llm"]["completion_time_formatted"] = format_timestamp(
-                    turn["llm"]["completion_time"], self.call_start_time
-                )
-            
-            # TTS 시간 포맷팅
-            if turn["tts"]["start_time"]:
-                turn["tts"]["start_time_formatted"] = format_timestamp(
-                    turn["tts"]["start_time"], self.call_start_time
-                )
-            if turn["tts"]["first_completion_time"]:
-                turn["tts"]["first_completion_time_formatted"] = format_timestamp(
-                    turn["tts"]["first_completion_time"], self.call_start_time
-                )
-            if turn["tts"]["completion_time"]:
-                turn["tts"]["completion_time_formatted"] = format_timestamp(
-                    turn["tts"]["completion_time"], self.call_start_time
-                )
+    def utterance_offsets(self, conversation: List[Dict]) -> List[float]:
+        """
+        대화 메시지별 통화 시작 기준 발화 시각 (초)
+        
+        턴 기록과 (역할, 내용)으로 뒤에서부터 대응시키며,
+        턴에 없는 메시지(종료 안내 등)는 직전 메시지 시각을 이어받음
+        
+        Args:
+            conversation: [{"role": "user"|"assistant", "content": "..."}, ...]
+        
+        Returns:
+            List[float]: conversation과 같은 길이의 오프셋 리스트
+        """
+        utterances = []
+        for turn in self.turns:
+            user_time = turn.user_speech_start_time or turn.turn_start_time
+            utterances.append(("user", turn.user_utterance, user_time))
             
-            # E2E 시간 포맷팅
-            if turn["turn_start_time"]:
-                turn["turn_start_time_formatted"] = format_timestamp(
-                    turn["turn_start_time"], self.call_start_time
-                )
-            if turn["e2e"]["turn_end_time"]:
-                turn["e2e"]["turn_end_time_formatted"] = format_timestamp(
-                    turn["e2e"]["turn_end_time"], self.call_start_time
+            if turn.ai_response:
+                ai_time = (
+                    turn.tts_first_completion_time
+                    or turn.llm_first_token_time
+                    or turn.turn_end_time
+                    or turn.turn_start_time
                 )
+                utterances.append(("assistant", turn.ai_response, ai_time))
+        
+        # 대화 세션은 최근 메시지만 유지되므로 끝에서부터 정렬
+        matched: List[Optional[float]] = [None] * len(conversation)
+        u = len(utterances) - 1
+        for i in range(len(conversation) - 1, -1, -1):
+            message = conversation[i]
+            j = u
+            while j >= 0:
+                role, content, ts = utterances[j]
+                if role == message.get("role") and content == message.get("content"):
+                    break
+                j -= 1
+            if j >= 0:
+                if utterances[j][2] is not None:
+                    matched[i] = max(0.0, utterances[j][2] - self.call_start_time)
+                u = j - 1
+        
+        offsets: List[float] = []
+        previous = 0.0
+        for value in matched:
+            if value is None or value < previous:
+                value = previous
+            offsets.append(value)
+            previous = value
+        return offsets
     
-    def _calculate_current_statistics(self) -> Dict:
-        """현재까지 수집된 데이터의 통계 계산"""
+    def _calculate_current_statistics(self, counts: Optional[Sequence[int]] = None) -> Dict:
+        """
+        현재까지 수집된 데이터의 통계 계산
+        
+        Args:
+            counts: 단계별 앞에서부터 사용할 개수 (턴 종료 시점 통계 재계산용, 없으면 전체)
+        """
         def percentile(data: List[float], p: float) -> Optional[float]:
             """퍼센타일 계산"""
             if not data:
@@ -364,7 +453,7 @@ class PerformanceMetricsCollector:
                 return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
             return sorted_data[f]
         
-        def safe_stats(data: List[float], name: str) -> Dict:
+        def safe_stats(data: Sequence[float]) -> Dict:
             """안전한 통계 계산"""
             if not data:
                 return {
@@ -387,28 +476,38 @@ class PerformanceMetricsCollector:
                 "p99": percentile(data, 0.99)
             }
         
+        if counts is None:
+            counts = [len(self._series[stage]) for stage in STAT_STAGES]
         return {
-            "stt_latency": safe_stats(self._stt_latencies, "stt_latency"),
-            "stt_partial_latency": safe_stats(self._stt_partial_latencies, "stt_partial_latency"),
-            "llm_first_token_latency": safe_stats(self._llm_first_token_latencies, "llm_first_token_latency"),
-            "llm_completion_latency": safe_stats(self._llm_completion_latencies, "llm_completion_latency"),
-            "tts_latency": safe_stats(self._tts_latencies, "tts_latency"),
-            "first_token_to_first_tts_completion_latency": safe_stats(
-                self._first_token_to_first_tts_completion_latencies,
-                "first_token_to_first_tts_completion_latency"
-            ),
-            "stt_to_first_audio_latency": safe_stats(
-                self._stt_to_first_audio_latencies,
-                "stt_to_first_audio_latency"
-            ),
-            "e2e_latency": safe_stats(self._e2e_latencies, "e2e_latency")
+            stage: safe_stats(self._series[stage][:count])
+            for stage, count in zip(STAT_STAGES, counts)
+        }
+    
+    def _turn_statistics(self, turn: TurnMetrics) -> Dict:
+        """턴 종료 시점까지의 통계 (진행 중인 턴은 빈 dict)"""
+        if turn.stats_counts is None:
+            return {}
+        return self._calculate_current_statistics(turn.stats_counts)
+    
+    def to_dict(self) -> Dict:
+        """JSON 저장 형식 (기존 파일 구조 유지)"""
+        return {
+            "call_sid": self.call_sid,
+            "call_start_time": self.call_start_timestamp,
+            "call_start_datetime": self.call_start_datetime.strftime("%Y-%m-%d %H:%M:%S"),
+            "turns": [
+                turn.to_dict(self.call_start_time, self._turn_statistics(turn))
+                for turn in self.turns
+            ],
+            "summary": self.summary,
         }
     
     def _save_metrics(self):
         """메트릭을 JSON 파일에 저장"""
         try:
+            metrics = self.to_dict()
             with open(self.metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(self.metrics, f, ensure_ascii=False, indent=2)
+                json.dump(metrics, f, ensure_ascii=False, indent=2)
         except Exception as e:
             logger.error(f"❌ 메트릭 저장 실패: {e}")
     
@@ -420,9 +519,9 @@ class PerformanceMetricsCollector:
         # 추가 통계 (통화 전체)
         call_duration = time.time() - self.call_start_time
         
-        self.metrics["summary"] = {
+        self.summary = {
             "call_duration_seconds": call_duration,
-            "total_turns": len(self.metrics["turns"]),
+            "total_turns": len(self.turns),
             "statistics": final_stats,
             "call_end_time": datetime.now().strftime("%Y%m%d_%H%M%S")
         }
@@ -431,8 +530,7 @@ class PerformanceMetricsCollector:
         self._save_metrics()
         
         logger.info(f"📊 최종 메트릭 저장 완료: {self.metrics_file}")
-        logger.info(f"   총 턴 수: {len(self.metrics['turns'])}")
+        logger.info(f"   총 턴 수: {len(self.turns)}")
         logger.info(f"   통화 시간: {call_duration:.2f}초")
         
         return self.metrics_file
-
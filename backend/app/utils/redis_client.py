@@ -0,0 +1,77 @@
+"""
+공용 Redis 클라이언트
+- redis 패키지는 지연 import (미설치/연결 실패 시 None 반환)
+- 연결 실패 후에는 잠시 재시도를 멈춰 호출 경로가 매번 타임아웃을 기다리지 않도록 함
+"""
+
+import logging
+import threading
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_RETRY_INTERVAL_SECONDS = 30
+
+_client = None
+_next_retry_at = 0.0
+_lock = threading.Lock()
+
+
+def get_redis():
+    """
+    공용 Redis 클라이언트 반환 (decode_responses=True)
+
+    Returns:
+        redis.Redis 또는 None (사용 불가 시)
+    """
+    global _client, _next_retry_at
+
+    if _client is not None:
+        return _client
+
+    if time.time() < _next_retry_at:
+        return None
+
+    with _lock:
+        if _client is not None:
+            return _client
+
+        redis_url = getattr(settings, "REDIS_URL", None)
+        if not redis_url:
+            _next_retry_at = time.time() + _RETRY_INTERVAL_SECONDS
+            return None
+
+        try:
+            import redis  # type: ignore
+            client = redis.Redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+            client.ping()
+            _client = client
+            logger.info("✅ 공용 Redis 클라이언트 연결 완료")
+        except Exception as e:
+            logger.warning(f"⚠️ Redis 연결 실패 ({_RETRY_INTERVAL_SECONDS}초 후 재시도): {e}")
+            _next_retry_at = time.time() + _RETRY_INTERVAL_SECONDS
+            return None
+
+    return _client
+
+
+def reset_redis(client=None) -> None:
+    """
+    명령 실패 시 호출 - 현재 클라이언트를 버리고 재연결 대기 상태로 전환
+
+    Args:
+        client: 실패한 클라이언트 (다른 스레드가 이미 교체했으면 무시)
+    """
+    global _client, _next_retry_at
+
+    with _lock:
+        if client is None or client is _client:
+            _client = None
+            _next_retry_at = time.time() + _RETRY_INTERVAL_SECONDS
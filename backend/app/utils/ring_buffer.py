@@ -0,0 +1,24 @@
+"""
+고정 길이 링 버퍼 (통화별 대화 히스토리용)
+- collections.deque(maxlen) 기반: 가득 차면 append 시 가장 오래된 항목이 O(1)로 밀려남
+  (기존 `history = history[-20:]` 방식처럼 매 턴 리스트를 새로 만들지 않음)
+- LLM 프롬프트 구성 코드가 `history[-8:]`처럼 슬라이스를 쓰므로 슬라이스 조회 시 list 반환
+"""
+
+from collections import deque
+from itertools import islice
+
+
+class RingBuffer(deque):
+    """슬라이스 조회를 지원하는 deque (maxlen 필수)"""
+
+    def __init__(self, iterable=(), maxlen: int = 20):
+        super().__init__(iterable, maxlen=maxlen)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return super().__getitem__(index)
+        start, stop, step = index.indices(len(self))
+        if step == 1:
+            return list(islice(self, start, max(start, stop)))
+        return list(self)[index]
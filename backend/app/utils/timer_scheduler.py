@@ -0,0 +1,162 @@
+"""
+워커 공용 타이머 스케줄러 (힙 기반)
+- 통화별 마감 시각(최대 통화 시간 경고 / 강제 종료 / 무응답)을 하나의 최소 힙에 보관
+- 태스크 1개가 가장 이른 마감 시각까지만 잠들었다가 도래한 콜백만 실행 (통화 수와 무관하게 깨어나는 횟수 최소)
+- 예정 시각 대비 실제 실행 지연(drift)을 fleet_latency "timer_drift" 단계로 기록
+- 콜백은 이벤트 루프에서 동기 실행되므로 짧게 유지 (큐에 이벤트 넣기 등)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.utils.fleet_latency import fleet_latency
+
+logger = logging.getLogger(__name__)
+
+TIMER_DRIFT_STAGE = "timer_drift"
+
+# 취소된 항목이 힙의 절반을 넘으면 재구성 (지연 삭제 누적 방지)
+_COMPACT_MIN_SIZE = 64
+
+
+class TimerHandle:
+    """call_at / call_later 반환값 (cancel()로 취소)"""
+
+    __slots__ = ("due", "callback", "name", "cancelled", "_scheduler")
+
+    def __init__(self, due: float, callback: Callable[[], None], name: str, scheduler: "TimerScheduler"):
+        self.due = due
+        self.callback = callback
+        self.name = name
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def cancel(self):
+        if not self.cancelled:
+            self.cancelled = True
+            self._scheduler._on_cancel()
+
+
+class TimerScheduler:
+    """워커(이벤트 루프) 하나당 1개 - 모든 통화의 마감 시각 관리"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._seq = itertools.count()
+        self._cancelled_in_heap = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.fired_total = 0
+        self.cancelled_total = 0
+        self.failed_total = 0
+        self.max_drift = 0.0
+
+    def call_at(self, due: float, callback: Callable[[], None], name: str = "") -> TimerHandle:
+        """
+        due(time.time() 기준) 시각에 callback 실행 예약 (실행 중인 이벤트 루프에서 호출)
+        """
+        handle = TimerHandle(due, callback, name, self)
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (due, next(self._seq), handle))
+
+        self._ensure_running()
+        if earliest is None or due < earliest:
+            self._wakeup.set()
+        return handle
+
+    def call_later(self, delay: float, callback: Callable[[], None], name: str = "") -> TimerHandle:
+        return self.call_at(time.time() + delay, callback, name)
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def _on_cancel(self):
+        self.cancelled_total += 1
+        self._cancelled_in_heap += 1
+        if len(self._heap) >= _COMPACT_MIN_SIZE and self._cancelled_in_heap * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled_in_heap = 0
+
+    def _pop_cancelled(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled_in_heap -= 1
+
+    async def _run(self):
+        while True:
+            self._pop_cancelled()
+            self._wakeup.clear()
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, handle = heapq.heappop(self._heap)
+                if handle.cancelled:
+                    self._cancelled_in_heap -= 1
+                    continue
+                handle.cancelled = True  # 이후 cancel() 호출은 무시
+
+                drift = now - handle.due
+                if drift > self.max_drift:
+                    self.max_drift = drift
+                fleet_latency.record(TIMER_DRIFT_STAGE, drift)
+
+                self.fired_total += 1
+                try:
+                    handle.callback()
+                except Exception as e:
+                    self.failed_total += 1
+                    logger.error(f"❌ 타이머 콜백 오류 ({handle.name}): {e}")
+
+    async def stop(self):
+        """lifespan 종료 시 호출"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict:
+        """관리자 API용 상태"""
+        pending = len(self._heap) - self._cancelled_in_heap
+        next_due = None
+        for due, _, handle in self._heap:
+            if not handle.cancelled and (next_due is None or due < next_due):
+                next_due = due
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": pending,
+            "next_due_in_seconds": (next_due - time.time()) if next_due is not None else None,
+            "fired_total": self.fired_total,
+            "cancelled_total": self.cancelled_total,
+            "failed_total": self.failed_total,
+            "max_drift_seconds": self.max_drift,
+            "drift": {
+                window: stages.get(TIMER_DRIFT_STAGE)
+                for window, stages in fleet_latency.local_snapshot().items()
+            },
+        }
+
+
+call_timers = TimerScheduler()
@@ -0,0 +1,83 @@
+"""
+통화 대화 기록 일괄 저장
+- PostgreSQL: 다중 행 INSERT 1회 (ON CONFLICT (call_id, sequence) DO NOTHING)
+  (대화 기록은 최대 CONVERSATION_HISTORY_MAXLEN개라 COPY가 필요한 크기가 되지 않음)
+- (call_id, sequence) 유니크 제약으로 같은 통화를 여러 번 저장해도 중복되지 않음
+"""
+
+import logging
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.call import CallTranscript
+from app.utils.datetime_utils import kst_now
+
+logger = logging.getLogger(__name__)
+
+
+def _build_rows(call_id: str, conversation: List[Dict]) -> List[Dict]:
+    created_at = kst_now()
+    rows = []
+    for sequence, message in enumerate(conversation):
+        rows.append({
+            "transcript_id": str(uuid.uuid4()),
+            "call_id": call_id,
+            "sequence": sequence,
+            "speaker": "ELDERLY" if message["role"] == "user" else "AI",
+            "text": message["content"],
+            "timestamp": message.get("offset"),
+            "created_at": created_at,
+        })
+    return rows
+
+
+def _insert_rows(db: Session, rows: List[Dict]) -> int:
+    stmt = pg_insert(CallTranscript).values(rows).on_conflict_do_nothing(
+        index_elements=["call_id", "sequence"]
+    )
+    return db.execute(stmt).rowcount
+
+
+def _insert_missing_rows(db: Session, call_id: str, rows: List[Dict]) -> int:
+    """PostgreSQL 외 DB용 (기존 sequence 조회 후 없는 행만 추가)"""
+    existing = set(db.execute(
+        select(CallTranscript.sequence).where(CallTranscript.call_id == call_id)
+    ).scalars())
+    missing = [row for row in rows if row["sequence"] not in existing]
+    if missing:
+        db.execute(CallTranscript.__table__.insert(), missing)
+    return len(missing)
+
+
+def write_transcripts(db: Session, call_id: str, conversation: List[Dict]) -> Optional[int]:
+    """
+    대화 기록 일괄 저장 (커밋은 호출 측에서)
+
+    Args:
+        db: DB 세션
+        call_id: 통화 ID
+        conversation: [{"role": "user"|"assistant", "content": "...", "offset": 초}, ...]
+            offset은 통화 시작 기준 발화 시각 (없으면 NULL)
+
+    Returns:
+        새로 저장된 행 수 (드라이버가 알려주지 않으면 None)
+    """
+    if not conversation:
+        return 0
+
+    rows = _build_rows(call_id, conversation)
+    dialect = db.get_bind().dialect.name
+
+    if dialect != "postgresql":
+        inserted = _insert_missing_rows(db, call_id, rows)
+    else:
+        inserted = _insert_rows(db, rows)
+
+    if inserted is not None and inserted < 0:
+        inserted = None
+    logger.info(f"✅ 대화 기록 일괄 저장: {call_id} ({inserted if inserted is not None else '?'}/{len(rows)}행 신규)")
+    return inserted
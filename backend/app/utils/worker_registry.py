@@ -0,0 +1,166 @@
+"""
+통화 워커 등록부 (Redis 해시)
+- API 워커가 주기적으로 상태(active / draining / drained), 진행 중 통화 수, 공개 도메인을 기록
+- 통화 스케줄러(Celery)와 배포 중(drain) 워커가 새 통화를 보낼 워커를 고를 때 사용
+- Redis를 쓸 수 없으면 None → 호출 측은 API_BASE_URL(로드밸런서)로 그대로 발신
+"""
+
+import heapq
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.utils.fleet_latency import get_worker_id
+from app.utils.redis_client import get_redis, reset_redis
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY = "workers:media_stream"
+
+STATUS_ACTIVE = "active"
+STATUS_DRAINING = "draining"
+STATUS_DRAINED = "drained"
+
+
+def publish_worker(status: str, active_calls: int) -> bool:
+    """이 워커 상태 기록 (하트비트)"""
+    client = get_redis()
+    if client is None:
+        return False
+
+    entry = {
+        "host": settings.WORKER_PUBLIC_HOST,
+        "status": status,
+        "active_calls": active_calls,
+        "heartbeat": time.time(),
+    }
+    try:
+        client.hset(_REDIS_KEY, get_worker_id(), json.dumps(entry))
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ 워커 등록부 기록 실패: {e}")
+        reset_redis(client)
+        return False
+
+
+def remove_worker() -> None:
+    """이 워커를 등록부에서 제거 (프로세스 종료 시)"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.hdel(_REDIS_KEY, get_worker_id())
+    except Exception as e:
+        logger.warning(f"⚠️ 워커 등록부 제거 실패: {e}")
+        reset_redis(client)
+
+
+def list_workers() -> Optional[List[Dict]]:
+    """
+    하트비트가 살아 있는 워커 목록 (만료된 항목은 정리)
+
+    Returns:
+        [{"worker_id", "host", "status", "active_calls", "heartbeat"}, ...] 또는 None (Redis 사용 불가)
+    """
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        raw = client.hgetall(_REDIS_KEY)
+    except Exception as e:
+        logger.warning(f"⚠️ 워커 등록부 조회 실패: {e}")
+        reset_redis(client)
+        return None
+
+    now = time.time()
+    workers, stale = [], []
+    for worker_id, value in raw.items():
+        try:
+            entry = json.loads(value)
+        except ValueError:
+            stale.append(worker_id)
+            continue
+        if now - entry.get("heartbeat", 0) > settings.WORKER_REGISTRY_TTL_SECONDS:
+            stale.append(worker_id)
+            continue
+        entry["worker_id"] = worker_id
+        workers.append(entry)
+
+    if stale:
+        try:
+            client.hdel(_REDIS_KEY, *stale)
+        except Exception:
+            pass
+    return workers
+
+
+def pick_call_host(exclude_self: bool = False) -> Optional[str]:
+    """
+    새 통화를 받을 워커의 공개 도메인 (진행 중 통화가 가장 적은 active 워커)
+
+    Args:
+        exclude_self: 이 워커 제외 (drain 중인 워커가 통화를 넘길 때)
+
+    Returns:
+        공개 도메인 또는 None (등록된 후보 없음 → API_BASE_URL 사용)
+    """
+    workers = list_workers()
+    if not workers:
+        return None
+
+    self_id = get_worker_id()
+    candidates = [
+        worker for worker in workers
+        if worker.get("status") == STATUS_ACTIVE
+        and worker.get("host")
+        and not (exclude_self and worker["worker_id"] == self_id)
+    ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda worker: worker.get("active_calls", 0))["host"]
+
+
+def available_call_slots() -> Optional[int]:
+    """
+    active 워커들이 더 받을 수 있는 통화 수 (워커당 MEDIA_STREAM_MAX_CALLS_PER_WORKER 기준)
+
+    Returns:
+        남은 통화 수 또는 None (Redis 사용 불가 / 등록된 워커 없음 → 제한 없음으로 취급)
+    """
+    workers = list_workers()
+    if not workers:
+        return None
+    return sum(
+        max(settings.MEDIA_STREAM_MAX_CALLS_PER_WORKER - worker.get("active_calls", 0), 0)
+        for worker in workers
+        if worker.get("status") == STATUS_ACTIVE
+    )
+
+
+def assign_call_hosts(count: int) -> List[Optional[str]]:
+    """
+    발신 count건을 공개 도메인이 있는 active 워커에 남은 수용량이 큰 순서로 분배
+
+    Returns:
+        통화별 도메인 목록 (후보가 없으면 None → 호출 측이 API_BASE_URL 사용)
+    """
+    workers = list_workers() or []
+    # (-남은 수용량, worker_id, host) 최대 힙
+    heap = [
+        (-(settings.MEDIA_STREAM_MAX_CALLS_PER_WORKER - worker.get("active_calls", 0)), worker["worker_id"], worker["host"])
+        for worker in workers
+        if worker.get("status") == STATUS_ACTIVE and worker.get("host")
+    ]
+    if not heap:
+        return [None] * count
+
+    heapq.heapify(heap)
+    hosts = []
+    for _ in range(count):
+        free, worker_id, host = heapq.heappop(heap)
+        hosts.append(host)
+        heapq.heappush(heap, (free + 1, worker_id, host))
+    return hosts
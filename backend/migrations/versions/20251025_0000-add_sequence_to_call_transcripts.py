@@ -0,0 +1,50 @@
+"""add sequence to call_transcripts with (call_id, sequence) unique constraint
+
+Revision ID: f3b5d7e9a1c4
+Revises: e7a1c3d5f9b2
+Create Date: 2025-10-25 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b5d7e9a1c4'
+down_revision: Union[str, None] = 'e7a1c3d5f9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # call_transcripts 테이블에 통화 내 메시지 순번 컬럼 추가
+    op.add_column('call_transcripts', sa.Column('sequence', sa.Integer(), nullable=True))
+    
+    # 기존 기록은 저장 순서(timestamp, created_at)대로 순번 부여
+    op.execute("""
+        UPDATE call_transcripts AS t
+        SET sequence = numbered.seq
+        FROM (
+            SELECT transcript_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY call_id
+                       ORDER BY timestamp NULLS LAST, created_at, transcript_id
+                   ) - 1 AS seq
+            FROM call_transcripts
+        ) AS numbered
+        WHERE t.transcript_id = numbered.transcript_id
+    """)
+    
+    # 같은 통화의 중복 저장 방지
+    op.create_unique_constraint(
+        'uq_call_transcripts_call_id_sequence',
+        'call_transcripts',
+        ['call_id', 'sequence']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_call_transcripts_call_id_sequence', 'call_transcripts', type_='unique')
+    op.drop_column('call_transcripts', 'sequence')
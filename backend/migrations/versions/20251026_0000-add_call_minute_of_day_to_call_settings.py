@@ -0,0 +1,42 @@
+"""add call_minute_of_day to call_settings with (is_active, call_minute_of_day) index
+
+Revision ID: a8c2e4f6b1d3
+Revises: f3b5d7e9a1c4
+Create Date: 2025-10-26 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c2e4f6b1d3'
+down_revision: Union[str, None] = 'f3b5d7e9a1c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # call_settings 테이블에 하루 중 분(0~1439) 컬럼 추가
+    op.add_column('call_settings', sa.Column('call_minute_of_day', sa.Integer(), nullable=True))
+    
+    # 기존 설정은 call_time에서 계산
+    op.execute("""
+        UPDATE call_settings
+        SET call_minute_of_day = EXTRACT(HOUR FROM call_time)::int * 60 + EXTRACT(MINUTE FROM call_time)::int
+    """)
+    op.alter_column('call_settings', 'call_minute_of_day', nullable=False)
+    
+    # 스케줄러 매분 조회용 (활성 여부 + 분)
+    op.create_index(
+        'ix_call_settings_active_minute',
+        'call_settings',
+        ['is_active', 'call_minute_of_day']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_call_settings_active_minute', table_name='call_settings')
+    op.drop_column('call_settings', 'call_minute_of_day')
@@ -0,0 +1,307 @@
+"""
+Per-call memory benchmark (legacy per-call state vs compact layout)
+
+Builds the in-memory state of N live calls after T turns each and reports bytes per call:
+- legacy: nested dict per turn (with per-turn "statistics" dict and *_formatted strings),
+  8 float lists, list conversation history trimmed by re-slicing, unbounded partial text lists
+- compact: PerformanceMetricsCollector (slotted TurnMetrics + array('d') series),
+  RingBuffer conversation history, deque(maxlen) partial texts
+
+Measured with tracemalloc (Python heap) and RSS delta (/proc/self/statm, Linux only).
+Each layout is built in a fresh subprocess so RSS numbers don't share freed arenas.
+
+Usage (from backend/):
+  python -m scripts.call_memory_benchmark --calls 500 --turns 30
+  python -m scripts.call_memory_benchmark --calls 200 --turns 60 --partials 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Dict, List
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+STAGES = (
+    "stt_latency",
+    "stt_partial_latency",
+    "llm_first_token_latency",
+    "llm_completion_latency",
+    "tts_latency",
+    "first_token_to_first_tts_completion_latency",
+    "stt_to_first_audio_latency",
+    "e2e_latency",
+)
+
+USER_UTTERANCES = [
+    "오늘 아침에 밥 먹고 산책 다녀왔어요",
+    "요즘 무릎이 아파서 힘들어",
+    "아들이 주말에 온다고 했어요",
+    "아직 점심은 안 먹었어요",
+]
+AI_RESPONSES = [
+    "그러셨군요~ 산책 다녀오시니 기분이 좋으시겠어요. 오늘 날씨는 어땠어요?",
+    "아이고, 무릎이 아프시면 많이 불편하시겠어요. 병원에는 다녀오셨어요?",
+    "아드님이 오신다니 정말 좋으시겠어요! 같이 뭐 하실 계획이세요?",
+]
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def fake_turn_times(rng: random.Random, start: float) -> Dict[str, float]:
+    speech = start + rng.uniform(0, 1)
+    partial = speech + rng.uniform(0.2, 0.5)
+    final = partial + rng.uniform(0.5, 1.5)
+    first_token = final + rng.uniform(0.3, 0.8)
+    tts_start = first_token + rng.uniform(0.05, 0.2)
+    first_tts = tts_start + rng.uniform(0.2, 0.6)
+    completion = first_tts + rng.uniform(0.5, 2.0)
+    return {
+        "speech": speech, "partial": partial, "final": final, "first_token": first_token,
+        "tts_start": tts_start, "first_tts": first_tts, "completion": completion,
+    }
+
+
+def partial_texts(text: str, count: int) -> List[str]:
+    step = max(1, len(text) // count)
+    return [text[: min(len(text), (i + 1) * step)] for i in range(count)]
+
+
+# ==================== legacy (이전 구현 그대로) ====================
+
+def legacy_stats(series: Dict[str, List[float]]) -> Dict[str, Dict[str, Any]]:
+    def percentile(data: List[float], p: float):
+        sorted_data = sorted(data)
+        k = (len(sorted_data) - 1) * p
+        f = int(k)
+        c = k - f
+        if f + 1 < len(sorted_data):
+            return sorted_data[f] + c * (sorted_data[f + 1] - sorted_data[f])
+        return sorted_data[f]
+
+    result = {}
+    for stage, data in series.items():
+        if not data:
+            result[stage] = {"count": 0, "avg": None, "min": None, "max": None, "p50": None, "p95": None, "p99": None}
+            continue
+        result[stage] = {
+            "count": len(data),
+            "avg": statistics.mean(data),
+            "min": min(data),
+            "max": max(data),
+            "p50": percentile(data, 0.50),
+            "p95": percentile(data, 0.95),
+            "p99": percentile(data, 0.99),
+        }
+    return result
+
+
+def legacy_call(rng: random.Random, turns: int, partials: int) -> Dict[str, Any]:
+    call_start = time.time()
+    metrics = {"call_sid": f"CA{rng.getrandbits(128):032x}", "turns": [], "summary": {}}
+    series: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    conversation: List[Dict[str, str]] = []
+    partial_list: List[str] = []
+
+    t = call_start
+    for i in range(turns):
+        user = USER_UTTERANCES[i % len(USER_UTTERANCES)]
+        ai = AI_RESPONSES[i % len(AI_RESPONSES)]
+        times = fake_turn_times(rng, t)
+
+        partial_list.extend(partial_texts(user, partials))
+
+        latencies = {
+            "stt_latency": times["final"] - times["speech"],
+            "stt_partial_latency": times["partial"] - times["speech"],
+            "llm_first_token_latency": times["first_token"] - times["final"],
+            "llm_completion_latency": times["completion"] - times["first_token"],
+            "tts_latency": times["first_tts"] - times["tts_start"],
+            "first_token_to_first_tts_completion_latency": times["first_tts"] - times["first_token"],
+            "stt_to_first_audio_latency": times["first_tts"] - times["final"],
+            "e2e_latency": times["completion"] - t,
+        }
+        for stage, value in latencies.items():
+            series[stage].append(value)
+
+        fmt = lambda ts: f"{int(ts - call_start) // 60:02d}:{int(ts - call_start) % 60:02d}.000"  # noqa: E731
+        metrics["turns"].append({
+            "turn_number": i + 1,
+            "user_utterance": user,
+            "ai_response": ai,
+            "turn_start_time": t,
+            "fast_path": None,
+            "stt": {
+                "user_speech_start_time": times["speech"], "first_partial_time": times["partial"],
+                "final_recognition_time": times["final"], "latency": latencies["stt_latency"],
+                "partial_latency": latencies["stt_partial_latency"],
+                "user_speech_start_time_formatted": fmt(times["speech"]),
+                "first_partial_time_formatted": fmt(times["partial"]),
+                "final_recognition_time_formatted": fmt(times["final"]),
+            },
+            "llm": {
+                "first_token_time": times["first_token"], "completion_time": times["completion"],
+                "first_token_latency": latencies["llm_first_token_latency"],
+                "completion_latency": latencies["llm_completion_latency"],
+                "first_token_time_formatted": fmt(times["first_token"]),
+                "completion_time_formatted": fmt(times["completion"]),
+            },
+            "tts": {
+                "start_time": times["tts_start"], "completion_time": times["first_tts"],
+                "first_completion_time": times["first_tts"], "latency": latencies["tts_latency"],
+                "first_token_to_first_tts_completion_latency": latencies["first_token_to_first_tts_completion_latency"],
+                "start_time_formatted": fmt(times["tts_start"]),
+                "first_completion_time_formatted": fmt(times["first_tts"]),
+                "completion_time_formatted": fmt(times["first_tts"]),
+            },
+            "e2e": {
+                "turn_end_time": times["completion"], "latency": latencies["e2e_latency"],
+                "turn_end_time_formatted": fmt(times["completion"]),
+            },
+            "stt_to_first_audio": {"latency": latencies["stt_to_first_audio_latency"]},
+            "statistics": legacy_stats(series),
+            "turn_start_time_formatted": fmt(t),
+        })
+
+        conversation.append({"role": "user", "content": user})
+        conversation.append({"role": "assistant", "content": ai})
+        if len(conversation) > 20:
+            conversation = conversation[-20:]
+
+        t = times["completion"] + rng.uniform(0.5, 3.0)
+
+    return {"metrics": metrics, "series": series, "conversation": conversation, "partials": partial_list}
+
+
+# ==================== compact (현재 구현) ====================
+
+def compact_call(rng: random.Random, turns: int, partials: int, output_dir: str) -> Dict[str, Any]:
+    from app.core.state import new_conversation  # type: ignore
+    from app.services.ai_call.rtzr_stt_service import PARTIAL_TEXT_HISTORY  # type: ignore
+    from app.utils.performance_metrics import PerformanceMetricsCollector  # type: ignore
+
+    collector = PerformanceMetricsCollector(f"CA{rng.getrandbits(128):032x}", output_dir=output_dir)
+    collector._save_metrics = lambda: None  # 파일 I/O 제외 (메모리만 측정)
+    conversation = new_conversation()
+    partial_deque: deque = deque(maxlen=PARTIAL_TEXT_HISTORY)
+
+    t = collector.call_start_time
+    for i in range(turns):
+        user = USER_UTTERANCES[i % len(USER_UTTERANCES)]
+        ai = AI_RESPONSES[i % len(AI_RESPONSES)]
+        times = fake_turn_times(rng, t)
+
+        partial_deque.extend(partial_texts(user, partials))
+
+        collector.start_turn(user, t)
+        index = len(collector.turns) - 1
+        collector.record_stt_partial(index, times["partial"], times["speech"])
+        collector.record_stt_final(index, times["final"])
+        collector.record_llm_first_token(index, times["first_token"])
+        collector.record_tts_start(index, times["tts_start"])
+        collector.record_tts_completion(index, times["first_tts"], is_first_sentence=True)
+        collector.record_llm_completion(index, times["completion"], ai)
+        collector.record_turn_end(index, times["completion"])
+
+        conversation.append({"role": "user", "content": user})
+        conversation.append({"role": "assistant", "content": ai})
+
+        t = times["completion"] + rng.uniform(0.5, 3.0)
+
+    return {"collector": collector, "conversation": conversation, "partials": partial_deque}
+
+
+def measure(layout: str, calls: int, turns: int, partials: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    output_dir = tempfile.mkdtemp(prefix="call_memory_benchmark_")
+
+    if layout == "compact":
+        # import 비용은 통화별 메모리에서 제외
+        compact_call(random.Random(0), 1, 1, output_dir)
+
+    gc.collect()
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    if layout == "legacy":
+        live = [legacy_call(rng, turns, partials) for _ in range(calls)]
+    else:
+        live = [compact_call(rng, turns, partials, output_dir) for _ in range(calls)]
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_bytes()
+
+    result = {
+        "layout": layout,
+        "calls": len(live),
+        "build_seconds": elapsed,
+        "heap_bytes_per_call": heap / calls,
+        "rss_bytes_per_call": (rss_after - rss_before) / calls if rss_before else None,
+    }
+    del live
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call memory benchmark")
+    parser.add_argument("--calls", type=int, default=500, help="simulated live calls")
+    parser.add_argument("--turns", type=int, default=30, help="turns per call")
+    parser.add_argument("--partials", type=int, default=15, help="STT partial results per utterance")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--layout", choices=["legacy", "compact"], default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.layout:
+        print(json.dumps(measure(args.layout, args.calls, args.turns, args.partials, args.seed)))
+        return
+
+    results = {}
+    for layout in ("legacy", "compact"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--layout", layout,
+             "--calls", str(args.calls), "--turns", str(args.turns),
+             "--partials", str(args.partials), "--seed", str(args.seed)],
+            check=True, capture_output=True, text=True, cwd=BACKEND_DIR,
+        ).stdout
+        results[layout] = json.loads(output.strip().splitlines()[-1])
+
+    legacy, compact = results["legacy"], results["compact"]
+    print(json.dumps({
+        "calls": args.calls,
+        "turns_per_call": args.turns,
+        "partials_per_utterance": args.partials,
+        "legacy": legacy,
+        "compact": compact,
+        "heap_reduction": (
+            1 - compact["heap_bytes_per_call"] / legacy["heap_bytes_per_call"]
+            if legacy["heap_bytes_per_call"] else None
+        ),
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Call smoothing planner report (peak concurrency before vs after)
+
+Runs app.services.ai_call.call_planner offline:
+- before: every call dialed at its call_time (current behavior)
+- after: dial slots assigned inside [call_time - window_before, call_time + window_after]
+  so concurrency stays under the ceiling (each call occupies --call-minutes)
+
+Targets come from active call_settings rows (configured DATABASE_URL), or from
+--synthetic N (a share of elders on DEFAULT_CALL_TIME, the rest spread over the day).
+Planner options default to the CALL_* settings.
+
+Usage (from backend/):
+  python -m scripts.call_planner_report
+  python -m scripts.call_planner_report --ceiling 60 --window-after 30 --top 10
+  python -m scripts.call_planner_report --synthetic 5000 --default-share 0.7
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.config import settings  # type: ignore  # noqa: E402
+from app.services.ai_call import call_planner  # type: ignore  # noqa: E402
+
+
+def load_targets(args: argparse.Namespace) -> Dict[str, int]:
+    if args.synthetic:
+        rng = random.Random(args.seed)
+        hour, minute = (int(part) for part in settings.DEFAULT_CALL_TIME.split(":")[:2])
+        default_minute = hour * 60 + minute
+        targets = {}
+        for i in range(args.synthetic):
+            if rng.random() < args.default_share:
+                targets[f"elder-{i}"] = default_minute
+            else:
+                # 나머지는 오전 9시 ~ 오후 9시 사이 정각/30분에 몰림
+                targets[f"elder-{i}"] = rng.randrange(9, 21) * 60 + rng.choice((0, 0, 30))
+        return targets
+
+    from app.database import SessionLocal  # type: ignore
+
+    db = SessionLocal()
+    try:
+        return call_planner.load_targets(db)
+    finally:
+        db.close()
+
+
+def busiest(profile: List[int], top: int) -> List[Dict]:
+    minutes = sorted(range(len(profile)), key=lambda minute: (-profile[minute], minute))[:top]
+    return [{"at": f"{m // 60:02d}:{m % 60:02d}", "concurrency": profile[m]} for m in minutes if profile[m]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Call smoothing planner report")
+    parser.add_argument("--ceiling", type=int, default=None, help="concurrency ceiling (CALL_CONCURRENCY_CEILING)")
+    parser.add_argument("--window-before", type=int, default=None, help="minutes allowed before call_time")
+    parser.add_argument("--window-after", type=int, default=None, help="minutes allowed after call_time")
+    parser.add_argument("--call-minutes", type=int, default=None, help="minutes each call occupies")
+    parser.add_argument("--synthetic", type=int, default=0, help="generate N elders instead of reading the DB")
+    parser.add_argument("--default-share", type=float, default=0.7, help="synthetic share on DEFAULT_CALL_TIME")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--top", type=int, default=5, help="busiest minutes to list before/after")
+    args = parser.parse_args()
+
+    targets = load_targets(args)
+    if not targets:
+        print("no active call settings", file=sys.stderr)
+        sys.exit(1)
+
+    call_minutes = args.call_minutes or settings.CALL_PLANNER_CALL_MINUTES
+    plan = call_planner.plan_with_settings(
+        targets,
+        ceiling=args.ceiling,
+        window_before=args.window_before,
+        window_after=args.window_after,
+        call_minutes=args.call_minutes,
+    )
+    report = call_planner.plan_report(targets, plan, call_minutes)
+    report["options"] = {
+        "ceiling": args.ceiling or settings.CALL_CONCURRENCY_CEILING,
+        "window_before": args.window_before if args.window_before is not None else settings.CALL_WINDOW_BEFORE_MINUTES,
+        "window_after": args.window_after if args.window_after is not None else settings.CALL_WINDOW_AFTER_MINUTES,
+        "call_minutes": call_minutes,
+    }
+    report["busiest_before"] = busiest(call_planner.concurrency_profile(targets.values(), call_minutes), args.top)
+    report["busiest_after"] = busiest(call_planner.concurrency_profile(plan.values(), call_minutes), args.top)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Inbound Twilio media decoding benchmark (legacy per-frame path vs fast path)
+
+Per inbound 20 ms media message:
+- legacy: json.loads + base64.b64decode (again for the recorder when --recording)
+  + audioop.ulaw2lin per frame + one STT queue item per frame
+- fast: media_decoder.parse_media_message (string scan, single base64 decode)
+  + MulawBatcher (preallocated buffer, one ulaw2lin + queue item per STT_AUDIO_BATCH_MS)
+
+Reports CPU time per call-second of audio (50 messages) and the implied calls per core.
+
+Usage (from backend/):
+  python -m scripts.media_decode_benchmark --seconds 600 --repeat 5
+  python -m scripts.media_decode_benchmark --batch-ms 100 --recording
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+import audioop
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.services.ai_call.media_decoder import MulawBatcher, parse_media_message  # type: ignore  # noqa: E402
+
+FRAME_BYTES = 160  # 20 ms μ-law
+FRAMES_PER_SECOND = 50
+
+
+def build_messages(seconds: int, seed: int) -> List[str]:
+    """Twilio 형식 media 메시지 (실제 서버와 같은 키 순서, 공백 없음)"""
+    rng = random.Random(seed)
+    messages = []
+    for i in range(seconds * FRAMES_PER_SECOND):
+        payload = base64.b64encode(bytes(rng.getrandbits(8) for _ in range(FRAME_BYTES))).decode()
+        messages.append(json.dumps({
+            "event": "media",
+            "sequenceNumber": str(i + 2),
+            "media": {"track": "inbound", "chunk": str(i + 1), "timestamp": str(i * 20), "payload": payload},
+            "streamSid": "MZ00000000000000000000000000000000",
+        }, separators=(",", ":")))
+    return messages
+
+
+def legacy_run(messages: List[str], recording: bool, batch_ms: int) -> int:
+    queue: asyncio.Queue = asyncio.Queue()
+    for message in messages:
+        data = json.loads(message)
+        if data.get("event") != "media":
+            continue
+        if recording:
+            base64.b64decode(data["media"]["payload"])
+        audio = base64.b64decode(data["media"]["payload"])
+        queue.put_nowait(audioop.ulaw2lin(audio, 2))
+    return queue.qsize()
+
+
+def fast_run(messages: List[str], recording: bool, batch_ms: int) -> int:
+    queue: asyncio.Queue = asyncio.Queue()
+    batcher = MulawBatcher(batch_ms)
+    for message in messages:
+        media = parse_media_message(message)
+        if media is None:
+            continue
+        audio, _ = media
+        for pcm in batcher.push(audio):
+            queue.put_nowait(pcm)
+    tail = batcher.flush()
+    if tail:
+        queue.put_nowait(tail)
+    return queue.qsize()
+
+
+def bench(fn: Callable[[List[str], bool, int], int], messages: List[str], args: argparse.Namespace) -> Dict[str, float]:
+    best = float("inf")
+    items = 0
+    for _ in range(args.repeat):
+        start = time.process_time()
+        items = fn(messages, args.recording, args.batch_ms)
+        best = min(best, time.process_time() - start)
+    cpu_per_call_second = best / args.seconds
+    return {
+        "best_cpu_seconds": best,
+        "cpu_us_per_call_second": cpu_per_call_second * 1e6,
+        "calls_per_core": 1 / cpu_per_call_second if cpu_per_call_second else None,
+        "stt_queue_items": items,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inbound media decoding benchmark")
+    parser.add_argument("--seconds", type=int, default=600, help="call audio seconds to simulate")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats (best of N)")
+    parser.add_argument("--batch-ms", type=int, default=100, help="fast path STT batch size")
+    parser.add_argument("--recording", action="store_true", help="legacy path decodes base64 twice (recorder)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    messages = build_messages(args.seconds, args.seed)
+
+    # 두 경로가 같은 PCM을 만드는지 확인
+    legacy_pcm = b"".join(
+        audioop.ulaw2lin(base64.b64decode(json.loads(m)["media"]["payload"]), 2) for m in messages
+    )
+    batcher = MulawBatcher(args.batch_ms)
+    fast_pcm = b"".join(pcm for m in messages for pcm in batcher.push(parse_media_message(m)[0]))
+    fast_pcm += batcher.flush() or b""
+
+    legacy = bench(legacy_run, messages, args)
+    fast = bench(fast_run, messages, args)
+
+    print(json.dumps({
+        "call_seconds": args.seconds,
+        "messages": len(messages),
+        "batch_ms": args.batch_ms,
+        "recording": args.recording,
+        "legacy": legacy,
+        "fast": fast,
+        "speedup": legacy["best_cpu_seconds"] / fast["best_cpu_seconds"] if fast["best_cpu_seconds"] else None,
+        "pcm_identical": legacy_pcm == fast_pcm,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
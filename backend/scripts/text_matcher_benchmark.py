@@ -0,0 +1,205 @@
+"""
+Text matcher microbenchmark (legacy per-call scans vs precompiled matcher)
+
+Compares, per utterance/response:
+- legacy: any(word in text ...) loops + per-call re.search/re.match
+- matcher: app.services.ai_call.text_matcher (Aho-Corasick + single compiled RegexSet)
+
+Also checks that both produce identical classifications on the corpus.
+
+Corpus sources (first match wins):
+- --corpus PATH: text file (one utterance per line) or JSON list of strings
+- --from-db: call_transcripts.text from the configured DATABASE_URL
+- built-in sample utterances
+
+Usage (from backend/):
+  python -m scripts.text_matcher_benchmark --from-db --limit 20000 --repeat 5
+  python -m scripts.text_matcher_benchmark --corpus transcripts.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(CURRENT_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.services.ai_call import text_matcher  # type: ignore  # noqa: E402
+
+SAMPLE_CORPUS = [
+    "네", "응", "어", "네네", "그래요", "안녕하세요", "여보세요", "안녕히 계세요",
+    "오늘 아침에 밥 먹고 산책 다녀왔어요",
+    "요즘 무릎이 아파서 힘들어",
+    "혼자 있으니까 좀 외롭네",
+    "아들이 주말에 온다고 했어요",
+    "손주가 전화해서 너무 좋아",
+    "걱정이 많아서 잠을 못 잤어",
+    "아직 점심은 안 먹었어요",
+    "모르겠어",
+    "그럼 이제 전화 끊을게요. 다음에 또 연락드릴게요.",
+    "어르신, 오늘 저녁은 뭘 드실 계획이세요? 점심은 드셨어요?",
+    "하루는 오늘 드라마를 봤어요. 어르신은 어떤 프로그램 보세요?",
+    "그러셨군요~ 저는 요즘 따뜻한 차를 자주 마셔요. 어르신도 차 좋아하세요?",
+    "병원 가서 검사 받아보세요. 꼭 해야 해요.",
+    "필요하시면 언제든 말씀해 주세요. 도와드릴게요.",
+]
+
+
+# ==================== legacy (이전 구현 그대로) ====================
+
+def legacy_is_short_response(user_message: str) -> bool:
+    greetings = ['안녕', '안녕하세요', '안녕히가세요', '안녕히가세', '안녕하세', '반갑', '반가워']
+    if any(greeting in user_message for greeting in greetings):
+        return False
+    if len(user_message.strip()) <= 5:
+        return True
+    short_patterns = [
+        r'^(네|응|그래|맞아|아니|아니야|아직|모르겠|괜찮아|괜찮|좋아|싫어)$',
+        r'^(네|응|그래|맞아|아니|아직).*[요네]$',
+        r'^(아니오|아니요|아니예요)$',
+        r'^(모르겠|모르겠어|모르겠네|모르겠다)$',
+    ]
+    normalized = user_message.strip()
+    for pattern in short_patterns:
+        if re.match(pattern, normalized, re.IGNORECASE):
+            return True
+    return False
+
+
+def legacy_safe_category(user_message: str) -> str:
+    if any(word in user_message for word in ['아프', '힘들', '고통', '통증']):
+        return "pain"
+    elif any(word in user_message for word in ['외롭', '쓸쓸', '혼자', '아무도']):
+        return "lonely"
+    elif any(word in user_message for word in ['슬프', '우울', '속상', '걱정']):
+        return "sad"
+    elif any(word in user_message for word in ['자식', '아들', '딸', '손주']):
+        return "family"
+    elif any(word in user_message for word in ['기쁨', '좋아', '즐거', '행복']):
+        return "joy"
+    return "default"
+
+
+def legacy_response_checks(response: str) -> Dict[str, Any]:
+    meal = any(word in response for word in ['저녁', '점심', '아침', '식사', '밥', '먹', '드실', '드셨'])
+    banned = False
+    for _, pattern in text_matcher.BANNED_RESPONSE_RULES:
+        if re.search(pattern, response, re.IGNORECASE):
+            banned = True
+            break
+    jondaemal = any(marker in response for marker in ['세요', '셔요', '습니다', '네요', '어요', '죠'])
+    return {"meal": meal, "banned": banned, "jondaemal": jondaemal}
+
+
+def legacy_classify(text: str) -> Dict[str, Any]:
+    result = legacy_response_checks(text)
+    result["short"] = legacy_is_short_response(text)
+    result["safe"] = legacy_safe_category(text)
+    return result
+
+
+# ==================== matcher ====================
+
+_SAFE_ORDER = ("pain", "lonely", "sad", "family", "joy")
+
+
+def matcher_classify(text: str) -> Dict[str, Any]:
+    utterance = text_matcher.classify_utterance(text)
+    response = text_matcher.classify_response(text)
+    safe = next((label for label in _SAFE_ORDER if label in utterance.labels), "default")
+    return {
+        "meal": "meal" in response.labels,
+        "banned": response.banned_reason is not None,
+        "jondaemal": "jondaemal" in response.labels,
+        "short": utterance.is_short,
+        "safe": safe,
+    }
+
+
+# ==================== corpus ====================
+
+def load_corpus(args: argparse.Namespace) -> List[str]:
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            raw = f.read()
+        try:
+            data = json.loads(raw)
+            return [str(item) for item in data if item]
+        except json.JSONDecodeError:
+            return [line.strip() for line in raw.splitlines() if line.strip()]
+
+    if args.from_db:
+        from app.database import SessionLocal  # type: ignore
+        from app.models.call import CallTranscript  # type: ignore
+
+        db = SessionLocal()
+        try:
+            rows = db.query(CallTranscript.text).limit(args.limit).all()
+            return [row[0] for row in rows if row[0]]
+        finally:
+            db.close()
+
+    return list(SAMPLE_CORPUS)
+
+
+def bench(fn: Callable[[str], Any], corpus: List[str], repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "best_total_ms": best * 1000,
+        "per_item_us": best / len(corpus) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Text matcher microbenchmark")
+    parser.add_argument("--corpus", type=str, default=None, help="text file (one per line) or JSON list")
+    parser.add_argument("--from-db", action="store_true", help="load call_transcripts.text from DB")
+    parser.add_argument("--limit", type=int, default=20000, help="max rows from DB")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats (best of N)")
+    parser.add_argument("--min-items", type=int, default=10000, help="tile corpus up to this many items")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    if not corpus:
+        print("corpus is empty", file=sys.stderr)
+        sys.exit(1)
+
+    mismatches = [
+        {"text": text, "legacy": legacy_classify(text), "matcher": matcher_classify(text)}
+        for text in corpus
+        if legacy_classify(text) != matcher_classify(text)
+    ]
+
+    unique_items = len(corpus)
+    while len(corpus) < args.min_items:
+        corpus = corpus + corpus
+
+    legacy = bench(legacy_classify, corpus, args.repeat)
+    matcher = bench(matcher_classify, corpus, args.repeat)
+
+    print(json.dumps({
+        "unique_items": unique_items,
+        "timed_items": len(corpus),
+        "legacy": legacy,
+        "matcher": matcher,
+        "speedup": legacy["best_total_ms"] / matcher["best_total_ms"] if matcher["best_total_ms"] else None,
+        "mismatches": len(mismatches),
+        "mismatch_examples": mismatches[:5],
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()